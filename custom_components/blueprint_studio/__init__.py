@@ -26,6 +26,7 @@ from .const import DOMAIN, NAME, VERSION
 from .backend.api import BlueprintStudioApiView, BlueprintStudioStreamView, BlueprintStudioUploadView
 from .backend.api_terminal import TerminalWebSocketView
 from .backend.websocket import async_register_websockets
+from .backend.workers import shutdown_process_pool
 
 # Import for service worker view
 from aiohttp import web
@@ -142,6 +143,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     config_dir = Path(hass.config.config_dir)
     api_view = BlueprintStudioApiView(config_dir, store, data)
+    # Background tasks and websocket commands can run before the first API request
+    api_view._update_hass(hass)
     hass.http.register_view(api_view)
 
     # Register streaming view for serve_file/download_folder (requires_auth=False, validates token manually)
@@ -186,6 +189,31 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     hass.async_create_task(_deferred_git_check())
 
+    # One background `git fetch` loop shared by every open client
+    api_view.git.hass = hass
+    api_view.git.async_start_fetch_scheduler()
+    entry.async_on_unload(api_view.git.async_stop_fetch_scheduler)
+    api_view.git.async_start_maintenance_scheduler()
+    entry.async_on_unload(api_view.git.async_stop_maintenance_scheduler)
+    entry.async_on_unload(shutdown_process_pool)
+
+    # Validate every YAML file in the background and keep results current
+    hass.data[DOMAIN]["diagnostics"] = api_view.diagnostics
+    api_view.diagnostics.async_start()
+    entry.async_on_unload(api_view.diagnostics.async_stop)
+
+    # Entity search index for get_entities, maintained from state/registry events
+    hass.data[DOMAIN]["entities"] = api_view.entities
+    api_view.entities.async_start()
+    entry.async_on_unload(api_view.entities.async_stop)
+
+    # Devices/areas/floors/labels/services, rebuilt only after registry or service events
+    api_view.registry.async_start()
+    entry.async_on_unload(api_view.registry.async_stop)
+
+    # Live template previews (websocket) share the API's compiled-template cache
+    hass.data[DOMAIN]["templates"] = api_view.ai.templates
+
     # Register WebSocket commands
     async_register_websockets(hass)
 
@@ -222,4 +250,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     frontend.async_remove_panel(hass, DOMAIN)
     hass.data[DOMAIN].pop(entry.entry_id, None)
+    # Websocket commands look these up; drop them so nothing serves from stopped managers
+    for key in ("diagnostics", "entities", "templates"):
+        hass.data[DOMAIN].pop(key, None)
     return True
\ No newline at end of file
@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import re
 
+from .yaml_loader import load_blueprint_yaml
+
 
 def build_data_block(values: dict, domain: str, ind: str) -> str:
     """Build data block from extracted values."""
@@ -440,17 +442,11 @@ def convert_automation_to_blueprint(content: str, name: str = "") -> str:
     5. Strip id: and alias: top-level keys
     6. Return complete blueprint YAML
     """
-    import yaml as _yaml
     import re as _re
 
     # --- Parse with HA-aware loader ---
-    class HALoader(_yaml.SafeLoader): pass
-    def _ha_ctor(loader, node): return loader.construct_scalar(node)
-    for _tag in ['!include', '!secret', '!env_var', '!input', '!lambda', '!extend']:
-        HALoader.add_constructor(_tag, _ha_ctor)
-
     try:
-        parsed = _yaml.load(content, Loader=HALoader)
+        parsed = load_blueprint_yaml(content)
     except Exception:
         parsed = None
 
@@ -1521,15 +1517,8 @@ def parse_blueprint_inputs(content: str) -> dict:
         ]
       }
     """
-    import yaml as _yaml
-
-    class _HALoader(_yaml.SafeLoader): pass
-    def _ha_ctor(loader, node): return loader.construct_scalar(node)
-    for _tag in ['!include', '!secret', '!env_var', '!input', '!lambda', '!extend']:
-        _HALoader.add_constructor(_tag, _ha_ctor)
-
     try:
-        parsed = _yaml.load(content, Loader=_HALoader)
+        parsed = load_blueprint_yaml(content)
     except Exception:
         parsed = None
 
@@ -1606,13 +1595,8 @@ def instantiate_blueprint(content: str, input_values: dict, name: str, descripti
     import re as _re
     import uuid as _uuid
 
-    class _HALoader(_yaml.SafeLoader): pass
-    def _ha_ctor(loader, node): return loader.construct_scalar(node)
-    for _tag in ['!include', '!secret', '!env_var', '!input', '!lambda', '!extend']:
-        _HALoader.add_constructor(_tag, _ha_ctor)
-
     try:
-        parsed = _yaml.load(content, Loader=_HALoader)
+        parsed = load_blueprint_yaml(content)
     except Exception:
         parsed = {}
 
@@ -1,10 +1,13 @@
 "AI management for Blueprint Studio — thin orchestrator."
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
 import json
+import threading
 import time
+from collections import OrderedDict
 from typing import Any
 import aiohttp
 
@@ -13,7 +16,8 @@ from homeassistant.core import HomeAssistant
 
 from .util import json_response, json_message
 from .ai_constants import DOMAIN_ACTIONS
-from .ai_validators import check_syntax as _check_syntax, check_yaml, check_jinja
+from .template_manager import TemplateManager
+from .ai_validators import check_syntax as _check_syntax, check_yaml, check_jinja, _detect_file_type, yaml_item_cache_stats
 from .ai_nlp import (
     detect_domain, extract_area, find_best_entities,
     extract_conditions, extract_values, detect_additional_actions,
@@ -29,6 +33,9 @@ from .ai_generators import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Validation responses remembered for identical buffers (undo/redo, re-focus)
+VALIDATION_CACHE_SIZE = 128
+
 
 class AIManager:
     """Class to handle AI operations with advanced natural language understanding."""
@@ -37,18 +44,65 @@ class AIManager:
         """Initialize AI manager."""
         self.hass = hass
         self.data = data
+        # (content sha256, file type, strict mode) -> (status, body), in LRU order
+        self._validation_cache: OrderedDict[tuple, tuple[int, bytes]] = OrderedDict()
+        self._validation_lock = threading.Lock()
+        self._validation_hits = 0
+        self._validation_misses = 0
+        self.templates = TemplateManager(hass)
+
+    def _cached_validation(self, key: tuple, validate, *args) -> web.Response:
+        """Return a validator's response, reusing the body of an identical earlier check."""
+        with self._validation_lock:
+            cached = self._validation_cache.get(key)
+            if cached is not None:
+                self._validation_cache.move_to_end(key)
+                self._validation_hits += 1
+        if cached is not None:
+            # A Response can only be sent once, so rebuild it from the stored body
+            return web.Response(body=cached[1], status=cached[0], content_type="application/json", charset="utf-8")
+
+        response = validate(*args)
+        with self._validation_lock:
+            self._validation_misses += 1
+            self._validation_cache[key] = (response.status, response.body)
+            while len(self._validation_cache) > VALIDATION_CACHE_SIZE:
+                self._validation_cache.popitem(last=False)
+        return response
+
+    def validation_cache_stats(self) -> dict[str, Any]:
+        """Return hit/miss counters for the validation, per-item YAML and template caches."""
+        with self._validation_lock:
+            total = self._validation_hits + self._validation_misses
+            return {
+                "hits": self._validation_hits,
+                "misses": self._validation_misses,
+                "hit_rate": round(self._validation_hits / total, 3) if total else 0.0,
+                "size": len(self._validation_cache),
+                "max_size": VALIDATION_CACHE_SIZE,
+                "yaml_items": yaml_item_cache_stats(),
+                "templates": self.templates.stats(),
+            }
 
     def check_syntax(self, content: str, file_path: str = "") -> web.Response:
-        """Universal syntax checker — delegates to ai_validators."""
-        return _check_syntax(content, file_path)
+        """Universal syntax checker — delegates to ai_validators (cached by content and type)."""
+        digest = hashlib.sha256(content.encode()).hexdigest()
+        # The validator (and its strictness) only depends on the detected file type
+        key = (digest, _detect_file_type(file_path, content), None)
+        return self._cached_validation(key, _check_syntax, content, file_path)
 
     def check_yaml(self, content: str, strict_mode: bool = True) -> web.Response:
-        """Check YAML syntax — delegates to ai_validators."""
-        return check_yaml(content, strict_mode)
+        """Check YAML syntax — delegates to ai_validators (cached by content and mode)."""
+        key = (hashlib.sha256(content.encode()).hexdigest(), "yaml", strict_mode)
+        return self._cached_validation(key, check_yaml, content, strict_mode)
+
+    def _template_compiler(self):
+        """Return the compiled-template cache's getter once hass is available."""
+        return self.templates.get if self.hass is not None else None
 
     def check_jinja(self, content: str) -> web.Response:
-        """Check Jinja2 syntax — delegates to ai_validators."""
-        return check_jinja(content)
+        """Check Jinja2 syntax — delegates to ai_validators, compiling with HA's engine."""
+        return check_jinja(content, self._template_compiler())
 
     def check_json(self, content: str) -> web.Response:
         """Check JSON syntax — delegates to ai_validators."""
@@ -700,7 +754,7 @@ Example modern automation:
                 is_jinja = "jinja" in query_lower or (current_file and current_file.endswith((".jinja", ".jinja2", ".j2")))
 
                 if is_jinja:
-                    check_result = check_jinja(file_content)
+                    check_result = check_jinja(file_content, self._template_compiler())
                     result_data = check_result._body if hasattr(check_result, '_body') else "{}"
                     try:
                         res = json.loads(result_data)
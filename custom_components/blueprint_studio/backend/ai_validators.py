@@ -1,16 +1,22 @@
 "Syntax validation for YAML, Jinja, JSON, Python, and JavaScript."
 from __future__ import annotations
 
+import hashlib
 import logging
 import re
+import threading
 import yaml
 import json
 import ast
 import time
+from collections import OrderedDict
+from itertools import islice
+from typing import Any, Callable, Iterator
 
 from aiohttp import web
 
 from .util import json_response
+from .yaml_loader import LocationIndex, load_blueprint_yaml, load_ha_yaml_with_locations
 from .ai_constants import (
     HA_KNOWN_DOMAINS,
     BLUEPRINT_SELECTOR_TYPES,
@@ -25,6 +31,35 @@ from .ai_constants import (
 
 _LOGGER = logging.getLogger(__name__)
 
+# Diagnostics are collected per stage so item-by-item results merge in file order
+YAML_DIAGNOSTIC_STAGES = ("line_errors", "line_warnings", "data_warnings", "item_errors", "item_warnings")
+# Smaller files are cheap enough to check whole
+INCREMENTAL_MIN_BYTES = 32 * 1024
+# Must exceed the item count of the largest list, or sequential re-checks evict every entry
+YAML_ITEM_CACHE_SIZE = 16384
+
+_yaml_item_cache: OrderedDict[tuple, dict[str, list[dict]]] = OrderedDict()
+_yaml_item_lock = threading.Lock()
+_yaml_item_stats = {"hits": 0, "misses": 0}
+
+# Beyond STREAMING_MIN_BYTES the JS/Jinja heuristics stop after
+# STREAMING_MAX_PROBLEMS; beyond HEURISTICS_MAX_BYTES they are skipped entirely.
+STREAMING_MIN_BYTES = 1024 * 1024
+STREAMING_MAX_PROBLEMS = 50
+HEURISTICS_MAX_BYTES = 8 * 1024 * 1024
+
+# One token per comment, string, template literal or bracket
+JS_TOKEN_RE = re.compile(
+    r"(?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))"
+    r'|(?P<dq>"[^"\\]*(?:\\[\s\S][^"\\]*)*(?P<dq_end>")?)'
+    r"|(?P<sq>'[^'\\]*(?:\\[\s\S][^'\\]*)*(?P<sq_end>')?)"
+    r"|(?P<template>`[^`\\]*(?:\\[\s\S][^`\\]*)*(?P<template_end>`)?)"
+    r"|(?P<bracket>[()[\]{}])"
+)
+# Jinja patterns that describe syntax errors the template compiler reports itself
+JINJA_SYNTAX_PATTERNS = ("wrong_brackets", "missing_pipe")
+JS_TYPO_RE = re.compile(r'\b(funtion|constt|lett|varr|conts|lettt)\b')
+
 
 def _is_comment_line(line: str) -> bool:
     """Check if line is a comment or empty."""
@@ -174,63 +209,59 @@ def _validate_entity_id(entity_id: str, line_num: int, original_line: str) -> di
     return None
 
 
-def _validate_automation(item: dict, lines: list[str]) -> list[dict]:
+def _original_line(lines: list[str], line_num: int, fallback: str = "") -> str:
+    """Return the stripped source line for a 1-based line number."""
+    return lines[line_num - 1].strip() if 0 < line_num <= len(lines) else fallback
+
+
+def _validate_automation(item: dict, lines: list[str], locations: LocationIndex, index: int) -> list[dict]:
     """Validate automation-specific rules."""
     errors = []
+    item_line = locations.item_line(index)
+    alias_line = locations.key_line(index, 'alias')
 
     if 'id' not in item and 'alias' not in item:
-        for line_num, line in enumerate(lines, 1):
-            if line.strip().startswith('- '):
-                errors.append({
-                    "line": line_num,
-                    "type": "missing_automation_id",
-                    "message": "Automation missing both 'id:' and 'alias:' fields",
-                    "solution": "Add 'id:' (required) or 'alias:' (recommended)",
-                    "example": "- id: '1738012345678'\n  alias: My Automation",
-                    "original": line.strip()
-                })
-                break
+        errors.append({
+            "line": item_line,
+            "type": "missing_automation_id",
+            "message": "Automation missing both 'id:' and 'alias:' fields",
+            "solution": "Add 'id:' (required) or 'alias:' (recommended)",
+            "example": "- id: '1738012345678'\n  alias: My Automation",
+            "original": _original_line(lines, item_line)
+        })
 
     if 'trigger' not in item and 'triggers' not in item:
-        for line_num, line in enumerate(lines, 1):
-            if 'alias' in item and item['alias'] in line:
-                errors.append({
-                    "line": line_num,
-                    "type": "missing_trigger",
-                    "message": "Automation missing 'trigger:' or 'triggers:'",
-                    "solution": "Add at least one trigger",
-                    "example": "trigger:\n  platform: time\n  at: '10:00:00'",
-                    "original": line.strip()
-                })
-                break
+        errors.append({
+            "line": alias_line,
+            "type": "missing_trigger",
+            "message": "Automation missing 'trigger:' or 'triggers:'",
+            "solution": "Add at least one trigger",
+            "example": "trigger:\n  platform: time\n  at: '10:00:00'",
+            "original": _original_line(lines, alias_line)
+        })
 
     if 'action' not in item and 'actions' not in item:
-        for line_num, line in enumerate(lines, 1):
-            if 'alias' in item and item['alias'] in line:
-                errors.append({
-                    "line": line_num,
-                    "type": "missing_action",
-                    "message": "Automation missing 'action:' or 'actions:'",
-                    "solution": "Add at least one action",
-                    "example": "action:\n  - action: light.turn_on",
-                    "original": line.strip()
-                })
-                break
+        errors.append({
+            "line": alias_line,
+            "type": "missing_action",
+            "message": "Automation missing 'action:' or 'actions:'",
+            "solution": "Add at least one action",
+            "example": "action:\n  - action: light.turn_on",
+            "original": _original_line(lines, alias_line)
+        })
 
     if 'mode' in item:
         valid_modes = {'single', 'restart', 'queued', 'parallel'}
         if item['mode'] not in valid_modes:
-            for line_num, line in enumerate(lines, 1):
-                if f"mode: {item['mode']}" in line:
-                    errors.append({
-                        "line": line_num,
-                        "type": "invalid_automation_mode",
-                        "message": f"Invalid automation mode: '{item['mode']}'",
-                        "solution": f"Use one of: {', '.join(valid_modes)}",
-                        "example": "mode: single",
-                        "original": line.strip()
-                    })
-                    break
+            mode_line = locations.key_line(index, 'mode')
+            errors.append({
+                "line": mode_line,
+                "type": "invalid_automation_mode",
+                "message": f"Invalid automation mode: '{item['mode']}'",
+                "solution": f"Use one of: {', '.join(valid_modes)}",
+                "example": "mode: single",
+                "original": _original_line(lines, mode_line)
+            })
 
     return errors
 
@@ -246,7 +277,7 @@ def _validate_scene(item: dict, lines: list[str], line_num: int) -> list[dict]:
             "message": "Scene missing 'name:' field",
             "solution": "Add 'name:' field to identify the scene",
             "example": "- name: Evening Mode\n  entities:\n    light.bedroom: on",
-            "original": lines[line_num - 1].strip() if line_num <= len(lines) else "scene"
+            "original": _original_line(lines, line_num, "scene")
         })
 
     if 'entities' not in item or (isinstance(item.get('entities'), dict) and not item['entities']):
@@ -256,7 +287,7 @@ def _validate_scene(item: dict, lines: list[str], line_num: int) -> list[dict]:
             "message": "Scene has no entities defined",
             "solution": "Add entities to the scene",
             "example": "entities:\n  light.bedroom: 'on'\n  light.brightness: 254",
-            "original": lines[line_num - 1].strip() if line_num <= len(lines) else "scene"
+            "original": _original_line(lines, line_num, "scene")
         })
 
     return errors
@@ -276,7 +307,7 @@ def _validate_script(item: dict, lines: list[str], line_num: int) -> list[dict]:
             "message": "Script missing 'sequence:' or 'action:' field",
             "solution": "Add 'sequence:' or 'action:' with script steps",
             "example": "sequence:\n  - action: light.turn_on\n    target:\n      entity_id: light.bedroom",
-            "original": lines[line_num - 1].strip() if line_num <= len(lines) else "script"
+            "original": _original_line(lines, line_num, "script")
         })
 
     return errors
@@ -336,43 +367,16 @@ def _check_entity_id_in_data(lines: list[str], warnings: list[dict]) -> None:
             })
 
 
-def check_yaml(content: str, strict_mode: bool = True) -> web.Response:
-    """Check for YAML syntax errors and provide smart solutions."""
-    syntax_errors = []
-    best_practice_warnings = []
-
-    try:
-        class HAYamlLoader(yaml.SafeLoader): pass
-        def ha_constructor(loader, node): return loader.construct_scalar(node)
-        tags = [
-            '!include', '!include_dir_list', '!include_dir_named',
-            '!include_dir_merge_list', '!include_dir_merge_named',
-            '!secret', '!env_var', '!input',
-            '!lambda', '!extend',
-        ]
-        for tag in tags: HAYamlLoader.add_constructor(tag, ha_constructor)
-        parsed = yaml.load(content, Loader=HAYamlLoader)
-    except yaml.YAMLError as e:
-        return json_response({
-            "valid": False,
-            "error": str(e),
-            "type": "syntax_error",
-            "suggestions": [
-                "Check for proper indentation (use 2 spaces, not tabs)",
-                "Ensure all quotes are properly closed",
-                "Verify that list items start with '-' followed by a space",
-                "Check for special characters that need quoting"
-            ]
-        })
-    except Exception as e:
-        return json_response({"valid": False, "error": str(e)})
+def _yaml_diagnostics(content: str, strict_mode: bool) -> dict[str, list[dict]] | None:
+    """Parse one YAML document and collect its problems, grouped by rule stage.
 
+    Returns None for an empty document; parse errors propagate to the caller.
+    """
+    parsed, locations = load_ha_yaml_with_locations(content)
     if parsed is None:
-        return json_response({
-            "valid": True,
-            "message": "Empty or null YAML file"
-        })
+        return None
 
+    diagnostics: dict[str, list[dict]] = {stage: [] for stage in YAML_DIAGNOSTIC_STAGES}
     lines = content.split('\n')
 
     for line_num, line in enumerate(lines, 1):
@@ -380,7 +384,7 @@ def check_yaml(content: str, strict_mode: bool = True) -> web.Response:
             continue
 
         if re.search(YAML_ERROR_PATTERNS["legacy_service"]["pattern"], line):
-            best_practice_warnings.append({
+            diagnostics["line_warnings"].append({
                 "line": line_num,
                 "type": "legacy_syntax",
                 "message": YAML_ERROR_PATTERNS["legacy_service"]["message"],
@@ -394,7 +398,7 @@ def check_yaml(content: str, strict_mode: bool = True) -> web.Response:
             if not _is_nested_trigger_group(line):
                 is_in_triggers = _is_in_triggers_context(lines, line_num)
                 if is_in_triggers:
-                    best_practice_warnings.append({
+                    diagnostics["line_warnings"].append({
                         "line": line_num,
                         "type": "legacy_trigger",
                         "message": YAML_ERROR_PATTERNS["old_trigger_syntax"]["message"],
@@ -406,7 +410,7 @@ def check_yaml(content: str, strict_mode: bool = True) -> web.Response:
         if strict_mode and re.match(r"^\s*trigger:\s*$", line):
             indent = len(line) - len(line.lstrip())
             if indent <= 4:
-                best_practice_warnings.append({
+                diagnostics["line_warnings"].append({
                     "line": line_num,
                     "type": "singular_key",
                     "message": YAML_ERROR_PATTERNS["singular_trigger"]["message"],
@@ -418,7 +422,7 @@ def check_yaml(content: str, strict_mode: bool = True) -> web.Response:
         if strict_mode and re.match(r"^\s*condition:\s*$", line):
             indent = len(line) - len(line.lstrip())
             if indent <= 4:
-                best_practice_warnings.append({
+                diagnostics["line_warnings"].append({
                     "line": line_num,
                     "type": "singular_key",
                     "message": YAML_ERROR_PATTERNS["singular_condition"]["message"],
@@ -433,7 +437,7 @@ def check_yaml(content: str, strict_mode: bool = True) -> web.Response:
                 if line_num > 1:
                     prev_line = lines[line_num - 2].strip()
                     if not prev_line.endswith(':'):
-                        best_practice_warnings.append({
+                        diagnostics["line_warnings"].append({
                             "line": line_num,
                             "type": "singular_key",
                             "message": YAML_ERROR_PATTERNS["singular_action"]["message"],
@@ -449,13 +453,13 @@ def check_yaml(content: str, strict_mode: bool = True) -> web.Response:
                 error = _validate_entity_id(entity_id, line_num, line)
                 if error:
                     if error["type"] == "malformed_entity_id":
-                        syntax_errors.append(error)
+                        diagnostics["line_errors"].append(error)
                     else:
-                        best_practice_warnings.append(error)
+                        diagnostics["line_warnings"].append(error)
 
         # NEW-1: data_template: deprecated
         if re.search(YAML_ERROR_PATTERNS["deprecated_data_template"]["pattern"], line):
-            best_practice_warnings.append({
+            diagnostics["line_warnings"].append({
                 "line": line_num,
                 "type": "deprecated_syntax",
                 "message": YAML_ERROR_PATTERNS["deprecated_data_template"]["message"],
@@ -466,7 +470,7 @@ def check_yaml(content: str, strict_mode: bool = True) -> web.Response:
 
         # NEW-4: service_template: deprecated
         if re.search(YAML_ERROR_PATTERNS["deprecated_service_template"]["pattern"], line):
-            best_practice_warnings.append({
+            diagnostics["line_warnings"].append({
                 "line": line_num,
                 "type": "deprecated_syntax",
                 "message": YAML_ERROR_PATTERNS["deprecated_service_template"]["message"],
@@ -483,7 +487,7 @@ def check_yaml(content: str, strict_mode: bool = True) -> web.Response:
             }
             parent_domain = _find_parent_section(lines, line_num)
             if parent_domain in template_parent_domains:
-                best_practice_warnings.append({
+                diagnostics["line_warnings"].append({
                     "line": line_num,
                     "type": "deprecated_syntax",
                     "message": YAML_ERROR_PATTERNS["deprecated_platform_template"]["message"],
@@ -493,33 +497,134 @@ def check_yaml(content: str, strict_mode: bool = True) -> web.Response:
                 })
 
     # NEW-2: entity_id inside data: block
-    _check_entity_id_in_data(lines, best_practice_warnings)
+    _check_entity_id_in_data(lines, diagnostics["data_warnings"])
 
     if isinstance(parsed, list):
         for idx, item in enumerate(parsed):
             if isinstance(item, dict) and ('alias' in item or 'id' in item):
                 if 'use_blueprint' in item:
                     continue
-                auto_errors = _validate_automation(item, lines)
+                auto_errors = _validate_automation(item, lines, locations, idx)
                 for error in auto_errors:
                     if error["type"] == "missing_automation_id":
-                        best_practice_warnings.append(error)
+                        diagnostics["item_warnings"].append(error)
                     else:
-                        syntax_errors.append(error)
+                        diagnostics["item_errors"].append(error)
 
                 if 'alias' in item and 'id' not in item:
                     alias_value = item['alias']
-                    for line_num, line in enumerate(lines, 1):
-                        if f"alias: {alias_value}" in line or f'alias: "{alias_value}"' in line or f"alias: '{alias_value}'" in line:
-                            best_practice_warnings.append({
-                                "line": line_num,
-                                "type": "missing_id",
-                                "message": f"Automation '{alias_value}' missing unique 'id:' field",
-                                "solution": YAML_ERROR_PATTERNS["missing_id"]["solution"],
-                                "example": f"- id: '{int(time.time() * 1000)}'\n  alias: {alias_value}",
-                                "original": line.strip()
-                            })
-                            break
+                    line_num = locations.key_line(idx, 'alias')
+                    diagnostics["item_warnings"].append({
+                        "line": line_num,
+                        "type": "missing_id",
+                        "message": f"Automation '{alias_value}' missing unique 'id:' field",
+                        "solution": YAML_ERROR_PATTERNS["missing_id"]["solution"],
+                        "example": f"- id: '{int(time.time() * 1000)}'\n  alias: {alias_value}",
+                        "original": _original_line(lines, line_num)
+                    })
+
+    return diagnostics
+
+
+def _split_top_level_items(content: str) -> list[tuple[int, str]] | None:
+    """Split a top-level block list into ``(line_offset, text)`` chunks, one per item.
+
+    Leading comments stay with the first item and trailing comments with the
+    item above them. Returns None for anything that is not a plain list of items
+    (mappings, multiple documents, directives).
+    """
+    chunks = []
+    start = None
+    lines = content.split('\n')
+    for line_num, line in enumerate(lines):
+        if not line or line[0] in ' \t#':
+            continue
+        if line[0] == '-' and (len(line) == 1 or line[1] in ' \t'):
+            if start is not None:
+                chunks.append((start, '\n'.join(lines[start:line_num])))
+            start = 0 if start is None else line_num
+            continue
+        return None
+    if start is None:
+        return None
+    chunks.append((start, '\n'.join(lines[start:])))
+    return chunks
+
+
+def _incremental_yaml_diagnostics(content: str, strict_mode: bool) -> dict[str, list[dict]] | None:
+    """Validate a top-level list item by item, reusing cached results for unchanged items.
+
+    Returns None when the file cannot be split, or an item does not parse on its
+    own (a syntax error, or an alias to an anchor in another item); the caller
+    then checks the file as a whole.
+    """
+    chunks = _split_top_level_items(content)
+    if not chunks:
+        return None
+
+    merged: dict[str, list[dict]] = {stage: [] for stage in YAML_DIAGNOSTIC_STAGES}
+    for offset, text in chunks:
+        key = (hashlib.sha256(text.encode("utf-8")).digest(), strict_mode)
+        with _yaml_item_lock:
+            diagnostics = _yaml_item_cache.get(key)
+            if diagnostics is not None:
+                _yaml_item_cache.move_to_end(key)
+                _yaml_item_stats["hits"] += 1
+        if diagnostics is None:
+            try:
+                diagnostics = _yaml_diagnostics(text, strict_mode)
+            except Exception:
+                return None
+            if diagnostics is None:
+                return None
+            with _yaml_item_lock:
+                _yaml_item_stats["misses"] += 1
+                _yaml_item_cache[key] = diagnostics
+                while len(_yaml_item_cache) > YAML_ITEM_CACHE_SIZE:
+                    _yaml_item_cache.popitem(last=False)
+        for stage, problems in diagnostics.items():
+            merged[stage].extend({**problem, "line": problem["line"] + offset} for problem in problems)
+    return merged
+
+
+def yaml_item_cache_stats() -> dict[str, int]:
+    """Return hit/miss counters for the per-item YAML diagnostics cache."""
+    with _yaml_item_lock:
+        return {**_yaml_item_stats, "size": len(_yaml_item_cache), "max_size": YAML_ITEM_CACHE_SIZE}
+
+
+def check_yaml(content: str, strict_mode: bool = True) -> web.Response:
+    """Check for YAML syntax errors and provide smart solutions."""
+    diagnostics = None
+    if len(content) >= INCREMENTAL_MIN_BYTES:
+        diagnostics = _incremental_yaml_diagnostics(content, strict_mode)
+
+    if diagnostics is None:
+        try:
+            diagnostics = _yaml_diagnostics(content, strict_mode)
+        except yaml.YAMLError as e:
+            return json_response({
+                "valid": False,
+                "error": str(e),
+                "type": "syntax_error",
+                "suggestions": [
+                    "Check for proper indentation (use 2 spaces, not tabs)",
+                    "Ensure all quotes are properly closed",
+                    "Verify that list items start with '-' followed by a space",
+                    "Check for special characters that need quoting"
+                ]
+            })
+        except Exception as e:
+            return json_response({"valid": False, "error": str(e)})
+
+    if diagnostics is None:
+        return json_response({
+            "valid": True,
+            "message": "Empty or null YAML file"
+        })
+
+    syntax_errors = diagnostics["line_errors"] + diagnostics["item_errors"]
+    best_practice_warnings = diagnostics["line_warnings"] + diagnostics["data_warnings"] + diagnostics["item_warnings"]
 
     if syntax_errors:
         return json_response({
@@ -550,11 +655,7 @@ def check_blueprint(content: str) -> web.Response:
 
     # Parse YAML
     try:
-        class HAYamlLoader(yaml.SafeLoader): pass
-        def ha_constructor(loader, node): return loader.construct_scalar(node)
-        for tag in ['!include', '!secret', '!env_var', '!input', '!lambda', '!extend']:
-            HAYamlLoader.add_constructor(tag, ha_constructor)
-        parsed = yaml.load(content, Loader=HAYamlLoader)
+        parsed = load_blueprint_yaml(content)
     except yaml.YAMLError as e:
         return json_response({
             "valid": False,
@@ -799,43 +900,82 @@ def check_syntax(content: str, file_path: str = "") -> web.Response:
         return check_yaml(content, strict_mode=False)
 
 
-def check_jinja(content: str) -> web.Response:
-    """Check Jinja2 template syntax and provide intelligent suggestions."""
-    errors = []
-    suggestions = []
+# Extensions validate_file knows how to check
+VALIDATED_EXTENSIONS = {".yaml", ".yml", ".json", ".py", ".js", ".jinja", ".jinja2", ".j2"}
 
-    lines = content.split('\n')
 
-    for line_num, line in enumerate(lines, 1):
-        if re.search(JINJA_ERROR_PATTERNS["missing_quotes"]["pattern"], line):
-            errors.append({
-                "line": line_num,
-                "type": "syntax_error",
-                "message": JINJA_ERROR_PATTERNS["missing_quotes"]["message"],
-                "solution": JINJA_ERROR_PATTERNS["missing_quotes"]["solution"],
-                "example": JINJA_ERROR_PATTERNS["missing_quotes"]["example"],
-                "original": line.strip()
-            })
+def validate_file(content: str, file_path: str) -> dict:
+    """Validate a file's content and return the result as a plain dict.
 
-        if re.search(JINJA_ERROR_PATTERNS["wrong_brackets"]["pattern"], line):
-            errors.append({
-                "line": line_num,
-                "type": "syntax_error",
-                "message": JINJA_ERROR_PATTERNS["wrong_brackets"]["message"],
-                "solution": JINJA_ERROR_PATTERNS["wrong_brackets"]["solution"],
-                "example": JINJA_ERROR_PATTERNS["wrong_brackets"]["example"],
-                "original": line.strip()
-            })
+    Used where results cross a process boundary or are cached, so the
+    aiohttp response is unwrapped here.
+    """
+    if file_path.lower().endswith((".jinja", ".jinja2", ".j2")):
+        response = check_jinja(content)
+    else:
+        response = check_syntax(content, file_path)
+    return json.loads(response.text)
 
-        if re.search(JINJA_ERROR_PATTERNS["missing_pipe"]["pattern"], line):
-            errors.append({
-                "line": line_num,
-                "type": "syntax_error",
-                "message": JINJA_ERROR_PATTERNS["missing_pipe"]["message"],
-                "solution": JINJA_ERROR_PATTERNS["missing_pipe"]["solution"],
-                "example": JINJA_ERROR_PATTERNS["missing_pipe"]["example"],
-                "original": line.strip()
-            })
+
+def _jinja_compile_error(content: str, err: Exception) -> dict:
+    """Turn a template compile error into a diagnostic, with a pattern hint when one matches."""
+    cause = err.__cause__ or err
+    line_num = getattr(cause, "lineno", None) or 1
+    lines = content.split('\n')
+    line = lines[line_num - 1] if line_num <= len(lines) else ""
+    hint = next(
+        (JINJA_ERROR_PATTERNS[key] for key in JINJA_SYNTAX_PATTERNS if re.search(JINJA_ERROR_PATTERNS[key]["pattern"], line)),
+        None,
+    )
+    return {
+        "line": line_num,
+        "type": "syntax_error",
+        "message": getattr(cause, "message", None) or str(err),
+        "solution": hint["solution"] if hint else "Check the template syntax on this line",
+        "example": hint["example"] if hint else "{{ states('sensor.temperature') | float(0) }}",
+        "original": line.strip()
+    }
+
+
+def check_jinja(content: str, compile_template: Callable[[str], Any] | None = None) -> web.Response:
+    """Check Jinja2 template syntax and provide intelligent suggestions.
+
+    With ``compile_template`` (TemplateManager.get) the template is compiled by
+    HA's engine, which finds real syntax errors and warms the render cache; only
+    the unquoted-entity pattern, which compiles cleanly, is still matched.
+    Without it (worker processes) every pattern is matched line by line.
+    """
+    errors = []
+    suggestions = []
+    patterns = ("missing_quotes", *JINJA_SYNTAX_PATTERNS)
+
+    if compile_template is not None:
+        patterns = ("missing_quotes",)
+        try:
+            compile_template(content)
+        except Exception as err:
+            errors.append(_jinja_compile_error(content, err))
+
+    # Every pattern needs "states(" or "{{" on the line, so most lines are
+    # skipped with a substring test and files without either are not split
+    has_candidates = len(content) <= HEURISTICS_MAX_BYTES and ('states(' in content or '{{' in content)
+    limit = STREAMING_MAX_PROBLEMS if len(content) > STREAMING_MIN_BYTES else None
+
+    for line_num, line in enumerate(content.split('\n') if has_candidates else (), 1):
+        if limit is not None and len(errors) >= limit:
+            break
+        if 'states(' not in line and '{{' not in line:
+            continue
+        for key in patterns:
+            if re.search(JINJA_ERROR_PATTERNS[key]["pattern"], line):
+                errors.append({
+                    "line": line_num,
+                    "type": "syntax_error",
+                    "message": JINJA_ERROR_PATTERNS[key]["message"],
+                    "solution": JINJA_ERROR_PATTERNS[key]["solution"],
+                    "example": JINJA_ERROR_PATTERNS[key]["example"],
+                    "original": line.strip()
+                })
 
     if "states(" in content:
         suggestions.append({
@@ -964,13 +1104,6 @@ def check_python(content: str) -> web.Response:
             "message": f"Found {len(errors)} Python error(s)"
         })
 
-    # Check for common Python issues
-    lines = content.split('\n')
-    for line_num, line in enumerate(lines, 1):
-        stripped = line.strip()
-        if not stripped or stripped.startswith('#'):
-            continue
-
     if errors:
         return json_response({
             "valid": False,
@@ -1004,20 +1137,26 @@ def check_javascript(content: str) -> web.Response:
             "message": "Empty JavaScript file"
         })
 
-    bracket_errors = _check_javascript_brackets(content)
-    errors.extend(bracket_errors)
+    if len(content) > HEURISTICS_MAX_BYTES:
+        return json_response({
+            "valid": True,
+            "message": "File too large for server-side JavaScript checks"
+        })
 
-    string_errors = _check_javascript_strings(content)
-    errors.extend(string_errors)
+    # Large (usually bundled) files: report the first problems only
+    streaming = len(content) > STREAMING_MIN_BYTES
+    limit = STREAMING_MAX_PROBLEMS if streaming else None
+    errors.extend(islice(_scan_javascript(content), limit))
 
-    lines = content.split('\n')
-    for line_num, line in enumerate(lines, 1):
+    for line_num, line in enumerate(content.split('\n'), 1):
+        if streaming and len(errors) + len(warnings) >= STREAMING_MAX_PROBLEMS:
+            break
         stripped = line.strip()
 
         if not stripped or stripped.startswith('//') or stripped.startswith('/*'):
             continue
 
-        if re.search(r'\b(funtion|constt|lett|varr|conts|lettt)\b', line):
+        if JS_TYPO_RE.search(line):
             errors.append({
                 "line": line_num,
                 "type": "syntax_error",
@@ -1069,174 +1208,99 @@ def _extract_json_error_location(error_msg: str) -> dict:
     return result
 
 
-def _check_javascript_strings(content: str) -> list:
-    """Check for unclosed strings and template literals."""
-    errors = []
-    in_string = False
-    in_template = False
-    string_char = None
-    string_start_line = 1
-
-    i = 0
-    line_num = 1
-    while i < len(content):
-        char = content[i]
-        next_char = content[i + 1] if i + 1 < len(content) else ''
-
-        if char == '\n':
-            line_num += 1
+def _line_text(content: str, offset: int) -> str:
+    """Return the stripped text of the line containing ``offset``."""
+    start = content.rfind('\n', 0, offset) + 1
+    end = content.find('\n', offset)
+    return content[start:end if end != -1 else len(content)].strip()
 
-        if not in_string and not in_template and char == '/' and next_char == '/':
-            i = content.find('\n', i)
-            if i == -1:
-                break
-            i += 1
-            line_num += 1
-            continue
 
-        if not in_string and not in_template and char == '/' and next_char == '*':
-            i = content.find('*/', i + 2)
-            if i == -1:
-                break
-            i += 2
-            continue
-
-        if char == '\\' and (in_string or in_template) and i + 1 < len(content):
-            i += 2
-            continue
-
-        if char in ('"', "'") and not in_template:
-            if not in_string:
-                in_string = True
-                string_char = char
-                string_start_line = line_num
-            elif char == string_char:
-                in_string = False
-
-        if char == '`' and not in_string:
-            if not in_template:
-                in_template = True
-                string_start_line = line_num
-            else:
-                in_template = False
-
-        i += 1
-
-    if in_string:
-        errors.append({
-            "line": string_start_line,
-            "type": "unclosed_string",
-            "message": f"Unclosed string (started with {string_char})",
-            "solution": f"Close string with {string_char}",
-            "example": f"{string_char}Hello World{string_char}",
-            "original": content.split('\n')[string_start_line - 1].strip() if string_start_line <= len(content.split('\n')) else ""
-        })
-
-    if in_template:
-        errors.append({
-            "line": string_start_line,
-            "type": "unclosed_template_literal",
-            "message": "Unclosed template literal",
-            "solution": "Close template literal with backtick `",
-            "example": "`Hello ${name}`",
-            "original": content.split('\n')[string_start_line - 1].strip() if string_start_line <= len(content.split('\n')) else ""
-        })
-
-    return errors
-
-
-def _check_javascript_brackets(content: str) -> list:
-    """Check for unmatched brackets, braces, and parentheses."""
-    errors = []
+def _scan_javascript(content: str) -> Iterator[dict]:
+    """Yield bracket, string and comment problems from a single tokenizer pass.
 
+    Comments, strings and template literals are matched whole by one regex, so
+    only brackets and literal boundaries reach Python code. Line numbers are
+    counted incrementally as the scan moves forward.
+    """
     brackets = {'(': ')', '[': ']', '{': '}'}
     stack = []
-    in_string = False
-    in_template = False
-    in_block_comment = False
-    string_char = None
-
-    i = 0
-    while i < len(content):
-        char = content[i]
-        next_char = content[i + 1] if i + 1 < len(content) else ''
-
-        if not in_string and not in_template and not in_block_comment and char == '/' and next_char == '/':
-            i = content.find('\n', i)
-            if i == -1:
-                break
-            i += 1
-            continue
-
-        if not in_string and not in_template and char == '/' and next_char == '*':
-            in_block_comment = True
-            i += 2
-            continue
-
-        if in_block_comment and char == '*' and next_char == '/':
-            in_block_comment = False
-            i += 2
-            continue
-
-        if in_block_comment:
-            i += 1
-            continue
+    line_num = 1
+    pos = 0
 
-        if char == '\\' and (in_string or in_template) and i + 1 < len(content):
-            i += 2
+    for match in JS_TOKEN_RE.finditer(content):
+        kind = match.lastgroup
+        if kind == "comment":
             continue
+        start = match.start()
+        line_num += content.count('\n', pos, start)
+        pos = start
 
-        if char in ('"', "'") and not in_template:
-            if not in_string:
-                in_string = True
-                string_char = char
-            elif char == string_char:
-                in_string = False
-
-        if char == '`' and not in_string:
-            in_template = not in_template
-
-        if not in_string and not in_template and not in_block_comment:
+        if kind == "bracket":
+            char = match.group()
             if char in brackets:
-                line_num = len(content[:i].split('\n'))
-                stack.append((char, line_num, i))
-            elif char in brackets.values():
-                line_num = len(content[:i].split('\n'))
-                if stack:
-                    opening_char, opening_line, opening_col = stack.pop()
-                    if brackets[opening_char] != char:
-                        errors.append({
-                            "line": line_num,
-                            "column": i,
-                            "type": "mismatched_bracket",
-                            "message": f"Mismatched bracket: expected '{brackets[opening_char]}' but found '{char}'",
-                            "solution": "Check all opening and closing brackets match",
-                            "example": "[1, 2, 3] is correct",
-                            "original": content.split('\n')[line_num - 1].strip() if line_num <= len(content.split('\n')) else ""
-                        })
-                else:
-                    errors.append({
+                stack.append((char, line_num, start))
+            elif stack:
+                opening_char, _, _ = stack.pop()
+                if brackets[opening_char] != char:
+                    yield {
                         "line": line_num,
-                        "column": i,
-                        "type": "unmatched_bracket",
-                        "message": f"Unmatched closing bracket '{char}'",
-                        "solution": "Check bracket/brace/parenthesis pairs are balanced",
+                        "column": start,
+                        "type": "mismatched_bracket",
+                        "message": f"Mismatched bracket: expected '{brackets[opening_char]}' but found '{char}'",
+                        "solution": "Check all opening and closing brackets match",
                         "example": "[1, 2, 3] is correct",
-                        "original": content.split('\n')[line_num - 1].strip() if line_num <= len(content.split('\n')) else ""
-                    })
+                        "original": _line_text(content, start)
+                    }
+            else:
+                yield {
+                    "line": line_num,
+                    "column": start,
+                    "type": "unmatched_bracket",
+                    "message": f"Unmatched closing bracket '{char}'",
+                    "solution": "Check bracket/brace/parenthesis pairs are balanced",
+                    "example": "[1, 2, 3] is correct",
+                    "original": _line_text(content, start)
+                }
+            continue
 
-        i += 1
+        if match.group(f"{kind}_end") is not None:
+            continue
+        # An unterminated literal runs to the end of the file
+        unclosed = (kind, line_num, start)
+        break
+    else:
+        unclosed = None
 
     if stack:
-        opening_char, line_num, col = stack.pop()
-        errors.append({
-            "line": line_num,
-            "column": col,
+        opening_char, opening_line, opening_offset = stack.pop()
+        yield {
+            "line": opening_line,
+            "column": opening_offset,
             "type": "unclosed_bracket",
             "message": f"Unclosed bracket '{opening_char}'",
             "solution": f"Close with '{brackets[opening_char]}'",
             "example": "[1, 2, 3] is correct",
-            "original": content.split('\n')[line_num - 1].strip() if line_num <= len(content.split('\n')) else ""
-        })
+            "original": _line_text(content, opening_offset)
+        }
 
-    return errors
+    if unclosed is not None:
+        kind, start_line, start = unclosed
+        if kind == "template":
+            yield {
+                "line": start_line,
+                "type": "unclosed_template_literal",
+                "message": "Unclosed template literal",
+                "solution": "Close template literal with backtick `",
+                "example": "`Hello ${name}`",
+                "original": _line_text(content, start)
+            }
+        else:
+            quote = content[start]
+            yield {
+                "line": start_line,
+                "type": "unclosed_string",
+                "message": f"Unclosed string (started with {quote})",
+                "solution": f"Close string with {quote}",
+                "example": f"{quote}Hello World{quote}",
+                "original": _line_text(content, start)
+            }
@@ -25,6 +25,9 @@ from .ai_manager import AIManager
 from .file_manager import FileManager
 from .sftp_manager import SftpManager
 from .terminal_manager import TerminalManager
+from .diagnostics_manager import DiagnosticsManager
+from .entity_index import EntityIndex
+from .registry_cache import RegistryCache
 
 from . import api_files
 from . import api_git
@@ -63,6 +66,9 @@ class BlueprintStudioApiView(HomeAssistantView):
         self.ai = AIManager(None, data)
         self.file = FileManager(None, config_dir)
         self.sftp = SftpManager(config_dir)
+        self.diagnostics = DiagnosticsManager(None, config_dir)
+        self.entities = EntityIndex(None)
+        self.registry = RegistryCache(None)
         self.terminal = None
 
     async def _authenticate(self, request):
@@ -78,7 +84,11 @@ class BlueprintStudioApiView(HomeAssistantView):
         self.hass = hass
         self.git.hass = hass
         self.ai.hass = hass
+        self.ai.templates.hass = hass
         self.file.hass = hass
+        self.diagnostics.hass = hass
+        self.entities.hass = hass
+        self.registry.hass = hass
         if not self.terminal:
             self.terminal = TerminalManager(hass)
         else:
@@ -111,14 +121,21 @@ class BlueprintStudioApiView(HomeAssistantView):
             "get_file_stat": lambda r, u, p, h: api_files.get_file_stat(self.file, p),
             "get_tree_snapshot": lambda r, u, p, h: api_files.get_tree_snapshot(self.file, p, h),
             "get_settings": lambda r, u, p, h: json_response(self.data.get("settings", {})),
+            "get_diagnostics": lambda r, u, p, h: json_response(self.diagnostics.snapshot()),
+            "get_validation_stats": lambda r, u, p, h: json_response({
+                **self.ai.validation_cache_stats(),
+                "entities": self.entities.stats(),
+                "registry": self.registry.stats(),
+            }),
             "get_version": lambda r, u, p, h: api_misc.get_version(h),
-            "get_devices": lambda r, u, p, h: api_misc.get_devices(h),
-            "get_areas":   lambda r, u, p, h: api_misc.get_areas(h),
-            "get_labels":  lambda r, u, p, h: api_misc.get_labels(h),
-            "get_floors":  lambda r, u, p, h: api_misc.get_floors(h),
+            "get_registry_snapshot": lambda r, u, p, h: api_misc.get_registry_snapshot(self.registry, p, r),
+            "get_devices": lambda r, u, p, h: api_misc.get_devices(self.registry),
+            "get_areas":   lambda r, u, p, h: api_misc.get_areas(self.registry),
+            "get_labels":  lambda r, u, p, h: api_misc.get_labels(self.registry),
+            "get_floors":  lambda r, u, p, h: api_misc.get_floors(self.registry),
             "get_themes":   lambda r, u, p, h: api_misc.get_themes(h),
             "get_addons":   lambda r, u, p, h: api_misc.get_addons(h),
-            "get_services": lambda r, u, p, h: api_misc.get_services(h),
+            "get_services": lambda r, u, p, h: api_misc.get_services(self.registry),
             "run_config_check": lambda r, u, p, h: api_misc.run_config_check(h),
             "list_hass_agents": lambda r, u, p, h: api_misc.list_hass_agents(h),
         }
@@ -192,18 +209,23 @@ class BlueprintStudioApiView(HomeAssistantView):
             "terminal_exec": lambda d, h, u: api_terminal.terminal_exec(self.terminal, d, u),
             # Git
             "git_status": lambda d, h, u: api_git.git_status(self.git, d),
-            "git_log": lambda d, h, u: api_git.git_log(self.git, d),
-            "git_diff_commit": lambda d, h, u: api_git.git_diff_commit(self.git, d),
+            "git_log": lambda d, h, u: api_git.git_log(self.git, d, request),
+            "git_diff_commit": lambda d, h, u: api_git.git_diff_commit(self.git, d, request),
             "git_pull": lambda d, h, u: api_git.git_pull(self.git, self.file),
             "git_push": lambda d, h, u: api_git.git_push(self.git, d),
             "git_push_only": lambda d, h, u: api_git.git_push_only(self.git),
             "git_commit": lambda d, h, u: api_git.git_commit(self.git, d),
+            "git_scan_staged": lambda d, h, u: api_git.git_scan_staged(self.git, d),
+            "git_precommit_check": lambda d, h, u: api_git.git_precommit_check(self.git),
             "git_show": lambda d, h, u: api_git.git_show(self.git, d),
+            "git_line_diff": lambda d, h, u: api_git.git_line_diff(self.git, d),
+            "git_blame": lambda d, h, u: api_git.git_blame(self.git, d, request),
             "git_init": lambda d, h, u: api_git.git_init(self.git, self.file),
             "git_add_remote": lambda d, h, u: api_git.git_add_remote(self.git, d),
             "git_remove_remote": lambda d, h, u: api_git.git_remove_remote(self.git, d),
             "git_delete_repo": lambda d, h, u: api_git.git_delete_repo(self.git),
             "git_repair_index": lambda d, h, u: api_git.git_repair_index(self.git),
+            "git_maintenance": lambda d, h, u: api_git.git_maintenance(self.git, d),
             "git_rename_branch": lambda d, h, u: api_git.git_rename_branch(self.git, d),
             "git_merge_unrelated": lambda d, h, u: api_git.git_merge_unrelated(self.git, d),
             "git_force_push": lambda d, h, u: api_git.git_force_push(self.git, d),
@@ -250,8 +272,8 @@ class BlueprintStudioApiView(HomeAssistantView):
             "github_follow": lambda d, h, u: api_git.github_follow(self.git),
             # Misc
             "restart_home_assistant": lambda d, h, u: api_misc.restart_home_assistant(h),
-            "get_entities": lambda d, h, u: api_misc.get_entities(h, d),
-            "render_template": lambda d, h, u: api_misc.render_template(h, d),
+            "get_entities": lambda d, h, u: api_misc.get_entities(self.entities, d, request),
+            "render_template": lambda d, h, u: api_misc.render_template(self.ai.templates, d),
             "call_service": lambda d, h, u: api_misc.call_service(h, d),
             "convert_to_blueprint": lambda d, h, u: api_misc.convert_to_blueprint(self.ai, d, h),
             "parse_blueprint_inputs": lambda d, h, u: api_misc.parse_blueprint_inputs(self.ai, d, h),
@@ -14,23 +14,45 @@ async def git_status(git_manager, data):
     return await git_manager.get_status(data.get("fetch", False))
 
 
-async def git_log(git_manager, data):
-    return await git_manager.get_log(data.get("count", 20))
+async def git_log(git_manager, data, request):
+    return await git_manager.get_log(
+        data.get("count", 20), data.get("after"), data.get("path"),
+        data.get("stream", False), request
+    )
+
+
+async def git_diff_commit(git_manager, data, request):
+    return await git_manager.diff_commit(
+        data.get("hash"), data.get("path"), data.get("old_path"),
+        data.get("stream", False), request, data.get("force", False)
+    )
+
+
+async def git_blame(git_manager, data, request):
+    return await git_manager.blame(data.get("path"), data.get("stream", False), request)
+
+
+async def git_line_diff(git_manager, data):
+    return await git_manager.line_diff(data.get("path"), data.get("content"), data.get("hash"))
 
 
-async def git_diff_commit(git_manager, data):
-    return await git_manager.diff_commit(data.get("hash"))
+async def git_maintenance(git_manager, data):
+    return await git_manager.maintenance(data.get("enable"), data.get("run", True))
 
 
 async def git_pull(git_manager, file_manager):
     response = await git_manager.pull()
     if response.status == 200:
         file_manager.clear_cache()
+        # Pulled files changed on disk: refresh clients and workspace diagnostics
+        file_manager._fire_update("git_pull")
     return response
 
 
 async def git_push(git_manager, data):
-    return await git_manager.push(data.get("commit_message", "Update via Blueprint Studio"))
+    return await git_manager.push(
+        data.get("commit_message", "Update via Blueprint Studio"), large_files=data.get("large_files", "warn")
+    )
 
 
 async def git_push_only(git_manager):
@@ -38,7 +60,17 @@ async def git_push_only(git_manager):
 
 
 async def git_commit(git_manager, data):
-    return await git_manager.commit(data.get("commit_message", "Update via Blueprint Studio"))
+    return await git_manager.commit(
+        data.get("commit_message", "Update via Blueprint Studio"), data.get("large_files", "warn")
+    )
+
+
+async def git_precommit_check(git_manager):
+    return await git_manager.precommit_check()
+
+
+async def git_scan_staged(git_manager, data):
+    return await git_manager.scan_staged(data.get("max_size"), data.get("fix", False))
 
 
 async def git_show(git_manager, data):
@@ -178,7 +210,7 @@ async def gitea_pull(git_manager):
 async def gitea_push(git_manager, data):
     return await git_manager.push(
         data.get("commit_message", "Update via Blueprint Studio"),
-        remote="gitea", auth_provider="gitea"
+        remote="gitea", auth_provider="gitea", large_files=data.get("large_files", "warn")
     )
 
 
@@ -239,7 +271,7 @@ async def github_device_flow_start(git_manager, data):
 
 async def github_device_flow_poll(git_manager, data):
     return await git_manager.github_device_flow_poll(
-        data.get("client_id"), data.get("device_code")
+        data.get("client_id"), data.get("device_code"), data.get("wait", 0)
     )
 
 
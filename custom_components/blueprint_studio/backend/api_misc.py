@@ -3,43 +3,19 @@ from __future__ import annotations
 
 import logging
 import subprocess
-import time
+
+from aiohttp import web
+from homeassistant.helpers.json import json_bytes
 
 from ..const import VERSION
-from .util import json_response
+from .entity_index import DEFAULT_PAGE_SIZE
+from .registry_cache import SECTIONS
+from .util import json_message, json_response
 
 _LOGGER = logging.getLogger(__name__)
 
-
-# ---------------------------------------------------------------------------
-# Short-lived in-memory cache for expensive HA state/registry reads.
-# These endpoints are called on every page load and panel open, but the
-# underlying data rarely changes within a few seconds.
-# ---------------------------------------------------------------------------
-class _HassCache:
-    """Simple TTL cache for HA state queries."""
-
-    _store: dict[str, tuple[float, object]] = {}
-    _ttl: float = 5.0  # seconds
-
-    @classmethod
-    def get(cls, key: str) -> object | None:
-        entry = cls._store.get(key)
-        if entry and (time.monotonic() - entry[0]) < cls._ttl:
-            return entry[1]
-        return None
-
-    @classmethod
-    def set(cls, key: str, value: object) -> None:
-        cls._store[key] = (time.monotonic(), value)
-
-    @classmethod
-    def invalidate(cls, key: str) -> None:
-        cls._store.pop(key, None)
-
-    @classmethod
-    def invalidate_all(cls) -> None:
-        cls._store.clear()
+# Entities per write when streaming get_entities with attributes
+ENTITY_STREAM_BATCH = 250
 
 
 # ========== Settings ==========
@@ -148,88 +124,56 @@ async def restart_home_assistant(hass):
     return json_response({"success": True, "message": "Restarting..."})
 
 
-async def get_entities(hass, data):
-    """Get HA entities, optionally filtered by query, domains, and/or device_class.
+async def _stream_entities_with_attributes(entity_index, result, request):
+    """Stream a get_entities page with attributes, from per-entity cached JSON."""
+    response = web.StreamResponse()
+    response.content_type = "application/json"
+    response.headers["Cache-Control"] = "no-cache"
+    await response.prepare(request)
+
+    await response.write(b'{"entities":[')
+    entities = result["entities"]
+    for start in range(0, len(entities), ENTITY_STREAM_BATCH):
+        chunk = b",".join(
+            json_bytes(entry)[:-1] + b',"attributes":' + entity_index.attributes_json(entry["entity_id"]) + b"}"
+            for entry in entities[start:start + ENTITY_STREAM_BATCH]
+        )
+        await response.write(chunk if start == 0 else b"," + chunk)
+    # Close the list and append the paging fields ("total", "next_offset", ...)
+    await response.write(b"]," + json_bytes({k: v for k, v in result.items() if k != "entities"})[1:])
+    await response.write_eof()
+    return response
+
+
+async def get_entities(entity_index, data, request):
+    """Get one page of HA entities, optionally filtered by query, domains, and/or device_class.
 
     Parameters:
         domains       – If set, only return entities from these domains.
         device_classes – If set, only return entities with these device_class values.
-        ensure_domains – Domains whose entities are *always* included before the cap,
-                         even when 'domains' is unset (mixed restricted/unrestricted case).
-        query         – Text filter on entity_id / friendly_name.
+        ensure_domains – Domains whose entities are listed first, even when
+                         'domains' is unset (mixed restricted/unrestricted case).
+        query         – Text filter on entity_id / friendly_name, best matches first.
+        offset, limit – Page window; the response's 'next_offset' is null on the last page.
     """
-    query = data.get("query", "").lower()
-    domains = data.get("domains")           # e.g. ["camera", "light"]
-    device_classes = data.get("device_classes")  # e.g. ["motion", "door"]
-    ensure_domains = data.get("ensure_domains")  # e.g. ["camera", "device_tracker"]
-
-    # Only use the cache for unfiltered requests (the common page-load case).
-    # Filtered requests (AI autocomplete, entity pickers) are always fresh.
-    use_cache = not query and not domains and not device_classes and not ensure_domains
-    cache_key = "entities_all"
-    if use_cache:
-        cached = _HassCache.get(cache_key)
-        if cached is not None:
-            return json_response({"entities": cached})
-
-    # Build entity_id → platform (integration) lookup from entity registry
-    platform_map = {}
     try:
-        from homeassistant.helpers import entity_registry as er
-        ent_reg = er.async_get(hass)
-        for entry in ent_reg.entities.values():
-            platform_map[entry.entity_id] = entry.platform
-    except Exception:
-        pass  # Graceful fallback — entities just won't have integration info
-
-    ensured = []   # entities from ensure_domains — always included
-    general = []   # everything else — capped
-
-    for s in hass.states.async_all():
-        eid = s.entity_id
-        eid_lower = eid.lower()
-        if domains and not any(eid_lower.startswith(d + ".") for d in domains):
-            continue
-        if device_classes:
-            dc = (s.attributes.get("device_class") or "").lower()
-            if dc not in device_classes:
-                continue
-        fname = str(s.attributes.get("friendly_name", "")).lower()
-        if query and query not in eid_lower and query not in fname:
-            continue
-        entry = {
-            "entity_id": eid,
-            "friendly_name": s.attributes.get("friendly_name"),
-            "icon": s.attributes.get("icon"),
-            "state": s.state,
-            "device_class": s.attributes.get("device_class"),
-            "integration": platform_map.get(eid),
-        }
-        if data.get("with_attributes"):
-            # Exclude very large / unserializable attributes
-            attrs = {}
-            for ak, av in s.attributes.items():
-                try:
-                    import json as _json
-                    _json.dumps(av)
-                    attrs[ak] = av
-                except Exception:
-                    attrs[ak] = str(av)
-            entry["attributes"] = attrs
-        if ensure_domains and not domains and any(eid_lower.startswith(d + ".") for d in ensure_domains):
-            ensured.append(entry)
-        else:
-            general.append(entry)
-
-    # Always include all ensured entities, fill remaining cap with general entities
-    cap = 1000
-    remaining = max(0, cap - len(ensured))
-    entities = ensured + general[:remaining]
-
-    if use_cache:
-        _HassCache.set(cache_key, entities)
-
-    return json_response({"entities": entities})
+        offset = int(data.get("offset") or 0)
+        limit = int(data.get("limit") or DEFAULT_PAGE_SIZE)
+    except (TypeError, ValueError):
+        return json_message("offset and limit must be integers", status_code=400)
+
+    result = entity_index.search(
+        query=data.get("query") or "",
+        domains=data.get("domains"),              # e.g. ["camera", "light"]
+        device_classes=data.get("device_classes"),  # e.g. ["motion", "door"]
+        ensure_domains=data.get("ensure_domains"),  # e.g. ["camera", "device_tracker"]
+        offset=offset,
+        limit=limit,
+    )
+
+    if data.get("with_attributes"):
+        return await _stream_entities_with_attributes(entity_index, result, request)
+    return json_response(result)
 
 
 async def get_version(hass):
@@ -250,70 +194,42 @@ async def get_version(hass):
     })
 
 
-async def get_devices(hass):
+async def get_registry_snapshot(registry, params, request):
+    """Return devices, areas, floors, labels and services in one response.
+
+    ``sections`` (comma-separated) limits the snapshot. The response carries
+    an ETag; a matching If-None-Match header is answered with 304. Snapshots
+    with a failed section carry no ETag and must not be stored.
+    """
+    requested = params.get("sections")
+    sections = tuple(s for s in SECTIONS if s in requested.split(",")) if requested else SECTIONS
+    etag, body = await registry.async_snapshot(sections)
+    if etag is None:
+        return web.Response(body=body, content_type="application/json", headers={"Cache-Control": "no-store"})
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("If-None-Match") == etag:
+        return web.Response(status=304, headers=headers)
+    return web.Response(body=body, content_type="application/json", headers=headers)
+
+
+async def get_devices(registry):
     """Return all registered devices with integration, manufacturer, and model."""
-    cached = _HassCache.get("devices")
-    if cached is not None:
-        return json_response({"success": True, "devices": cached})
-    try:
-        from homeassistant.helpers import device_registry as dr
-        dev_reg = dr.async_get(hass)
-        devices = []
-        for d in dev_reg.devices.values():
-            identifiers = list(d.identifiers) if d.identifiers else []
-            integration = identifiers[0][0] if identifiers else None
-            devices.append({
-                "id": d.id,
-                "name": d.name_by_user or d.name or d.id,
-                "manufacturer": d.manufacturer,
-                "model": d.model,
-                "integration": integration,
-            })
-        _HassCache.set("devices", devices)
-        return json_response({"success": True, "devices": devices})
-    except Exception as e:
-        _LOGGER.debug("get_devices failed: %s", e)
-        return json_response({"success": True, "devices": []})
+    return json_response({"success": True, "devices": await registry.async_section("devices")})
 
 
-async def get_areas(hass):
+async def get_areas(registry):
     """Return all registered areas as id/name pairs."""
-    cached = _HassCache.get("areas")
-    if cached is not None:
-        return json_response({"success": True, "areas": cached})
-    try:
-        from homeassistant.helpers import area_registry as ar
-        area_reg = ar.async_get(hass)
-        areas = [{"id": a.id, "name": a.name} for a in area_reg.areas.values()]
-        _HassCache.set("areas", areas)
-        return json_response({"success": True, "areas": areas})
-    except Exception as e:
-        _LOGGER.debug("get_areas failed: %s", e)
-        return json_response({"success": True, "areas": []})
+    return json_response({"success": True, "areas": await registry.async_section("areas")})
 
 
-async def get_labels(hass):
+async def get_labels(registry):
     """Return all registered labels as id/name pairs."""
-    try:
-        from homeassistant.helpers import label_registry as lr
-        label_reg = lr.async_get(hass)
-        labels = [{"id": lb.label_id, "name": lb.name} for lb in label_reg.labels.values()]
-        return json_response({"success": True, "labels": labels})
-    except Exception as e:
-        _LOGGER.debug("get_labels failed: %s", e)
-        return json_response({"success": True, "labels": []})
+    return json_response({"success": True, "labels": await registry.async_section("labels")})
 
 
-async def get_floors(hass):
+async def get_floors(registry):
     """Return all registered floors as id/name pairs."""
-    try:
-        from homeassistant.helpers import floor_registry as fr
-        floor_reg = fr.async_get(hass)
-        floors = [{"id": f.floor_id, "name": f.name} for f in floor_reg.floors.values()]
-        return json_response({"success": True, "floors": floors})
-    except Exception as e:
-        _LOGGER.debug("get_floors failed: %s", e)
-        return json_response({"success": True, "floors": []})
+    return json_response({"success": True, "floors": await registry.async_section("floors")})
 
 
 async def reload_automations(hass):
@@ -389,78 +305,18 @@ async def get_addons(hass):
         return json_response({"success": True, "addons": []})
 
 
-async def get_services(hass):
-    """Return all registered HA services with full metadata from services.yaml.
-
-    Uses async_get_all_descriptions() — the same source the HA frontend uses —
-    so fields, selectors, descriptions and examples are always complete.
-    """
-    cached = _HassCache.get("services")
-    if cached is not None:
-        return json_response({"success": True, "services": cached})
-
-    try:
-        from homeassistant.helpers.service import async_get_all_descriptions
-
-        # async_get_all_descriptions returns:
-        # { domain: { service_name: { name, description, fields: { key: { description, example, selector, required } } } } }
-        descriptions = await async_get_all_descriptions(hass)
-
-        services = []
-        for domain, domain_services in descriptions.items():
-            for service_name, meta in domain_services.items():
-                if meta is None:
-                    meta = {}
-                raw_fields = meta.get("fields") or {}
-                fields = {}
-                for k, v in raw_fields.items():
-                    if not isinstance(v, dict):
-                        continue
-                    # Skip collapsed section headers (they have a "fields" subkey but no selector)
-                    if "fields" in v and "selector" not in v:
-                        # Flatten advanced/collapsed sections into top-level fields
-                        for sk, sv in v["fields"].items():
-                            if isinstance(sv, dict):
-                                fields[sk] = {
-                                    "description": sv.get("description") or sv.get("name") or "",
-                                    "required": bool(sv.get("required", False)),
-                                    "example": sv.get("example"),
-                                    "selector": sv.get("selector"),
-                                }
-                    else:
-                        fields[k] = {
-                            "description": v.get("description") or v.get("name") or "",
-                            "required": bool(v.get("required", False)),
-                            "example": v.get("example"),
-                            "selector": v.get("selector"),
-                        }
-                services.append({
-                    "service": f"{domain}.{service_name}",
-                    "domain": domain,
-                    "name": meta.get("name") or service_name,
-                    "description": meta.get("description") or "",
-                    "fields": fields,
-                })
-
-        services.sort(key=lambda s: s["service"])
-        # Cache for 60 seconds — services rarely change
-        _HassCache._store["services"] = (time.monotonic() - _HassCache._ttl + 60.0, services)
-        return json_response({"success": True, "services": services})
-    except Exception as e:
-        _LOGGER.debug("get_services failed: %s", e)
-        return json_response({"success": True, "services": []})
+async def get_services(registry):
+    """Return all registered HA services with full metadata from services.yaml."""
+    return json_response({"success": True, "services": await registry.async_section("services")})
 
 
-async def render_template(hass, data):
-    """Render a Jinja2 template string using HA's template engine."""
+async def render_template(template_manager, data):
+    """Render a Jinja2 template string using HA's template engine (cached, time-limited)."""
     template_str = data.get("template", "")
     if not template_str:
         return json_response({"success": True, "result": ""})
     try:
-        from homeassistant.helpers import template as tpl
-        tmpl = tpl.Template(template_str, hass)
-        result = await hass.async_add_executor_job(tmpl.async_render)
-        return json_response({"success": True, "result": str(result)})
+        return json_response(await template_manager.async_render(template_str))
     except Exception as e:
         return json_response({"success": False, "error": str(e)})
 
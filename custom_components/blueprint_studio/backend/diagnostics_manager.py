@@ -0,0 +1,220 @@
+"""Background YAML diagnostics for the whole workspace."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from ..const import EXCLUDED_PATTERNS
+from .ai_validators import validate_file
+from .workers import MAX_WORKERS, async_run_in_worker
+
+_LOGGER = logging.getLogger(__name__)
+
+DIAGNOSTICS_EVENT = "blueprint_studio_diagnostics"
+YAML_EXTENSIONS = (".yaml", ".yml")
+# Wait for HA to settle before the first full scan
+STARTUP_DELAY = 60.0
+# Coalesce bursts of change events (saves, bulk uploads) into one pass
+CHANGE_DEBOUNCE = 0.5
+MAX_FILE_BYTES = 2 * 1024 * 1024
+MAX_PROBLEMS = 20
+# Bulk operations, and folder-level changes, are handled with an mtime rescan
+RESCAN_ACTIONS = {"delete_multi", "move_multi", "upload_folder", "git_pull"}
+FOLDER_ACTIONS = {"rename", "copy", "delete"}
+LINE_RE = re.compile(r"line (\d+)")
+
+
+def validate_workspace_file(abs_path: str, rel_path: str) -> dict[str, Any]:
+    """Validate one file from disk and return a compact summary (runs in a worker process)."""
+    with open(abs_path, encoding="utf-8", errors="replace") as handle:
+        result = validate_file(handle.read(), rel_path)
+
+    problems = []
+    if result.get("error"):
+        match = LINE_RE.search(result["error"])
+        problems.append({"line": int(match.group(1)) if match else None, "message": result["error"], "severity": "error"})
+    for severity, key in (("error", "errors"), ("warning", "warnings")):
+        for item in result.get(key, []):
+            problems.append({"line": item.get("line"), "message": item.get("message", ""), "severity": severity})
+    return {
+        "valid": bool(result.get("valid", True)),
+        "errors": sum(1 for p in problems if p["severity"] == "error"),
+        "warnings": sum(1 for p in problems if p["severity"] == "warning"),
+        "problems": problems[:MAX_PROBLEMS],
+    }
+
+
+class DiagnosticsManager:
+    """Keep validation results for every YAML file under the config dir up to date."""
+
+    def __init__(self, hass: HomeAssistant | None, config_dir: Path) -> None:
+        """Initialize diagnostics manager."""
+        self.hass = hass
+        self.config_dir = config_dir
+        # rel path -> {"mtime", "size", "valid", "errors", "warnings", "problems"}
+        self._results: dict[str, dict[str, Any]] = {}
+        self._pending: set[str] = set()
+        self._rescan = False
+        self._flush_unsub = None
+        self._start_unsub = None
+        self._listener = None
+        self._task: asyncio.Task | None = None
+        self._semaphore = asyncio.Semaphore(MAX_WORKERS * 2)
+
+    def _is_candidate(self, rel_path: str) -> bool:
+        """Return True for YAML files outside excluded/hidden folders."""
+        parts = Path(rel_path).parts
+        return (
+            rel_path.lower().endswith(YAML_EXTENSIONS)
+            and not any(part in EXCLUDED_PATTERNS or part.startswith(".") for part in parts)
+        )
+
+    def _walk(self) -> dict[str, tuple[float, int]]:
+        """Return (mtime, size) for every candidate YAML file (runs in executor)."""
+        found = {}
+        for root, dirs, files in os.walk(self.config_dir):
+            dirs[:] = [d for d in dirs if d not in EXCLUDED_PATTERNS and not d.startswith(".")]
+            for name in files:
+                if not name.lower().endswith(YAML_EXTENSIONS):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if stat.st_size <= MAX_FILE_BYTES:
+                    found[os.path.relpath(path, self.config_dir).replace(os.sep, "/")] = (stat.st_mtime, stat.st_size)
+        return found
+
+    def _stat(self, rel_path: str) -> tuple[float, int] | None:
+        """Return (mtime, size) for one file, or None if it is gone or too large."""
+        try:
+            stat = (self.config_dir / rel_path).stat()
+        except OSError:
+            return None
+        return (stat.st_mtime, stat.st_size) if stat.st_size <= MAX_FILE_BYTES else None
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return the current diagnostics of every file with problems."""
+        return {
+            path: {k: v for k, v in result.items() if k not in ("mtime", "size")}
+            for path, result in self._results.items()
+            if result["errors"] or result["warnings"]
+        }
+
+    @callback
+    def async_start(self) -> None:
+        """Schedule the initial scan and start following file change events."""
+        if self._listener is None:
+            self._listener = self.hass.bus.async_listen("blueprint_studio_update", self._async_on_file_event)
+            self._start_unsub = async_call_later(self.hass, STARTUP_DELAY, self._async_start_scan)
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop listening and cancel any running validation."""
+        for unsub in (self._listener, self._start_unsub, self._flush_unsub):
+            if unsub is not None:
+                unsub()
+        self._listener = self._start_unsub = self._flush_unsub = None
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    async def _async_start_scan(self, _now: Any) -> None:
+        """Run the first full workspace scan."""
+        self._start_unsub = None
+        self._rescan = True
+        await self._async_flush(None)
+
+    @callback
+    def _async_on_file_event(self, event) -> None:
+        """Queue files reported by the change journal for revalidation."""
+        action, path = event.data.get("action"), event.data.get("path")
+        if path:
+            if os.path.isabs(path):
+                try:
+                    path = os.path.relpath(path, self.config_dir).replace(os.sep, "/")
+                except ValueError:
+                    return
+            path = path.lstrip("/")
+            if path.startswith(".."):
+                return
+            if self._is_candidate(path):
+                self._pending.add(path)
+            elif action in FOLDER_ACTIONS:
+                self._rescan = True
+            else:
+                return
+        elif action in RESCAN_ACTIONS:
+            self._rescan = True
+        else:
+            return
+        if self._flush_unsub is None:
+            self._flush_unsub = async_call_later(self.hass, CHANGE_DEBOUNCE, self._async_flush)
+
+    async def _async_flush(self, _now: Any) -> None:
+        """Revalidate queued files (or everything whose mtime changed on rescan)."""
+        self._flush_unsub = None
+        if self._task is not None and not self._task.done():
+            # A pass is running; try again once it has finished
+            self._flush_unsub = async_call_later(self.hass, CHANGE_DEBOUNCE, self._async_flush)
+            return
+        self._task = self.hass.async_create_task(self._async_run_pass())
+
+    async def _async_run_pass(self) -> None:
+        """Collect stats for the queued work and validate what changed."""
+        pending, self._pending = self._pending, set()
+        rescan, self._rescan = self._rescan, False
+        try:
+            if rescan:
+                stats = await self.hass.async_add_executor_job(self._walk)
+                for path in list(self._results):
+                    if path not in stats:
+                        self._remove(path)
+            else:
+                stats = {}
+                for path in pending:
+                    stat = await self.hass.async_add_executor_job(self._stat, path)
+                    if stat is None:
+                        self._remove(path)
+                    else:
+                        stats[path] = stat
+            changed = [
+                path for path, stat in stats.items()
+                if (self._results.get(path, {}).get("mtime"), self._results.get(path, {}).get("size")) != stat
+            ]
+            await asyncio.gather(*(self._async_validate(path, stats[path]) for path in changed))
+            if rescan:
+                _LOGGER.debug("Diagnostics: scanned %d YAML files, %d revalidated", len(stats), len(changed))
+        except asyncio.CancelledError:
+            raise
+        except Exception as err:
+            _LOGGER.error("Error running workspace diagnostics: %s", err)
+
+    async def _async_validate(self, path: str, stat: tuple[float, int]) -> None:
+        """Validate one file in the worker pool and publish the result if it changed."""
+        async with self._semaphore:
+            try:
+                result = await async_run_in_worker(self.hass, validate_workspace_file, str(self.config_dir / path), path)
+            except (OSError, UnicodeError) as err:
+                _LOGGER.debug("Diagnostics: could not read %s: %s", path, err)
+                return
+        previous = self._results.get(path)
+        self._results[path] = {"mtime": stat[0], "size": stat[1], **result}
+        if previous is None and not (result["errors"] or result["warnings"]):
+            return
+        if previous is not None and all(previous.get(k) == result[k] for k in result):
+            return
+        self.hass.bus.async_fire(DIAGNOSTICS_EVENT, {"path": path, "result": result})
+
+    def _remove(self, path: str) -> None:
+        """Forget a deleted file and tell clients to clear its badge."""
+        previous = self._results.pop(path, None)
+        if previous and (previous["errors"] or previous["warnings"]):
+            self.hass.bus.async_fire(DIAGNOSTICS_EVENT, {"path": path, "result": None})
@@ -0,0 +1,467 @@
+"""Incrementally maintained search index over Home Assistant entities."""
+from __future__ import annotations
+
+import heapq
+import logging
+import re
+from bisect import bisect_left, insort
+from typing import Any, Callable
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, State, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.json import json_bytes
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 1000
+MAX_PAGE_SIZE = 5000
+# Words of entity ids and friendly names ("light.kitchen_ceiling" -> light, kitchen, ceiling)
+TOKEN_RE = re.compile(r"[^\W_]+")
+
+# Ranking tiers for query matches; lower ranks come first
+RANK_EXACT = 0      # entity_id, object_id or friendly_name equals the query
+RANK_PREFIX = 1     # ... starts with the query
+RANK_TOKENS = 2     # every query word starts a word of the entity
+RANK_SUBSTRING = 3  # query appears anywhere in entity_id or friendly_name
+
+# Websocket entity feed: changes are batched and sent at most this often
+FEED_INTERVAL_MS = 500
+FEED_MIN_INTERVAL_MS = 100
+FEED_MAX_INTERVAL_MS = 10_000
+# Most entities whose attributes one request may ask for
+MAX_ATTRIBUTE_ENTITIES = 200
+
+
+def _tokens(*texts: str) -> frozenset[str]:
+    """Return the lowercase words of ``texts``."""
+    return frozenset(token for text in texts for token in TOKEN_RE.findall(text))
+
+
+def compact_entry(entry: dict[str, Any]) -> dict[str, Any]:
+    """Return the feed form of an index entry: name, state, device_class and icon, if set."""
+    compact = {"s": entry["state"]}
+    for key, field in (("n", "friendly_name"), ("d", "device_class"), ("i", "icon")):
+        if entry[field] is not None:
+            compact[key] = entry[field]
+    return compact
+
+
+class EntityIndex:
+    """Entity list for get_entities, kept current from state and registry events.
+
+    Entities are bucketed by domain and device_class, and a sorted word list
+    answers prefix queries over entity_id and friendly_name without walking
+    the state machine. Runs on the event loop only.
+    """
+
+    def __init__(self, hass: HomeAssistant | None) -> None:
+        """Initialize entity index."""
+        self.hass = hass
+        # entity_id -> response entry (shared, never mutated after it is returned)
+        self._entries: dict[str, dict[str, Any]] = {}
+        # entity_id -> (entity_id lowercased, friendly_name lowercased)
+        self._search: dict[str, tuple[str, str]] = {}
+        self._words_of: dict[str, frozenset[str]] = {}
+        self._by_domain: dict[str, set[str]] = {}
+        self._by_device_class: dict[str, set[str]] = {}
+        self._by_word: dict[str, set[str]] = {}
+        self._words: list[str] = []  # sorted keys of _by_word, for prefix ranges
+        self._sorted_ids: list[str] | None = None
+        # entity_id -> integration, from the entity registry
+        self._platforms: dict[str, str] = {}
+        self._unsubs: list = []
+        # entity_id -> (state.last_updated, attributes as JSON bytes)
+        self._attributes_json: dict[str, tuple[Any, bytes]] = {}
+        self._attributes_hits = 0
+        self._attributes_misses = 0
+        # Called with (entity_id, entry) on every change, entry None on removal
+        self._listeners: list[Callable[[str, dict[str, Any] | None], None]] = []
+
+    @property
+    def started(self) -> bool:
+        """Return True while the index follows state and registry events."""
+        return bool(self._unsubs)
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @callback
+    def async_start(self) -> None:
+        """Build the index from the current states and follow changes."""
+        if self._unsubs:
+            return
+        self._unsubs = [
+            self.hass.bus.async_listen(EVENT_STATE_CHANGED, self._async_on_state_changed),
+            self.hass.bus.async_listen(er.EVENT_ENTITY_REGISTRY_UPDATED, self._async_on_registry_updated),
+        ]
+        self._async_rebuild()
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following events and drop the index."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+        self._clear()
+
+    def _clear(self) -> None:
+        for store in (
+            self._entries, self._search, self._words_of, self._by_domain,
+            self._by_device_class, self._by_word, self._platforms, self._attributes_json,
+        ):
+            store.clear()
+        self._words = []
+        self._sorted_ids = None
+
+    @callback
+    def async_add_listener(self, listener: Callable[[str, dict[str, Any] | None], None]) -> Callable[[], None]:
+        """Call ``listener(entity_id, entry)`` whenever an entry changes; returns a remove function."""
+        self._listeners.append(listener)
+
+        @callback
+        def _remove() -> None:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+        return _remove
+
+    def _notify(self, entity_id: str, entry: dict[str, Any] | None) -> None:
+        for listener in list(self._listeners):
+            listener(entity_id, entry)
+
+    @callback
+    def _async_rebuild(self) -> None:
+        """Index every entity from scratch."""
+        self._clear()
+        try:
+            registry = er.async_get(self.hass)
+            self._platforms = {entry.entity_id: entry.platform for entry in registry.entities.values()}
+        except Exception:
+            pass  # Graceful fallback — entities just won't have integration info
+        for state in self.hass.states.async_all():
+            self._add(state)
+
+    # ------------------------------------------------------------------
+    # Event handlers
+    # ------------------------------------------------------------------
+
+    @callback
+    def _async_on_state_changed(self, event: Event) -> None:
+        entity_id = event.data["entity_id"]
+        new_state = event.data.get("new_state")
+        if new_state is None:
+            self._remove(entity_id)
+        else:
+            self._add(new_state)
+
+    @callback
+    def _async_on_registry_updated(self, event: Event) -> None:
+        action, entity_id = event.data.get("action"), event.data.get("entity_id")
+        if action == "remove":
+            self._platforms.pop(entity_id, None)
+        else:
+            self._platforms.pop(event.data.get("old_entity_id"), None)
+            entry = er.async_get(self.hass).async_get(entity_id)
+            if entry is not None:
+                self._platforms[entity_id] = entry.platform
+        current = self._entries.get(entity_id)
+        if current is not None and current["integration"] != self._platforms.get(entity_id):
+            self._entries[entity_id] = {**current, "integration": self._platforms.get(entity_id)}
+            self._notify(entity_id, self._entries[entity_id])
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def _add(self, state: State) -> None:
+        """Add or refresh one entity; buckets and words change only if needed."""
+        entity_id = state.entity_id
+        attributes = state.attributes
+        device_class = attributes.get("device_class")
+        entry = {
+            "entity_id": entity_id,
+            "friendly_name": attributes.get("friendly_name"),
+            "icon": attributes.get("icon"),
+            "state": state.state,
+            "device_class": device_class,
+            "integration": self._platforms.get(entity_id),
+        }
+        previous = self._entries.get(entity_id)
+        self._entries[entity_id] = entry
+        if entry != previous:  # attribute-only changes are not forwarded
+            self._notify(entity_id, entry)
+
+        if previous is None:
+            self._sorted_ids = None
+            self._by_domain.setdefault(state.domain, set()).add(entity_id)
+        elif previous["device_class"] != device_class:
+            self._discard(self._by_device_class, (previous["device_class"] or "").lower(), entity_id)
+        elif previous["friendly_name"] == entry["friendly_name"]:
+            return
+        self._by_device_class.setdefault((device_class or "").lower(), set()).add(entity_id)
+
+        search = (entity_id.lower(), str(entry["friendly_name"] or "").lower())
+        if self._search.get(entity_id) != search:
+            self._search[entity_id] = search
+            self._set_words(entity_id, _tokens(*search))
+
+    def _remove(self, entity_id: str) -> None:
+        entry = self._entries.pop(entity_id, None)
+        if entry is None:
+            return
+        self._sorted_ids = None
+        self._discard(self._by_domain, entity_id.split(".", 1)[0], entity_id)
+        self._discard(self._by_device_class, (entry["device_class"] or "").lower(), entity_id)
+        self._search.pop(entity_id, None)
+        self._set_words(entity_id, frozenset())
+        self._words_of.pop(entity_id, None)
+        self._attributes_json.pop(entity_id, None)
+        self._notify(entity_id, None)
+
+    def _set_words(self, entity_id: str, words: frozenset[str]) -> None:
+        old = self._words_of.get(entity_id, frozenset())
+        for word in old - words:
+            if self._discard(self._by_word, word, entity_id):
+                del self._words[bisect_left(self._words, word)]
+        for word in words - old:
+            bucket = self._by_word.get(word)
+            if bucket is None:
+                bucket = self._by_word[word] = set()
+                insort(self._words, word)
+            bucket.add(entity_id)
+        self._words_of[entity_id] = words
+
+    @staticmethod
+    def _discard(buckets: dict[str, set[str]], key: str, entity_id: str) -> bool:
+        """Remove ``entity_id`` from ``buckets[key]``; return True if the bucket was dropped."""
+        bucket = buckets.get(key)
+        if bucket is None:
+            return False
+        bucket.discard(entity_id)
+        if not bucket:
+            del buckets[key]
+            return True
+        return False
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _with_prefix(self, prefix: str) -> set[str]:
+        """Return the entities having a word that starts with ``prefix``."""
+        found: set[str] = set()
+        words = self._words
+        for i in range(bisect_left(words, prefix), len(words)):
+            if not words[i].startswith(prefix):
+                break
+            found |= self._by_word[words[i]]
+        return found
+
+    def _rank(self, entity_id: str, query: str) -> int:
+        eid, name = self._search[entity_id]
+        object_id = eid.partition(".")[2]
+        if query in (eid, object_id, name):
+            return RANK_EXACT
+        if eid.startswith(query) or object_id.startswith(query) or name.startswith(query):
+            return RANK_PREFIX
+        return RANK_TOKENS
+
+    def _ordered(self, candidates: set[str] | None) -> list[str]:
+        """Return ``candidates`` (or every entity) sorted by entity_id."""
+        if candidates is None:
+            if self._sorted_ids is None:
+                self._sorted_ids = sorted(self._entries)
+            return self._sorted_ids
+        return sorted(candidates)
+
+    def _matches(
+        self,
+        query: str,
+        domains: list[str] | None,
+        device_classes: list[str] | None,
+        needed: int | None = None,
+    ) -> tuple[list[str], bool]:
+        """Return matching entity ids, best ranked first, and whether the list is complete.
+
+        With ``needed``, substring matches are only scanned for (and only until)
+        the word-prefix matches fall short of that many results.
+        """
+        candidates: set[str] | None = None
+        if domains:
+            candidates = set().union(*(self._by_domain.get(d.lower(), ()) for d in domains))
+        if device_classes:
+            wanted = set().union(*(self._by_device_class.get(dc, ()) for dc in device_classes))
+            candidates = wanted if candidates is None else candidates & wanted
+        if not query:
+            return self._ordered(candidates), True
+
+        ranked: set[str] = set()
+        words = TOKEN_RE.findall(query)
+        if words:
+            ranked = self._with_prefix(words[0])
+            for word in words[1:]:
+                ranked &= self._with_prefix(word)
+            if candidates is not None:
+                ranked &= candidates
+        def order(entity_id: str) -> tuple[int, str]:
+            return self._rank(entity_id, query), entity_id
+
+        if needed is not None and len(ranked) >= needed:
+            # The page is filled by word-prefix matches alone
+            return heapq.nsmallest(needed, ranked, key=order), False
+        matches = sorted(ranked, key=order)
+
+        # Substring matches inside words ("itchen") are still found, ranked last
+        search = self._search
+        for entity_id in self._ordered(None):
+            if (
+                entity_id not in ranked
+                and (candidates is None or entity_id in candidates)
+                and (query in search[entity_id][0] or query in search[entity_id][1])
+            ):
+                matches.append(entity_id)
+                if needed is not None and len(matches) >= needed:
+                    return matches, False
+        return matches, True
+
+    def search(
+        self,
+        query: str = "",
+        domains: list[str] | None = None,
+        device_classes: list[str] | None = None,
+        ensure_domains: list[str] | None = None,
+        offset: int = 0,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> dict[str, Any]:
+        """Return one page of matching entity entries.
+
+        Entities from ``ensure_domains`` sort before the rest when ``domains``
+        is unset. The response carries ``total`` and ``next_offset`` (None on
+        the last page); ``total`` is None when a query matched more entities
+        than the page needed and the rest were not counted.
+        """
+        if not self.started:
+            # Not following events (setup incomplete): index the current states now
+            self._async_rebuild()
+        query = query.lower()
+        offset = max(0, offset)
+        limit = min(max(1, limit), MAX_PAGE_SIZE)
+        ensure = ensure_domains and not domains
+        # One extra match tells whether another page follows
+        matches, complete = self._matches(
+            query, domains, device_classes, None if ensure else offset + limit + 1
+        )
+        if ensure:
+            ensured = set().union(*(self._by_domain.get(d.lower(), ()) for d in ensure_domains))
+            matches = [e for e in matches if e in ensured] + [e for e in matches if e not in ensured]
+
+        page = matches[offset:offset + limit]
+        end = offset + len(page)
+        return {
+            "entities": [self._entries[entity_id] for entity_id in page],
+            "total": len(matches) if complete else None,
+            "offset": offset,
+            "next_offset": end if end < len(matches) else None,
+        }
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Return every index entry."""
+        if not self.started:
+            self._async_rebuild()
+        return list(self._entries.values())
+
+    def attributes_json(self, entity_id: str) -> bytes:
+        """Return the entity's attributes as JSON, encoded once per state update.
+
+        Values HA's encoder cannot handle are sent as their string form.
+        """
+        state = self.hass.states.get(entity_id)
+        if state is None:
+            return b"{}"
+        cached = self._attributes_json.get(entity_id)
+        if cached is not None and cached[0] == state.last_updated:
+            self._attributes_hits += 1
+            return cached[1]
+        self._attributes_misses += 1
+        try:
+            encoded = json_bytes(state.attributes)
+        except (TypeError, ValueError):
+            attributes = {}
+            for key, value in state.attributes.items():
+                try:
+                    json_bytes(value)
+                    attributes[key] = value
+                except (TypeError, ValueError):
+                    attributes[key] = str(value)
+            encoded = json_bytes(attributes)
+        self._attributes_json[entity_id] = (state.last_updated, encoded)
+        return encoded
+
+    def stats(self) -> dict[str, int]:
+        """Return index sizes and attribute cache counters."""
+        return {
+            "entities": len(self._entries),
+            "domains": len(self._by_domain),
+            "device_classes": len(self._by_device_class),
+            "words": len(self._words),
+            "attribute_hits": self._attributes_hits,
+            "attribute_misses": self._attributes_misses,
+        }
+
+
+class EntityFeed:
+    """Stream an EntityIndex to one subscriber: a snapshot, then batched deltas."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        index: EntityIndex,
+        send: Callable[[dict[str, Any]], None],
+        interval_ms: int = FEED_INTERVAL_MS,
+    ) -> None:
+        """Initialize entity feed."""
+        self.hass = hass
+        self._index = index
+        self._send = send
+        self._interval = interval_ms / 1000
+        # entity_id -> latest entry (None if removed) since the last batch
+        self._pending: dict[str, dict[str, Any] | None] = {}
+        self._flush_unsub = None
+        self._remove_listener = None
+
+    @callback
+    def async_start(self) -> None:
+        """Send the snapshot and start batching changes."""
+        self._remove_listener = self._index.async_add_listener(self._async_on_change)
+        self._send({
+            "type": "snapshot",
+            "entities": {entry["entity_id"]: compact_entry(entry) for entry in self._index.entries()},
+        })
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop sending deltas."""
+        for unsub in (self._remove_listener, self._flush_unsub):
+            if unsub is not None:
+                unsub()
+        self._remove_listener = self._flush_unsub = None
+        self._pending.clear()
+
+    @callback
+    def _async_on_change(self, entity_id: str, entry: dict[str, Any] | None) -> None:
+        self._pending[entity_id] = entry
+        if self._flush_unsub is None:
+            self._flush_unsub = async_call_later(self.hass, self._interval, self._async_flush)
+
+    @callback
+    def _async_flush(self, _now: Any) -> None:
+        self._flush_unsub = None
+        pending, self._pending = self._pending, {}
+        self._send({
+            "type": "delta",
+            "changed": {entity_id: compact_entry(entry) for entity_id, entry in pending.items() if entry is not None},
+            "removed": [entity_id for entity_id, entry in pending.items() if entry is None],
+        })
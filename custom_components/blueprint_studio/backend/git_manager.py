@@ -1,22 +1,35 @@
 """Git management for Blueprint Studio."""
 from __future__ import annotations
 
+import asyncio
 import base64
+import difflib
+import hashlib
+import json
 import logging
 import os
+import random
 import re
 import shutil
 import subprocess
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
 import aiohttp
 from aiohttp import web
+from yarl import URL
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.storage import Store
 
-from ..const import DOMAIN
+from ..const import BINARY_EXTENSIONS, DOMAIN
+from .ai_validators import VALIDATED_EXTENSIONS, validate_file
 from .util import json_response, json_message, is_path_safe
+from .workers import async_run_in_worker
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,6 +37,74 @@ _LOGGER = logging.getLogger(__name__)
 GITHUB_DEVICE_CODE_URL = "https://github.com/login/device/code"
 GITHUB_ACCESS_TOKEN_URL = "https://github.com/login/oauth/access_token"
 GITHUB_CREATE_REPO_URL = "https://api.github.com/user/repos"
+GITHUB_API_HEADERS = {"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}
+# OAuth device flow error codes -> status reported to the frontend
+DEVICE_FLOW_ERRORS = {
+    "authorization_pending": "pending",
+    "slow_down": "slow_down",
+    "expired_token": "expired",
+    "access_denied": "denied",
+}
+# Longest a github_device_flow_poll request is held open, and how long results are kept
+DEVICE_FLOW_MAX_WAIT = 30.0
+DEVICE_FLOW_RETENTION = 300.0
+# Conditional-GET cache entries kept for GitHub/Gitea API responses
+API_ETAG_CACHE_SIZE = 64
+
+# Inline credential helper fed from the git process environment
+CREDENTIAL_USER_ENV = "BLUEPRINT_STUDIO_GIT_USERNAME"
+CREDENTIAL_TOKEN_ENV = "BLUEPRINT_STUDIO_GIT_TOKEN"
+CREDENTIAL_HELPER = (
+    "!f() { test \"$1\" = get && printf 'username=%s\\npassword=%s\\n' "
+    f"\"${CREDENTIAL_USER_ENV}\" \"${CREDENTIAL_TOKEN_ENV}\"; }}; f"
+)
+
+# Max number of HEAD blobs kept in memory for gutter diffs
+LINE_DIFF_CACHE_SIZE = 64
+
+# git log format: unit-separated so author names and subjects may contain "|"
+LOG_FORMAT = "%H%x1f%at%x1f%an%x1f%s"
+# Number of commits read from git per page when extending the log cache
+LOG_BATCH_SIZE = 200
+# Upper bound for a single non-streamed git_log page
+LOG_MAX_PAGE = 1000
+# Cached histories (repo + per-path) and commit metadata entries, in LRU order
+LOG_CACHE_SIZE = 32
+COMMIT_CACHE_SIZE = 20000
+
+# Files larger than this are not diffed by diff_commit unless forced
+DIFF_FILE_MAX_BYTES = 512 * 1024
+COMMIT_HASH_RE = re.compile(r"[0-9a-fA-F]{4,64}")
+
+# Staged files above these sizes are held back by the pre-commit scan
+LARGE_FILE_LIMIT = 10 * 1024 * 1024
+BINARY_FILE_LIMIT = 1024 * 1024
+
+# Validation results of staged blobs kept by git_precommit_check
+PRECOMMIT_CACHE_SIZE = 512
+PRECOMMIT_MAX_BYTES = 2 * 1024 * 1024
+
+# Number of files whose blame is kept in memory, keyed by path and HEAD
+BLAME_CACHE_SIZE = 16
+DIFF_HUNK_RE = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+
+# Background fetch scheduler (interval comes from the remoteFetchInterval setting)
+FETCH_DEFAULT_INTERVAL = 30.0
+FETCH_MIN_INTERVAL = 15.0
+FETCH_MAX_BACKOFF = 1800.0
+FETCH_JITTER = 0.1
+# Stop fetching when no client has asked for git status for this long
+FETCH_IDLE_TIMEOUT = 300.0
+# "fatal: pathspec 'x' did not match any files" - git stops at the first bad path
+PATHSPEC_ERROR_RE = re.compile(r"pathspec '(.+?)' did not match")
+FETCH_AUTH_ERROR_RE = re.compile(
+    r"authentication failed|could not read username|permission denied|\b40[13]\b|invalid credentials",
+    re.IGNORECASE,
+)
+
+# Background repository maintenance (opt-in via git_maintenance)
+MAINTENANCE_INTERVAL = 6 * 3600.0
+MAINTENANCE_STARTUP_DELAY = 600.0
 
 class GitManager:
     """Class to handle Git operations."""
@@ -34,8 +115,35 @@ class GitManager:
         self.config_dir = config_dir
         self.data = data
         self.store = store
-
-    def _run_git_command(self, args: list[str], auth_provider: str = "github") -> dict[str, Any]:
+        # path -> (blob sha, lines) for the HEAD version used by git_line_diff
+        self._head_blob_cache: dict[str, tuple[str, list[str]]] = {}
+        # path -> (blob sha, buffer hash, result) of the last computed gutter diff
+        self._line_diff_cache: dict[str, tuple[str, str, dict]] = {}
+        # Commit metadata by sha, shared by every cached history
+        self._commit_cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        # history key ("" or a path) -> {"head", "shas", "complete"}
+        self._log_cache: OrderedDict[str, dict[str, Any]] = OrderedDict()
+        self._log_lock = threading.Lock()
+        # Shared background fetch state, per remote
+        self._fetch_state: dict[str, dict[str, Any]] = {}
+        self._fetch_tasks: dict[str, asyncio.Task] = {}
+        self._fetch_unsub = None
+        self._next_fetch: float | None = None
+        self._last_status_request = 0.0
+        # url -> (etag, body) for conditional GETs, host -> rate limit reset time
+        self._api_etag_cache: dict[str, tuple[str, Any]] = {}
+        self._api_rate_limits: dict[str, float] = {}
+        # device_code -> {"task", "done", "result"} for background OAuth polling
+        self._device_flows: dict[str, dict[str, Any]] = {}
+        # (blob sha, path) -> validation result for git_precommit_check
+        self._precommit_cache: dict[tuple[str, str], dict[str, Any]] = {}
+        # path -> {"head", "ranges", "commits"} computed by git_blame
+        self._blame_cache: dict[str, dict[str, Any]] = {}
+        self._blame_lock = threading.Lock()
+        self._maintenance_unsub = None
+        self._maintenance_lock = asyncio.Lock()
+
+    def _run_git_command(self, args: list[str], auth_provider: str = "github", input: str | None = None) -> dict[str, Any]:
         """Run a git command in the config directory."""
         try:
             env = os.environ.copy()
@@ -44,7 +152,7 @@ class GitManager:
             file_mode_config = "core.fileMode=false"
             
             timeout = 30
-            if any(cmd in args for cmd in ["add", "commit", "push", "pull", "clone", "fetch"]):
+            if any(cmd in args for cmd in ["add", "commit", "push", "pull", "clone", "fetch", "maintenance", "commit-graph"]):
                 timeout = 300
 
             needs_auth = any(cmd in args for cmd in ["push", "pull", "fetch", "clone"])
@@ -58,31 +166,30 @@ class GitManager:
                  creds = self.data.get("github_credentials", {})
 
             if needs_auth and creds and "username" in creds and "token" in creds:
-                username = creds["username"]
-                token = base64.b64decode(creds["token"]).decode()
-                helper_script = self.config_dir / f".git_credential_helper_{auth_provider}.sh"
-                helper_content = f"#!/bin/sh\necho \"username={username}\"\necho \"password={token}\"\n"
-                helper_script.write_text(helper_content)
-                helper_script.chmod(0o700)
+                # Credentials only live in this git process's environment; the
+                # inline helper echoes them back, so nothing is written to disk
+                # and concurrent commands cannot clobber each other.
+                env[CREDENTIAL_USER_ENV] = creds["username"]
+                env[CREDENTIAL_TOKEN_ENV] = base64.b64decode(creds["token"]).decode()
+                env["GIT_TERMINAL_PROMPT"] = "0"
 
                 result = subprocess.run(
-                    ["git", "-c", safe_dir_config, "-c", file_mode_config, "-c", f"credential.helper={helper_script}"] + args,
+                    ["git", "-c", safe_dir_config, "-c", file_mode_config,
+                     "-c", "credential.helper=", "-c", f"credential.helper={CREDENTIAL_HELPER}"] + args,
                     cwd=self.config_dir,
                     capture_output=True,
                     text=True,
+                    input=input,
                     timeout=timeout,
                     env=env
                 )
-                try:
-                    helper_script.unlink()
-                except OSError as e:
-                    _LOGGER.debug("Failed to clean up helper script: %s", e)
             else:
                 result = subprocess.run(
                     ["git", "-c", safe_dir_config, "-c", file_mode_config] + args,
                     cwd=self.config_dir,
                     capture_output=True,
                     text=True,
+                    input=input,
                     timeout=timeout,
                     env=env
                 )
@@ -101,13 +208,16 @@ class GitManager:
             git_dir = self.config_dir / ".git"
             is_initialized = git_dir.exists() and git_dir.is_dir()
             
+            self._last_status_request = time.monotonic()
             has_remote = False
             if is_initialized:
                 remote_result = await self.hass.async_add_executor_job(self._run_git_command, ["remote"])
                 has_remote = remote_result["success"] and remote in remote_result["output"].split()
 
+            # Fetching is done by the shared background scheduler; an explicit
+            # request only brings the next fetch forward if the last one is stale.
             if is_initialized and has_remote and should_fetch:
-                await self.hass.async_add_executor_job(self._run_git_command, ["fetch", remote, "--prune"], auth_provider)
+                self._request_fetch(remote)
 
             if not is_initialized:
                  return json_response({
@@ -173,15 +283,233 @@ class GitManager:
                             if branch_name and "HEAD ->" not in branch_name:
                                 remote_branches.append(branch_name)
 
+            fetch_state = self._fetch_state.get(remote, {})
             return json_response({
                 "success": True, "is_initialized": True, "has_remote": has_remote, "current_branch": current_branch,
                 "local_branches": local_branches, "remote_branches": remote_branches, "ahead": ahead, "behind": behind,
-                "status": full_status, "has_changes": has_changes, "files": status_data
+                "status": full_status, "has_changes": has_changes, "files": status_data,
+                "last_fetch": fetch_state.get("last_fetch"), "fetch_error": fetch_state.get("error"),
+                "fetch_error_kind": fetch_state.get("error_kind"), "next_fetch": self._next_fetch,
             })
         except Exception as err:
             _LOGGER.error("Error getting git status: %s", err)
             return json_message(str(err), status_code=500)
 
+    def _fetch_interval(self) -> float:
+        """Return the remote fetch interval in seconds from the user's settings."""
+        settings = self.data.get("settings") or {}
+        try:
+            interval = int(settings.get("remoteFetchInterval", FETCH_DEFAULT_INTERVAL * 1000)) / 1000
+        except (TypeError, ValueError):
+            interval = FETCH_DEFAULT_INTERVAL
+        return max(FETCH_MIN_INTERVAL, interval)
+
+    def async_start_fetch_scheduler(self) -> None:
+        """Start the background fetch loop shared by all clients."""
+        if self._fetch_unsub is None:
+            self._schedule_fetch(self._fetch_interval())
+
+    def async_stop_fetch_scheduler(self) -> None:
+        """Stop the background fetch loop."""
+        if self._fetch_unsub is not None:
+            self._fetch_unsub()
+            self._fetch_unsub = None
+        self._next_fetch = None
+
+    def _schedule_fetch(self, delay: float) -> None:
+        """Schedule the next scheduler tick with jitter."""
+        delay *= random.uniform(1 - FETCH_JITTER, 1 + FETCH_JITTER)
+        self._next_fetch = time.time() + delay
+        self._fetch_unsub = async_call_later(self.hass, delay, self._async_fetch_tick)
+
+    async def _async_fetch_tick(self, _now: Any) -> None:
+        """Fetch every remote that is due, then reschedule."""
+        self._fetch_unsub = None
+        try:
+            if time.monotonic() - self._last_status_request < FETCH_IDLE_TIMEOUT and (self.config_dir / ".git").is_dir():
+                remote_result = await self.hass.async_add_executor_job(self._run_git_command, ["remote"])
+                remotes = remote_result["output"].split() if remote_result["success"] else []
+                for remote in remotes:
+                    if self._fetch_state.get(remote, {}).get("next_due", 0) <= time.monotonic():
+                        await self._async_fetch_remote(remote)
+        except Exception as err:
+            _LOGGER.debug("Background git fetch failed: %s", err)
+        finally:
+            self._schedule_fetch(self._fetch_interval())
+
+    def _request_fetch(self, remote: str) -> None:
+        """Start a shared fetch now if the last one is older than the interval."""
+        state = self._fetch_state.get(remote, {})
+        task = self._fetch_tasks.get(remote)
+        if task is not None and not task.done():
+            return
+        last_attempt = state.get("last_attempt_mono")
+        if last_attempt is not None and time.monotonic() - last_attempt < self._fetch_interval():
+            return
+        self._fetch_tasks[remote] = self.hass.async_create_task(self._async_do_fetch(remote))
+
+    async def _async_fetch_remote(self, remote: str) -> dict[str, Any]:
+        """Fetch a remote, joining an in-flight fetch instead of starting another."""
+        task = self._fetch_tasks.get(remote)
+        if task is None or task.done():
+            task = self.hass.async_create_task(self._async_do_fetch(remote))
+            self._fetch_tasks[remote] = task
+        return await asyncio.shield(task)
+
+    async def _async_do_fetch(self, remote: str) -> dict[str, Any]:
+        """Run ``git fetch --prune`` for a remote and record the outcome."""
+        state = self._fetch_state.setdefault(remote, {"last_fetch": None, "error": None, "error_kind": None, "failures": 0})
+        auth_provider = "gitea" if remote == "gitea" else "github"
+        refs_args = ["for-each-ref", "--format=%(refname) %(objectname)", f"refs/remotes/{remote}"]
+
+        before = await self.hass.async_add_executor_job(self._run_git_command, refs_args)
+        result = await self.hass.async_add_executor_job(self._run_git_command, ["fetch", remote, "--prune"], auth_provider)
+        state["last_attempt"] = time.time()
+        state["last_attempt_mono"] = time.monotonic()
+        interval = self._fetch_interval()
+
+        if result["success"]:
+            state.update(last_fetch=state["last_attempt"], error=None, error_kind=None, failures=0)
+            state["next_due"] = time.monotonic() + interval
+            after = await self.hass.async_add_executor_job(self._run_git_command, refs_args)
+            if before["output"] != after["output"]:
+                # Let every open client refresh its status (ahead/behind changed)
+                self.hass.bus.async_fire("blueprint_studio_update", {
+                    "action": "git_fetch", "path": None, "remote": remote, "timestamp": state["last_fetch"],
+                })
+        else:
+            error = result["error"] or "git fetch failed"
+            state["failures"] += 1
+            state["error"] = error.strip()
+            state["error_kind"] = "auth" if FETCH_AUTH_ERROR_RE.search(error) else "network"
+            backoff = min(interval * (2 ** state["failures"]), FETCH_MAX_BACKOFF)
+            state["next_due"] = time.monotonic() + backoff
+            _LOGGER.debug("git fetch %s failed (%s), retrying in %.0fs", remote, state["error_kind"], backoff)
+        return state
+
+    def _fsmonitor_supported(self) -> bool:
+        """Return True if this git build ships the built-in fsmonitor daemon."""
+        result = self._run_git_command(["version", "--build-options"])
+        return result["success"] and "fsmonitor--daemon" in result["output"]
+
+    def _time_status(self) -> float | None:
+        """Return the wall time of ``git status --porcelain`` in milliseconds."""
+        start = time.perf_counter()
+        result = self._run_git_command(["status", "--porcelain"])
+        if not result["success"]:
+            return None
+        return round((time.perf_counter() - start) * 1000, 1)
+
+    def _apply_maintenance_config(self, enable: bool) -> dict[str, Any]:
+        """Turn the status speedups (untracked cache, fsmonitor, split index) on or off."""
+        fsmonitor = enable and self._fsmonitor_supported()
+        settings = {
+            "core.untrackedCache": "true" if enable else "false",
+            "core.splitIndex": "true" if enable else "false",
+            "core.fsmonitor": "true" if fsmonitor else "false",
+        }
+        applied = {}
+        for key, value in settings.items():
+            applied[key] = self._run_git_command(["config", key, value])["success"] and value == "true"
+        # Rewrite the index now so the first status after enabling benefits
+        self._run_git_command(["update-index", "--untracked-cache" if enable else "--no-untracked-cache"])
+        self._run_git_command(["update-index", "--split-index" if enable else "--no-split-index"])
+        if not fsmonitor:
+            self._run_git_command(["fsmonitor--daemon", "stop"])
+        return applied
+
+    def _warm_status_time(self) -> float | None:
+        """Time a second ``git status``, once the first has refreshed the index."""
+        self._time_status()
+        return self._time_status()
+
+    def _enable_maintenance_config(self) -> tuple[dict[str, Any], float | None]:
+        """Time git status without the speedups, then turn them on (runs in executor)."""
+        baseline = self._warm_status_time()
+        return self._apply_maintenance_config(True), baseline
+
+    def _run_maintenance(self, before: float | None = None) -> dict[str, Any]:
+        """Run commit-graph and maintenance tasks, timing git status around them.
+
+        ``before`` replaces the first timing, e.g. with one taken before the
+        status speedups were enabled.
+        """
+        if before is None:
+            before = self._time_status()
+        steps = {
+            "commit_graph": self._run_git_command(["commit-graph", "write", "--reachable", "--changed-paths"])["success"],
+            "maintenance": self._run_git_command(["maintenance", "run", "--auto"])["success"],
+        }
+        # The first status after maintenance refreshes the caches; time the warm run
+        after = self._warm_status_time()
+        return {"last_run": time.time(), "before_ms": before, "after_ms": after, "steps": steps}
+
+    async def _async_run_maintenance(self, before: float | None = None) -> dict[str, Any]:
+        """Run maintenance once at a time and persist the report."""
+        async with self._maintenance_lock:
+            report = await self.hass.async_add_executor_job(self._run_maintenance, before)
+            state = self.data.setdefault("git_maintenance", {"enabled": False})
+            state.update(report)
+            await self.store.async_save(self.data)
+            return state
+
+    def async_start_maintenance_scheduler(self) -> None:
+        """Start the periodic maintenance loop if the user enabled it."""
+        if self._maintenance_unsub is None and self.data.get("git_maintenance", {}).get("enabled"):
+            self._maintenance_unsub = async_call_later(self.hass, MAINTENANCE_STARTUP_DELAY, self._async_maintenance_tick)
+
+    def async_stop_maintenance_scheduler(self) -> None:
+        """Stop the periodic maintenance loop."""
+        if self._maintenance_unsub is not None:
+            self._maintenance_unsub()
+            self._maintenance_unsub = None
+
+    async def _async_maintenance_tick(self, _now: Any) -> None:
+        """Run scheduled maintenance, then reschedule."""
+        self._maintenance_unsub = None
+        if not self.data.get("git_maintenance", {}).get("enabled"):
+            return
+        try:
+            if (self.config_dir / ".git").is_dir():
+                report = await self._async_run_maintenance()
+                _LOGGER.debug("git maintenance: status %sms -> %sms", report["before_ms"], report["after_ms"])
+        except Exception as err:
+            _LOGGER.debug("Background git maintenance failed: %s", err)
+        finally:
+            self._maintenance_unsub = async_call_later(self.hass, MAINTENANCE_INTERVAL, self._async_maintenance_tick)
+
+    async def maintenance(self, enable: bool | None = None, run: bool = True) -> web.Response:
+        """Enable/disable repository maintenance and optionally run it now.
+
+        Enabling records ``baseline_ms``, the git status time before the
+        speedups were applied; a run started with it reports that as ``before_ms``.
+        """
+        try:
+            if not (self.config_dir / ".git").is_dir():
+                return json_response({"success": False, "error": "Not a git repository"})
+
+            state = self.data.setdefault("git_maintenance", {"enabled": False})
+            baseline = None
+            if enable is not None:
+                state["enabled"] = bool(enable)
+                if state["enabled"]:
+                    state["config"], baseline = await self.hass.async_add_executor_job(self._enable_maintenance_config)
+                    state["baseline_ms"] = baseline
+                else:
+                    state["config"] = await self.hass.async_add_executor_job(self._apply_maintenance_config, False)
+                await self.store.async_save(self.data)
+                if state["enabled"]:
+                    self.async_start_maintenance_scheduler()
+                else:
+                    self.async_stop_maintenance_scheduler()
+
+            if run and state["enabled"]:
+                state = await self._async_run_maintenance(baseline)
+            return json_response({"success": True, **state})
+        except Exception as err:
+            _LOGGER.error("Error running git maintenance: %s", err)
+            return json_message(str(err), status_code=500)
+
     async def show(self, path: str) -> web.Response:
         """Get file content from HEAD."""
         try:
@@ -195,6 +523,117 @@ class GitManager:
             _LOGGER.error("Error showing git file: %s", err)
             return json_message(str(err), status_code=500)
 
+    def _get_head_blob(self, path: str) -> tuple[str | None, list[str]]:
+        """Return (blob sha, lines) for a file at HEAD, cached by blob sha."""
+        sha_result = self._run_git_command(["rev-parse", "--verify", "--quiet", f"HEAD:{path}"])
+        blob_sha = sha_result["output"].strip() if sha_result["success"] else ""
+        if not blob_sha:
+            self._head_blob_cache.pop(path, None)
+            return None, []
+
+        cached = self._head_blob_cache.get(path)
+        if cached and cached[0] == blob_sha:
+            return cached
+
+        blob_result = self._run_git_command(["cat-file", "blob", blob_sha])
+        if not blob_result["success"]:
+            return None, []
+        lines = blob_result["output"].splitlines()
+        self._head_blob_cache.pop(path, None)
+        if len(self._head_blob_cache) >= LINE_DIFF_CACHE_SIZE:
+            self._head_blob_cache.pop(next(iter(self._head_blob_cache)), None)
+        self._head_blob_cache[path] = (blob_sha, lines)
+        return blob_sha, lines
+
+    @staticmethod
+    def _compute_line_changes(old_lines: list[str], new_lines: list[str]) -> dict[str, list]:
+        """Diff two line lists into compact gutter ranges.
+
+        Ranges are 1-based inclusive ``[start, end]`` pairs in the new buffer.
+        ``deleted`` holds the buffer line after which old lines were removed
+        (0 means above the first line).
+        """
+        added: list[list[int]] = []
+        modified: list[list[int]] = []
+        deleted: list[int] = []
+
+        # Trim the common prefix/suffix first so a typical single edit only
+        # runs SequenceMatcher on a handful of lines.
+        prefix = 0
+        max_prefix = min(len(old_lines), len(new_lines))
+        while prefix < max_prefix and old_lines[prefix] == new_lines[prefix]:
+            prefix += 1
+        suffix = 0
+        max_suffix = max_prefix - prefix
+        while suffix < max_suffix and old_lines[-1 - suffix] == new_lines[-1 - suffix]:
+            suffix += 1
+
+        old_mid = old_lines[prefix:len(old_lines) - suffix]
+        new_mid = new_lines[prefix:len(new_lines) - suffix]
+        matcher = difflib.SequenceMatcher(None, old_mid, new_mid, autojunk=False)
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            start, end = prefix + j1 + 1, prefix + j2
+            if tag == "insert":
+                added.append([start, end])
+            elif tag == "delete":
+                deleted.append(prefix + j1)
+            elif tag == "replace":
+                shared = min(i2 - i1, j2 - j1)
+                modified.append([start, start + shared - 1])
+                if j2 - j1 > shared:
+                    added.append([start + shared, end])
+                elif i2 - i1 > shared:
+                    deleted.append(start + shared - 1)
+
+        return {"added": added, "modified": modified, "deleted": deleted}
+
+    def _line_diff(self, path: str, content: str | None, content_hash: str | None) -> dict[str, Any]:
+        """Compute gutter markers for a buffer against HEAD (runs in executor)."""
+        blob_sha, head_lines = self._get_head_blob(path)
+        cached = self._line_diff_cache.get(path)
+
+        if content is None:
+            # Hash-only request: reuse the last result if neither side changed
+            if cached and cached[0] == (blob_sha or "") and cached[1] == content_hash:
+                return cached[2]
+            return {"success": False, "needs_content": True, "message": "Buffer content required"}
+
+        buffer_hash = hashlib.sha256(content.encode("utf-8", "surrogateescape")).hexdigest()
+        if cached and cached[0] == (blob_sha or "") and cached[1] == buffer_hash:
+            return cached[2]
+
+        new_lines = content.splitlines()
+        if blob_sha is None:
+            changes = {"added": [[1, len(new_lines)]] if new_lines else [], "modified": [], "deleted": []}
+        else:
+            changes = self._compute_line_changes(head_lines, new_lines)
+
+        result = {"success": True, "hash": buffer_hash, "head": blob_sha, "tracked": blob_sha is not None, **changes}
+        self._line_diff_cache.pop(path, None)
+        if len(self._line_diff_cache) >= LINE_DIFF_CACHE_SIZE:
+            self._line_diff_cache.pop(next(iter(self._line_diff_cache)), None)
+        self._line_diff_cache[path] = (blob_sha or "", buffer_hash, result)
+        return result
+
+    async def line_diff(self, path: str, content: str | None = None, content_hash: str | None = None) -> web.Response:
+        """Get added/modified/deleted line ranges of a buffer compared to HEAD.
+
+        The client sends the buffer content, or just the ``hash`` returned by a
+        previous call when the buffer has not changed since.
+        """
+        try:
+            if not path:
+                return json_message("Missing path", status_code=400)
+            if not is_path_safe(self.config_dir, path):
+                return json_message(f"Invalid path: {path}", status_code=403)
+            if content is None and not content_hash:
+                return json_message("Missing content or hash", status_code=400)
+            result = await self.hass.async_add_executor_job(self._line_diff, path.lstrip("/"), content, content_hash)
+            return json_response(result)
+        except Exception as err:
+            _LOGGER.error("Error computing line diff: %s", err)
+            return json_message(str(err), status_code=500)
+
     async def pull(self, remote: str = "origin", auth_provider: str = "github") -> web.Response:
         """Pull changes from git remote."""
         try:
@@ -214,42 +653,222 @@ class GitManager:
             _LOGGER.error("Error pulling from git: %s", err)
             return json_message(str(err), status_code=500)
 
-    async def commit(self, commit_message: str) -> web.Response:
-        """Commit changes to git."""
+    def _scan_staged(self, max_size: int | None = None) -> list[dict[str, Any]]:
+        """Return staged files that are too large or binary to commit (runs in executor).
+
+        Sizes are those of the staged blobs, not the worktree files; staged
+        deletions are skipped.
+        """
+        # ":<old mode> <new mode> <old sha> <new sha> <status>\0<path>\0" - new sha is the staged blob
+        changed = self._run_git_command(["diff", "--cached", "--raw", "-z", "--no-abbrev", "--no-renames", "--diff-filter=d"])
+        if not changed["success"]:
+            return []
+        fields = changed["output"].split("\0")
+        staged = {}
+        for meta, path in zip(fields[0::2], fields[1::2]):
+            parts = meta.split()
+            if len(parts) == 5 and parts[1] != "160000":  # skip submodule commits
+                staged[path] = parts[3]
+        if not staged:
+            return []
+
+        # "<added>\t<deleted>\t<path>" with "-" counts for binary files
+        numstat = self._run_git_command(["diff", "--cached", "--numstat", "-z", "--no-renames", "--diff-filter=d"])
+        binary_paths = set()
+        for record in numstat["output"].split("\0") if numstat["success"] else []:
+            parts = record.split("\t", 2)
+            if len(parts) == 3 and parts[0] == "-":
+                binary_paths.add(parts[2])
+
+        shas = sorted(set(staged.values()))
+        checked = self._run_git_command(["cat-file", "--batch-check"], input="\n".join(shas) + "\n")
+        sizes = {}
+        for line in checked["output"].splitlines() if checked["success"] else []:
+            parts = line.split()
+            if len(parts) == 3:
+                sizes[parts[0]] = int(parts[2])
+
+        flagged = []
+        for path, sha in staged.items():
+            size = sizes.get(sha)
+            if size is None:
+                continue
+            binary = path in binary_paths or Path(path).suffix.lower() in BINARY_EXTENSIONS
+            limit = max_size if max_size is not None else (BINARY_FILE_LIMIT if binary else LARGE_FILE_LIMIT)
+            if size > limit:
+                flagged.append({"path": path, "size": size, "binary": binary})
+        return flagged
+
+    def _ignore_staged(self, paths: list[str]) -> dict[str, Any]:
+        """Append paths to .gitignore and drop them from the index (runs in executor)."""
+        gitignore = self.config_dir / ".gitignore"
+        existing = gitignore.read_text().splitlines() if gitignore.exists() else []
+        entries = [f"/{path}" for path in paths if f"/{path}" not in existing and path not in existing]
+        if entries:
+            prefix = "" if not existing or existing[-1] == "" else "\n"
+            with gitignore.open("a") as handle:
+                handle.write(prefix + "\n".join(entries) + "\n")
+        return self._run_pathspec_command(["rm", "--cached", "-q"], paths)
+
+    async def scan_staged(self, max_size: int | None = None, fix: bool = False) -> web.Response:
+        """List staged files that are large or binary, optionally un-staging and ignoring them."""
         try:
+            flagged = await self.hass.async_add_executor_job(self._scan_staged, max_size)
+            ignored: list[str] = []
+            if fix and flagged:
+                result = await self.hass.async_add_executor_job(self._ignore_staged, [f["path"] for f in flagged])
+                ignored = result["done"]
+            return json_response({"success": True, "files": flagged, "ignored": ignored})
+        except Exception as err:
+            _LOGGER.error("Error scanning staged files: %s", err)
+            return json_message(str(err), status_code=500)
+
+    def _read_blobs(self, shas: list[str]) -> dict[str, bytes]:
+        """Read many blobs with one ``git cat-file --batch`` process."""
+        if not shas:
+            return {}
+        result = subprocess.run(
+            ["git", "-c", f"safe.directory={self.config_dir}", "cat-file", "--batch"],
+            cwd=self.config_dir, input="\n".join(shas).encode() + b"\n", capture_output=True, timeout=60,
+        )
+        blobs: dict[str, bytes] = {}
+        output, pos = result.stdout, 0
+        while pos < len(output):
+            header_end = output.index(b"\n", pos)
+            header = output[pos:header_end].decode().split()
+            pos = header_end + 1
+            if len(header) != 3:
+                # "<sha> missing"
+                continue
+            size = int(header[2])
+            blobs[header[0]] = output[pos:pos + size]
+            pos += size + 1
+        return blobs
+
+    def _staged_validation_targets(self) -> tuple[list[tuple[str, str]], dict[str, str]]:
+        """Return staged (path, blob sha) pairs to validate and the content of uncached ones."""
+        # ":<old mode> <new mode> <old sha> <new sha> <status>\0<path>\0" - new sha is the staged blob
+        changed = self._run_git_command(["diff", "--cached", "--raw", "-z", "--no-abbrev", "--no-renames", "--diff-filter=ACM"])
+        if not changed["success"]:
+            raise RuntimeError(changed["error"])
+        fields = changed["output"].split("\0")
+        targets = []
+        for meta, path in zip(fields[0::2], fields[1::2]):
+            parts = meta.split()
+            if len(parts) == 5 and Path(path).suffix.lower() in VALIDATED_EXTENSIONS:
+                targets.append((path, parts[3]))
+
+        missing = sorted({sha for path, sha in targets if (sha, path) not in self._precommit_cache})
+        sizes = self._run_git_command(["cat-file", "--batch-check"], input="\n".join(missing) + "\n") if missing else None
+        small = [line.split()[0] for line in (sizes["output"].splitlines() if sizes and sizes["success"] else [])
+                 if len(line.split()) == 3 and int(line.split()[2]) <= PRECOMMIT_MAX_BYTES]
+        contents = {sha: blob.decode("utf-8", errors="replace") for sha, blob in self._read_blobs(small).items()}
+        return targets, contents
+
+    async def precommit_check(self) -> web.Response:
+        """Validate the staged version of every changed YAML/JSON/Jinja/Python/JS file.
+
+        Blobs are read from the index (not the worktree) and validated in
+        worker processes; results are cached by blob sha so re-checking an
+        unchanged staged file is free.
+        """
+        try:
+            targets, contents = await self.hass.async_add_executor_job(self._staged_validation_targets)
+            pending = [(path, sha) for path, sha in targets if (sha, path) not in self._precommit_cache and sha in contents]
+            results = await asyncio.gather(
+                *(async_run_in_worker(self.hass, validate_file, contents[sha], path) for path, sha in pending),
+                return_exceptions=True,
+            )
+            for (path, sha), result in zip(pending, results):
+                if isinstance(result, Exception):
+                    result = {"valid": False, "error": str(result)}
+                self._precommit_cache[(sha, path)] = result
+                while len(self._precommit_cache) > PRECOMMIT_CACHE_SIZE:
+                    self._precommit_cache.pop(next(iter(self._precommit_cache)), None)
+
+            files = {}
+            for path, sha in targets:
+                result = self._precommit_cache.get((sha, path))
+                files[path] = {"blob": sha, **result} if result else {"blob": sha, "valid": True, "skipped": "too large"}
+            return json_response({
+                "success": True,
+                "valid": all(f.get("valid", True) for f in files.values()),
+                "files": files,
+                "checked": len(pending),
+                "cached": len(targets) - len(pending),
+            })
+        except Exception as err:
+            _LOGGER.error("Error running pre-commit check: %s", err)
+            return json_message(str(err), status_code=500)
+
+    async def commit(self, commit_message: str, large_files: str = "warn") -> web.Response:
+        """Commit changes to git.
+
+        Staged files caught by the pre-commit scan are committed and listed in
+        the response under ``large_files`` by default ("warn"). ``large_files``
+        can instead be "ignore" (add them to .gitignore and un-stage them),
+        "block" (refuse with a 409) or "allow" (skip the scan).
+        """
+        try:
+            ignored: list[str] = []
+            flagged: list[dict[str, Any]] = []
+            if large_files != "allow":
+                flagged = await self.hass.async_add_executor_job(self._scan_staged)
+                if flagged and large_files == "ignore":
+                    result = await self.hass.async_add_executor_job(self._ignore_staged, [f["path"] for f in flagged])
+                    ignored = result["done"]
+                    flagged = []
+                elif flagged and large_files == "block":
+                    names = ", ".join(f"{f['path']} ({f['size'] // 1024} KB)" for f in flagged[:5])
+                    return json_response({
+                        "success": False,
+                        "message": f"Large or binary files are staged: {names}",
+                        "large_files": flagged,
+                    }, status_code=409)
+
             commit_result = await self.hass.async_add_executor_job(self._run_git_command, ["commit", "-m", commit_message])
             if commit_result["success"]:
-                return json_response({"success": True, "output": commit_result["output"]})
+                return json_response({
+                    "success": True, "output": commit_result["output"], "ignored": ignored, "large_files": flagged,
+                })
             return json_message(commit_result["error"], status_code=500)
         except Exception as err:
             _LOGGER.error("Error committing to git: %s", err)
             return json_message(str(err), status_code=500)
 
-    async def push(self, commit_message: str, remote: str = "origin", auth_provider: str = "github") -> web.Response:
-        """Commit and push changes to git remote."""
+    async def push(self, commit_message: str, remote: str = "origin", auth_provider: str = "github",
+                   large_files: str = "warn") -> web.Response:
+        """Commit and push changes to git remote; ``large_files`` is passed to :meth:`commit`."""
         try:
             git_dir = self.config_dir / ".git"
             if not git_dir.exists():
                 return json_message("Git repository not initialized.", status_code=400)
             check_commits = await self.hass.async_add_executor_job(self._run_git_command, ["rev-parse", "HEAD"])
             has_commits = check_commits["success"]
+            flagged: list[dict[str, Any]] = []
             if not has_commits:
                 # If no commits at all, we might need a first commit
                 # But we should still only commit what is staged
-                commit_result = await self.commit(commit_message)
+                commit_result = await self.commit(commit_message, large_files)
+                if commit_result.status == 409:
+                    return commit_result
+                flagged = json.loads(commit_result.body).get("large_files", [])
             else:
                 status_result = await self.hass.async_add_executor_job(self._run_git_command, ["status", "--porcelain"])
                 # Only commit if there are STAGED changes
                 if status_result["success"]:
                     has_staged = any(line.strip() and line[0] in "MADR" for line in status_result["output"].split("\n"))
                     if has_staged:
-                        await self.commit(commit_message)
+                        commit_result = await self.commit(commit_message, large_files)
+                        if commit_result.status == 409:
+                            return commit_result
+                        flagged = json.loads(commit_result.body).get("large_files", [])
 
             branch_result = await self.hass.async_add_executor_job(self._run_git_command, ["symbolic-ref", "--short", "HEAD"])
             target_branch = branch_result["output"].strip() if branch_result["success"] else "main"
             push_result = await self.hass.async_add_executor_job(self._run_git_command, ["push", "-u", remote, f"HEAD:refs/heads/{target_branch}"], auth_provider)
             if push_result["success"]:
-                return json_response({"success": True, "output": push_result["output"]})
+                return json_response({"success": True, "output": push_result["output"], "large_files": flagged})
             return json_message(push_result["error"], status_code=500)
         except Exception as err:
             _LOGGER.error("Error pushing to git: %s", err)
@@ -354,6 +973,69 @@ class GitManager:
             _LOGGER.error("Error repairing git index: %s", err)
             return json_message(str(err), status_code=500)
 
+    async def _api_request(self, method: str, url: str, headers: dict[str, str] | None = None,
+                           json_body: Any = None, form: dict[str, Any] | None = None,
+                           cache: bool = False) -> dict[str, Any]:
+        """Call a GitHub/Gitea HTTP API on HA's shared client session.
+
+        GETs with ``cache`` send ``If-None-Match`` and reuse the cached body on
+        304. ``X-RateLimit-*``/``Retry-After`` headers put the host into a
+        backoff window during which calls fail fast with status 429.
+        """
+        host = URL(url).host or ""
+        reset = self._api_rate_limits.get(host, 0)
+        if reset > time.time():
+            return {"status": 429, "data": None, "text": f"API rate limit exceeded, retry in {int(reset - time.time())}s"}
+
+        headers = dict(headers or {})
+        # Key on the auth header too so another account's response is never reused
+        cache_key = f"{url}|{hashlib.sha256(headers.get('Authorization', '').encode()).hexdigest()}"
+        cached = self._api_etag_cache.get(cache_key) if cache else None
+        if cached:
+            headers["If-None-Match"] = cached[0]
+
+        session = async_get_clientsession(self.hass)
+        async with session.request(method, url, headers=headers, json=json_body, data=form,
+                                   timeout=aiohttp.ClientTimeout(total=30)) as response:
+            text = await response.text()
+            remaining = response.headers.get("X-RateLimit-Remaining")
+            if response.status in (403, 429) or remaining == "0":
+                retry_after = response.headers.get("Retry-After")
+                if retry_after and retry_after.isdigit():
+                    self._api_rate_limits[host] = time.time() + int(retry_after)
+                elif remaining == "0" and (response.headers.get("X-RateLimit-Reset") or "").isdigit():
+                    self._api_rate_limits[host] = float(response.headers["X-RateLimit-Reset"])
+
+            if response.status == 304 and cached:
+                return {"status": 200, "data": cached[1], "text": text, "cached": True}
+            try:
+                data = json.loads(text) if text else None
+            except ValueError:
+                data = None
+            etag = response.headers.get("ETag")
+            if cache and etag and response.status == 200:
+                self._api_etag_cache.pop(cache_key, None)
+                self._api_etag_cache[cache_key] = (etag, data)
+                while len(self._api_etag_cache) > API_ETAG_CACHE_SIZE:
+                    self._api_etag_cache.pop(next(iter(self._api_etag_cache)), None)
+            return {"status": response.status, "data": data, "text": text}
+
+    def _github_token_headers(self) -> dict[str, str] | None:
+        """Return GitHub API headers for the stored token, or None if not authenticated."""
+        creds = self.data.get("github_credentials", {})
+        if not creds or "token" not in creds:
+            return None
+        token = base64.b64decode(creds["token"]).decode()
+        return {"Authorization": f"Bearer {token}", **GITHUB_API_HEADERS}
+
+    async def _github_repo_info(self, owner: str, repo: str) -> dict[str, Any] | None:
+        """Return repository metadata, revalidated with ETags so repeat calls are free."""
+        headers = self._github_token_headers()
+        if headers is None:
+            return None
+        result = await self._api_request("GET", f"https://api.github.com/repos/{owner}/{repo}", headers, cache=True)
+        return result["data"] if result["status"] == 200 else None
+
     async def github_create_repo(self, repo_name: str, description: str, is_private: bool) -> web.Response:
         """Create a new GitHub repository."""
         try:
@@ -361,16 +1043,13 @@ class GitManager:
             creds = self.data.get("github_credentials", {})
             if not creds or "token" not in creds: return json_message("Not authenticated.", status_code=401)
             token = base64.b64decode(creds["token"]).decode()
-            async with aiohttp.ClientSession() as session:
-                async with session.post(GITHUB_CREATE_REPO_URL, json={"name": repo_name, "description": description, "private": is_private, "auto_init": False}, headers={"Authorization": f"Bearer {token}", "Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}) as response:
-                    if response.status == 201:
-                        repo_data = await response.json()
-                        await self.init()
-                        await self.add_remote("origin", repo_data.get("clone_url"))
-                        return json_response({"success": True, "message": f"Repository '{repo_name}' created successfully", "html_url": repo_data.get("html_url"), "clone_url": repo_data.get("clone_url"), "username": creds.get("username", "")})
-                    else:
-                        error_text = await response.text()
-                        return json_message(f"Failed to create repository: {error_text}", status_code=response.status)
+            response = await self._api_request("POST", GITHUB_CREATE_REPO_URL, {"Authorization": f"Bearer {token}", **GITHUB_API_HEADERS}, json_body={"name": repo_name, "description": description, "private": is_private, "auto_init": False})
+            if response["status"] == 201:
+                repo_data = response["data"] or {}
+                await self.init()
+                await self.add_remote("origin", repo_data.get("clone_url"))
+                return json_response({"success": True, "message": f"Repository '{repo_name}' created successfully", "html_url": repo_data.get("html_url"), "clone_url": repo_data.get("clone_url"), "username": creds.get("username", "")})
+            return json_message(f"Failed to create repository: {response['text']}", status_code=response["status"])
         except Exception as err:
             _LOGGER.error("Error creating GitHub repo: %s", err)
             return json_message(str(err), status_code=500)
@@ -384,14 +1063,14 @@ class GitManager:
             match = re.search(r"github\.com[:/](.+?)/(.+?)(\.git)?$", url)
             if not match: return json_message(f"Could not parse GitHub owner/repo from URL", status_code=400)
             owner, repo = match.group(1), match.group(2)
-            creds = self.data.get("github_credentials", {})
-            if not creds or "token" not in creds: return json_message("Not authenticated", status_code=401)
-            token = base64.b64decode(creds["token"]).decode()
-            api_url = f"https://api.github.com/repos/{owner}/{repo}"
-            async with aiohttp.ClientSession() as session:
-                async with session.patch(api_url, json={"default_branch": branch}, headers={"Authorization": f"Bearer {token}", "Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"}) as response:
-                    if response.status == 200: return json_response({"success": True, "message": f"Default branch set to '{branch}'"})
-                    else: return json_message(f"GitHub error: {await response.text()}", status_code=response.status)
+            headers = self._github_token_headers()
+            if headers is None: return json_message("Not authenticated", status_code=401)
+            info = await self._github_repo_info(owner, repo)
+            if info and info.get("default_branch") == branch:
+                return json_response({"success": True, "message": f"Default branch set to '{branch}'"})
+            response = await self._api_request("PATCH", f"https://api.github.com/repos/{owner}/{repo}", headers, json_body={"default_branch": branch})
+            if response["status"] == 200: return json_response({"success": True, "message": f"Default branch set to '{branch}'"})
+            return json_message(f"GitHub error: {response['text']}", status_code=response["status"])
         except Exception as err:
             _LOGGER.error("Error setting default branch: %s", err)
             return json_message(str(err), status_code=500)
@@ -487,36 +1166,98 @@ class GitManager:
             _LOGGER.error("Error testing connection: %s", err)
             return json_message(str(err), status_code=500)
 
+    async def _device_flow_exchange(self, client_id: str, device_code: str) -> dict[str, Any]:
+        """Ask GitHub once whether a device code has been authorized."""
+        response = await self._api_request("POST", GITHUB_ACCESS_TOKEN_URL, {"Accept": "application/json"}, form={"client_id": client_id, "device_code": device_code, "grant_type": "urn:ietf:params:oauth:grant-type:device_code"})
+        data = response["data"] or {"error": "error", "error_description": response["text"]}
+        if "error" in data:
+            status = DEVICE_FLOW_ERRORS.get(data["error"], "error")
+            return {"success": False, "status": status, "message": data.get("error_description", "Unknown error")}
+        access_token = data.get("access_token")
+        user_response = await self._api_request("GET", "https://api.openai.com/user" if "openai" in str(access_token) else "https://api.github.com/user", {"Authorization": f"Bearer {access_token}", "Accept": "application/json"})
+        if user_response["status"] == 200:
+            user_data = user_response["data"] or {}
+            await self.set_credentials(user_data.get("login"), access_token)
+            return {"success": True, "status": "authorized", "username": user_data.get("login"), "message": "Successfully authenticated"}
+        return {"success": False, "status": "error", "message": "Failed to get user info"}
+
+    async def _async_device_flow_task(self, client_id: str, device_code: str, interval: float, expires_in: float) -> None:
+        """Poll GitHub at the interval it mandates until the device code resolves."""
+        flow = self._device_flows[device_code]
+        deadline = time.monotonic() + expires_in
+        try:
+            while time.monotonic() < deadline:
+                await asyncio.sleep(interval)
+                try:
+                    result = await self._device_flow_exchange(client_id, device_code)
+                except aiohttp.ClientError as err:
+                    _LOGGER.debug("Device flow poll failed, retrying: %s", err)
+                    continue
+                if result["status"] == "slow_down":
+                    # RFC 8628: every slow_down adds 5 seconds to the interval
+                    interval += 5
+                elif result["status"] != "pending":
+                    flow["result"] = result
+                    break
+            else:
+                flow["result"] = {"success": False, "status": "expired", "message": "Device code expired"}
+        except asyncio.CancelledError:
+            # Abandoned by a newer login: give pollers of this code a final answer
+            flow["result"] = {"success": False, "status": "expired", "message": "Superseded by a new login"}
+            raise
+        except Exception as err:
+            _LOGGER.error("Error polling device flow: %s", err)
+            flow["result"] = {"success": False, "status": "error", "message": str(err)}
+        finally:
+            flow["done"].set()
+            flow["finished"] = time.monotonic()
+            result = flow.get("result")
+            if result:
+                # Lets websocket subscribers learn the outcome without polling
+                self.hass.bus.async_fire("blueprint_studio_update", {
+                    "action": "github_device_flow", "path": None, "status": result["status"], "username": result.get("username"),
+                })
+
     async def github_device_flow_start(self, client_id: str) -> web.Response:
-        """Start GitHub OAuth Device Flow."""
+        """Start GitHub OAuth Device Flow and poll for authorization in the background."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(GITHUB_DEVICE_CODE_URL, data={"client_id": client_id, "scope": "repo"}, headers={"Accept": "application/json"}) as response:
-                    if response.status != 200: return json_message(f"Failed to start device flow", status_code=response.status)
-                    data = await response.json()
-                    if "error" in data: return json_message(data.get('error_description', 'Unknown error'), status_code=400)
-                    return json_response({"success": True, "device_code": data.get("device_code"), "user_code": data.get("user_code"), "verification_uri": data.get("verification_uri"), "expires_in": data.get("expires_in"), "interval": data.get("interval", 5)})
+            response = await self._api_request("POST", GITHUB_DEVICE_CODE_URL, {"Accept": "application/json"}, form={"client_id": client_id, "scope": "repo"})
+            if response["status"] != 200: return json_message(f"Failed to start device flow", status_code=response["status"])
+            data = response["data"] or {}
+            if "error" in data: return json_message(data.get('error_description', 'Unknown error'), status_code=400)
+
+            # Forget flows that finished a while ago; abandon the ones still running
+            for code, flow in list(self._device_flows.items()):
+                if flow.get("finished", time.monotonic()) < time.monotonic() - DEVICE_FLOW_RETENTION:
+                    del self._device_flows[code]
+                elif not flow["done"].is_set():
+                    flow["task"].cancel()
+            device_code = data.get("device_code")
+            interval = max(float(data.get("interval", 5)), 5.0)
+            self._device_flows[device_code] = {"done": asyncio.Event(), "result": None}
+            self._device_flows[device_code]["task"] = self.hass.async_create_task(
+                self._async_device_flow_task(client_id, device_code, interval, float(data.get("expires_in", 900)))
+            )
+            return json_response({"success": True, "device_code": device_code, "user_code": data.get("user_code"), "verification_uri": data.get("verification_uri"), "expires_in": data.get("expires_in"), "interval": data.get("interval", 5)})
         except Exception as err:
             _LOGGER.error("Error starting device flow: %s", err)
             return json_message(str(err), status_code=500)
 
-    async def github_device_flow_poll(self, client_id: str, device_code: str) -> web.Response:
-        """Poll for GitHub OAuth Device Flow authorization."""
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(GITHUB_ACCESS_TOKEN_URL, data={"client_id": client_id, "device_code": device_code, "grant_type": "urn:ietf:params:oauth:grant-type:device_code"}, headers={"Accept": "application/json"}) as response:
-                    data = await response.json()
-                    if "error" in data:
-                        error_code = data["error"]
-                        status = "pending" if error_code == "authorization_pending" else "slow_down" if error_code == "slow_down" else "error"
-                        return json_response({"success": False, "status": status, "message": data.get("error_description", "Unknown error")})
-                    access_token = data.get("access_token")
-                    async with session.get("https://api.openai.com/user" if "openai" in str(access_token) else "https://api.github.com/user", headers={"Authorization": f"Bearer {access_token}", "Accept": "application/json"}) as user_response:
-                        if user_response.status == 200:
-                            user_data = await user_response.json()
-                            await self.set_credentials(user_data.get("login"), access_token)
-                            return json_response({"success": True, "status": "authorized", "username": user_data.get("login"), "message": "Successfully authenticated"})
-                        return json_message("Failed to get user info", status_code=user_response.status)
+    async def github_device_flow_poll(self, client_id: str, device_code: str, wait: float = 0) -> web.Response:
+        """Return the device flow outcome, holding the request up to ``wait`` seconds for it."""
+        try:
+            flow = self._device_flows.get(device_code)
+            if flow is None:
+                # No background task (e.g. HA restarted mid-login): ask GitHub directly
+                return json_response(await self._device_flow_exchange(client_id, device_code))
+            if not flow["done"].is_set() and wait:
+                try:
+                    await asyncio.wait_for(flow["done"].wait(), min(float(wait), DEVICE_FLOW_MAX_WAIT))
+                except asyncio.TimeoutError:
+                    pass
+            if flow["result"] is None:
+                return json_response({"success": False, "status": "pending", "message": "Waiting for authorization"})
+            return json_response(flow["result"])
         except Exception as err:
             _LOGGER.error("Error polling device flow: %s", err)
             return json_message(str(err), status_code=500)
@@ -524,27 +1265,23 @@ class GitManager:
     async def github_star(self) -> web.Response:
         """Star the repository on behalf of the user."""
         try:
-            creds = self.data.get("github_credentials", {})
-            if not creds or "token" not in creds: return json_message("Not authenticated with GitHub", status_code=401)
-            token = base64.b64decode(creds["token"]).decode()
+            headers = self._github_token_headers()
+            if headers is None: return json_message("Not authenticated with GitHub", status_code=401)
             url = "https://api.github.com/user/starred/soulripper13/blueprint-studio"
-            async with aiohttp.ClientSession() as session:
-                async with session.put(url, headers={"Authorization": f"Bearer {token}", "Content-Length": "0", "Accept": "application/vnd.github+json"}) as response:
-                    if response.status == 204: return json_response({"success": True, "message": "Repository starred!"})
-                    return json_message(f"GitHub Error: {response.status}", status_code=response.status)
+            response = await self._api_request("PUT", url, {**headers, "Content-Length": "0"})
+            if response["status"] == 204: return json_response({"success": True, "message": "Repository starred!"})
+            return json_message(f"GitHub Error: {response['status']}", status_code=response["status"])
         except Exception as e: return json_message(str(e), status_code=500)
 
     async def github_follow(self) -> web.Response:
         """Follow the author on behalf of the user."""
         try:
-            creds = self.data.get("github_credentials", {})
-            if not creds or "token" not in creds: return json_message("Not authenticated with GitHub", status_code=401)
-            token = base64.b64decode(creds["token"]).decode()
+            headers = self._github_token_headers()
+            if headers is None: return json_message("Not authenticated with GitHub", status_code=401)
             url = "https://api.github.com/user/following/soulripper13"
-            async with aiohttp.ClientSession() as session:
-                async with session.put(url, headers={"Authorization": f"Bearer {token}", "Content-Length": "0", "Accept": "application/vnd.github+json"}) as response:
-                    if response.status == 204: return json_response({"success": True, "message": "Now following soulripper13!"})
-                    return json_message(f"GitHub Error: {response.status}", status_code=response.status)
+            response = await self._api_request("PUT", url, {**headers, "Content-Length": "0"})
+            if response["status"] == 204: return json_response({"success": True, "message": "Now following soulripper13!"})
+            return json_message(f"GitHub Error: {response['status']}", status_code=response["status"])
         except Exception as e: return json_message(str(e), status_code=500)
 
     async def gitea_create_repo(self, repo_name: str, description: str, is_private: bool, gitea_url: str) -> web.Response:
@@ -564,51 +1301,84 @@ class GitManager:
             # Gitea API endpoint for creating repos
             create_url = f"{gitea_url}/api/v1/user/repos"
 
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    create_url,
-                    json={
-                        "name": repo_name,
-                        "description": description,
-                        "private": is_private,
-                        "auto_init": False
-                    },
-                    headers={
-                        "Authorization": f"token {token}",
-                        "Content-Type": "application/json"
-                    }
-                ) as response:
-                    if response.status == 201:
-                        repo_data = await response.json()
-                        # Initialize git if not already done
-                        await self.init()
-                        # Add Gitea remote
-                        clone_url = repo_data.get("clone_url")
-                        if clone_url:
-                            await self.add_remote("gitea", clone_url)
-                        return json_response({
-                            "success": True,
-                            "message": f"Repository '{repo_name}' created successfully on Gitea",
-                            "html_url": repo_data.get("html_url"),
-                            "clone_url": clone_url,
-                            "username": creds.get("username", "")
-                        })
-                    else:
-                        error_text = await response.text()
-                        _LOGGER.error(f"Gitea API error ({response.status}): {error_text}")
-                        return json_message(f"Failed to create repository: {error_text}", status_code=response.status)
+            response = await self._api_request(
+                "POST",
+                create_url,
+                {
+                    "Authorization": f"token {token}",
+                    "Content-Type": "application/json"
+                },
+                json_body={
+                    "name": repo_name,
+                    "description": description,
+                    "private": is_private,
+                    "auto_init": False
+                },
+            )
+            if response["status"] == 201:
+                repo_data = response["data"] or {}
+                # Initialize git if not already done
+                await self.init()
+                # Add Gitea remote
+                clone_url = repo_data.get("clone_url")
+                if clone_url:
+                    await self.add_remote("gitea", clone_url)
+                return json_response({
+                    "success": True,
+                    "message": f"Repository '{repo_name}' created successfully on Gitea",
+                    "html_url": repo_data.get("html_url"),
+                    "clone_url": clone_url,
+                    "username": creds.get("username", "")
+                })
+            _LOGGER.error(f"Gitea API error ({response['status']}): {response['text']}")
+            return json_message(f"Failed to create repository: {response['text']}", status_code=response["status"])
         except Exception as err:
             _LOGGER.error("Error creating Gitea repo: %s", err)
             return json_message(str(err), status_code=500)
 
+    def _run_pathspec_command(self, args: list[str], files: list[str]) -> dict[str, Any]:
+        """Run a git command once for many paths, streaming them on stdin.
+
+        Paths git rejects are reported individually and the command is retried
+        without them, so one bad path does not fail the whole selection.
+        """
+        pending = list(dict.fromkeys(files))
+        failed: dict[str, str] = {}
+        while pending:
+            result = self._run_git_command(
+                args + ["--pathspec-from-file=-", "--pathspec-file-nul"], input="\0".join(pending)
+            )
+            if result["success"]:
+                return {"success": True, "output": result["output"], "done": pending, "failed": failed}
+            error = (result["error"] or "Git command failed").strip()
+            match = PATHSPEC_ERROR_RE.search(error)
+            if not match or match.group(1) not in pending:
+                failed.update({path: error for path in pending})
+                break
+            pending.remove(match.group(1))
+            failed[match.group(1)] = error
+        return {"success": False, "output": "", "done": [], "failed": failed}
+
+    async def _pathspec_operation(self, args: list[str], files: list[str], verb: str) -> web.Response:
+        """Validate paths, run a batched pathspec command and build the response."""
+        for file in files:
+            if not is_path_safe(self.config_dir, file): return json_message(f"Invalid path: {file}", status_code=403)
+        if not files:
+            return json_response({"success": True, "message": f"{verb} 0 file(s)", "output": "", "failed": {}})
+        result = await self.hass.async_add_executor_job(self._run_pathspec_command, args, files)
+        if not result["done"]:
+            return json_message(next(iter(result["failed"].values()), "Git command failed"), status_code=500)
+        return json_response({
+            "success": True,
+            "message": f"{verb} {len(result['done'])} file(s)",
+            "output": result["output"],
+            "failed": result["failed"],
+        })
+
     async def stage(self, files: list[str]) -> web.Response:
         """Stage specific files."""
         try:
-            for file in files:
-                if not is_path_safe(self.config_dir, file): return json_message(f"Invalid path: {file}", status_code=403)
-            result = await self.hass.async_add_executor_job(self._run_git_command, ["add"] + files)
-            if result["success"]: return json_response({"success": True, "message": f"Staged {len(files)} file(s)", "output": result["output"]})
-            return json_message(result["error"], status_code=500)
+            return await self._pathspec_operation(["add"], files, "Staged")
         except Exception as err:
             _LOGGER.error("Error staging files: %s", err)
             return json_message(str(err), status_code=500)
@@ -616,11 +1386,7 @@ class GitManager:
     async def unstage(self, files: list[str]) -> web.Response:
         """Unstage specific files."""
         try:
-            for file in files:
-                if not is_path_safe(self.config_dir, file): return json_message(f"Invalid path: {file}", status_code=403)
-            result = await self.hass.async_add_executor_job(self._run_git_command, ["reset"] + files)
-            if result["success"]: return json_response({"success": True, "message": f"Unstaged {len(files)} file(s)", "output": result["output"]})
-            return json_message(result["error"], status_code=500)
+            return await self._pathspec_operation(["reset", "-q"], files, "Unstaged")
         except Exception as err:
             _LOGGER.error("Error unstaging files: %s", err)
             return json_message(str(err), status_code=500)
@@ -628,11 +1394,7 @@ class GitManager:
     async def reset(self, files: list[str]) -> web.Response:
         """Reset/discard changes to specific files."""
         try:
-            for file in files:
-                if not is_path_safe(self.config_dir, file): return json_message(f"Invalid path: {file}", status_code=403)
-            result = await self.hass.async_add_executor_job(self._run_git_command, ["checkout", "HEAD", "--"] + files)
-            if result["success"]: return json_response({"success": True, "message": f"Reset {len(files)} file(s)", "output": result["output"]})
-            return json_message(result["error"], status_code=500)
+            return await self._pathspec_operation(["checkout", "HEAD"], files, "Reset")
         except Exception as err:
             _LOGGER.error("Error resetting files: %s", err)
             return json_message(str(err), status_code=500)
@@ -654,10 +1416,7 @@ class GitManager:
     async def stop_tracking(self, files: list[str]) -> web.Response:
         """Stop tracking specific files."""
         try:
-            for file in files:
-                if not is_path_safe(self.config_dir, file): return json_message(f"Invalid path: {file}", status_code=403)
-                await self.hass.async_add_executor_job(self._run_git_command, ["rm", "-r", "--cached", file])
-            return json_response({"success": True})
+            return await self._pathspec_operation(["rm", "-r", "--cached", "-q"], files, "Stopped tracking")
         except Exception as err:
             _LOGGER.error("Error stopping tracking for files: %s", err)
             return json_message(str(err), status_code=500)
@@ -822,30 +1581,502 @@ class GitManager:
             _LOGGER.error("Error deleting remote branch: %s", err)
             return json_message(str(err), status_code=500)
 
-    async def get_log(self, count: int = 20) -> web.Response:
-        """Get recent git commits."""
-        try:
-            result = await self.hass.async_add_executor_job(self._run_git_command, ["log", f"--pretty=format:%H|%at|%an|%s", f"-n", str(count)])
+    def _parse_log_output(self, output: str) -> list[str]:
+        """Parse LOG_FORMAT output into the commit cache and return the shas in order."""
+        shas = []
+        for line in output.split("\n"):
+            parts = line.split("\x1f", 3)
+            if len(parts) != 4:
+                continue
+            sha = parts[0].strip()
+            try:
+                timestamp = int(parts[1])
+            except ValueError:
+                timestamp = 0
+            self._commit_cache[sha] = {"hash": sha, "timestamp": timestamp, "author": parts[2], "message": parts[3]}
+            self._commit_cache.move_to_end(sha)
+            shas.append(sha)
+        while len(self._commit_cache) > COMMIT_CACHE_SIZE:
+            self._commit_cache.popitem(last=False)
+        return shas
+
+    def _commits(self, shas: list[str]) -> list[dict[str, Any]]:
+        """Return metadata for shas, re-reading any evicted from the commit cache."""
+        missing = [sha for sha in shas if sha not in self._commit_cache]
+        if missing:
+            result = self._run_git_command(["log", "--no-walk=unsorted", f"--pretty=format:{LOG_FORMAT}", *missing])
             if not result["success"]:
-                if "does not have any commits" in str(result.get("error")) or "fatal: your current branch" in str(result.get("error")):
-                    return json_response({"success": True, "commits": []})
-                return json_message(result["error"], status_code=500)
-            commits = []
-            for line in result["output"].split("\n"):
-                if not line.strip(): continue
-                parts = line.split("|", 3)
-                if len(parts) == 4: commits.append({"hash": parts[0], "timestamp": int(parts[1]), "author": parts[2], "message": parts[3]})
-            return json_response({"success": True, "commits": commits})
+                raise RuntimeError(result["error"])
+            fetched = set(self._parse_log_output(result["output"]))
+        else:
+            fetched = set()
+        commits = []
+        for sha in shas:
+            commit = self._commit_cache.get(sha)
+            if commit is None:
+                continue
+            if sha not in fetched:
+                self._commit_cache.move_to_end(sha)
+            commits.append(commit)
+        return commits
+
+    def _sync_log_cache(self, path: str, head: str) -> dict[str, Any]:
+        """Return the cached history for path, extended incrementally if HEAD advanced."""
+        entry = self._log_cache.get(path)
+        if entry:
+            self._log_cache.move_to_end(path)
+        if entry and entry["head"] != head:
+            ancestor = self._run_git_command(["merge-base", "--is-ancestor", entry["head"], head])
+            # Only a merge-free range is a plain prefix of the old listing; a merge can
+            # bring in older commits that git log interleaves, shifting --skip offsets
+            merges = self._run_git_command(["rev-list", "--merges", "-n", "1", f"{entry['head']}..{head}"]) if ancestor["success"] else None
+            result = None
+            if merges and merges["success"] and not merges["output"].strip():
+                args = ["log", f"--pretty=format:{LOG_FORMAT}", f"{entry['head']}..{head}"]
+                if path:
+                    args += ["--", path]
+                result = self._run_git_command(args)
+            if result and result["success"]:
+                entry["shas"] = self._parse_log_output(result["output"]) + entry["shas"]
+                entry["head"] = head
+            else:
+                # History was rewritten (reset, rebase, branch switch) or merged — start over
+                entry = None
+        if entry is None:
+            entry = {"head": head, "shas": [], "complete": False}
+            self._log_cache[path] = entry
+            while len(self._log_cache) > LOG_CACHE_SIZE:
+                self._log_cache.popitem(last=False)
+        return entry
+
+    def _extend_log_cache(self, entry: dict[str, Any], path: str, count: int) -> None:
+        """Load the next batch of older commits into a cached history."""
+        args = ["log", f"--pretty=format:{LOG_FORMAT}", "-n", str(count), f"--skip={len(entry['shas'])}", entry["head"]]
+        if path:
+            args += ["--", path]
+        result = self._run_git_command(args)
+        if not result["success"]:
+            raise RuntimeError(result["error"])
+        shas = self._parse_log_output(result["output"])
+        entry["shas"].extend(shas)
+        if len(shas) < count:
+            entry["complete"] = True
+
+    def _get_log_page(self, count: int, after: str | None = None, path: str = "") -> dict[str, Any]:
+        """Return one page of history after the cursor sha (runs in executor)."""
+        with self._log_lock:
+            head_result = self._run_git_command(["rev-parse", "--verify", "--quiet", "HEAD"])
+            head = head_result["output"].strip() if head_result["success"] else ""
+            if not head:
+                return {"success": True, "commits": [], "next": None, "has_more": False}
+
+            entry = self._sync_log_cache(path, head)
+            start = 0
+            if after:
+                while after not in entry["shas"] and not entry["complete"]:
+                    self._extend_log_cache(entry, path, LOG_BATCH_SIZE)
+                if after not in entry["shas"]:
+                    return {"success": False, "message": f"Unknown cursor: {after}"}
+                start = entry["shas"].index(after) + 1
+
+            end = start + count
+            while len(entry["shas"]) <= end and not entry["complete"]:
+                self._extend_log_cache(entry, path, max(LOG_BATCH_SIZE, end - len(entry["shas"]) + 1))
+
+            page = entry["shas"][start:end]
+            has_more = len(entry["shas"]) > end
+            return {
+                "success": True,
+                "commits": self._commits(page),
+                "next": page[-1] if page and has_more else None,
+                "has_more": has_more,
+            }
+
+    async def _stream_log(self, request: web.Request, count: int, after: str | None, path: str) -> web.StreamResponse:
+        """Stream history as NDJSON, one commit per line, followed by a summary line."""
+        response = web.StreamResponse()
+        response.content_type = "application/x-ndjson"
+        response.headers["Cache-Control"] = "no-cache"
+        await response.prepare(request)
+
+        sent = 0
+        cursor = after
+        has_more = True
+        try:
+            while has_more and (count <= 0 or sent < count):
+                batch = LOG_BATCH_SIZE if count <= 0 else min(LOG_BATCH_SIZE, count - sent)
+                page = await self.hass.async_add_executor_job(self._get_log_page, batch, cursor, path)
+                if not page["success"]:
+                    await response.write((json.dumps({"error": page["message"]}) + "\n").encode())
+                    break
+                for commit in page["commits"]:
+                    await response.write((json.dumps(commit) + "\n").encode())
+                sent += len(page["commits"])
+                has_more = page["has_more"]
+                cursor = page["commits"][-1]["hash"] if page["commits"] else cursor
+            await response.write((json.dumps({"done": True, "count": sent, "next": cursor if has_more else None}) + "\n").encode())
+        except Exception as err:
+            _LOGGER.error("Error streaming git log: %s", err)
+            await response.write((json.dumps({"error": str(err)}) + "\n").encode())
+
+        await response.write_eof()
+        return response
+
+    async def get_log(self, count: int = 20, after: str | None = None, path: str | None = None,
+                      stream: bool = False, request: web.Request | None = None) -> web.Response:
+        """Get git commits, paginated with an ``after`` cursor and optionally filtered by path.
+
+        Commit metadata is cached in memory and extended incrementally when
+        HEAD advances. With ``stream`` the history is sent as NDJSON
+        (``count`` <= 0 streams the whole history).
+        """
+        try:
+            path = (path or "").lstrip("/")
+            if path and not is_path_safe(self.config_dir, path):
+                return json_message(f"Invalid path: {path}", status_code=403)
+            count = int(count)
+            if stream and request is not None:
+                return await self._stream_log(request, count, after, path)
+
+            count = max(1, min(count, LOG_MAX_PAGE))
+            page = await self.hass.async_add_executor_job(self._get_log_page, count, after, path)
+            if not page["success"]:
+                return json_message(page["message"], status_code=400)
+            return json_response(page)
         except Exception as err:
             _LOGGER.error("Error getting git log: %s", err)
             return json_message(str(err), status_code=500)
 
-    async def diff_commit(self, commit_hash: str) -> web.Response:
-        """Get the diff for a specific commit."""
+    def _commit_file_summary(self, commit_hash: str) -> list[dict[str, Any]]:
+        """Return per-file status and line counts of a commit from --numstat/--name-status."""
+        base_args = ["show", "--pretty=format:", "-z", "-M", commit_hash]
+        name_status = self._run_git_command(base_args[:2] + ["--name-status"] + base_args[2:])
+        if not name_status["success"]:
+            raise RuntimeError(name_status["error"])
+        numstat = self._run_git_command(base_args[:2] + ["--numstat"] + base_args[2:])
+        if not numstat["success"]:
+            raise RuntimeError(numstat["error"])
+
+        statuses: dict[str, tuple[str, str | None]] = {}
+        tokens = name_status["output"].split("\0")
+        i = 0
+        while i < len(tokens):
+            code = tokens[i].strip()
+            if not code:
+                i += 1
+                continue
+            if code[0] in "RC" and i + 2 < len(tokens):
+                statuses[tokens[i + 2]] = (code[0], tokens[i + 1])
+                i += 3
+            elif i + 1 < len(tokens):
+                statuses[tokens[i + 1]] = (code[0], None)
+                i += 2
+            else:
+                break
+
+        files = []
+        tokens = numstat["output"].split("\0")
+        i = 0
+        while i < len(tokens):
+            parts = tokens[i].lstrip("\n").split("\t", 2)
+            if len(parts) != 3:
+                i += 1
+                continue
+            additions, deletions, path = parts
+            old_path = None
+            if not path and i + 2 < len(tokens):
+                # Rename/copy: "add\tdel\t\0old\0new\0"
+                old_path, path = tokens[i + 1], tokens[i + 2]
+                i += 3
+            else:
+                i += 1
+            binary = additions == "-"
+            status, renamed_from = statuses.get(path, ("M", None))
+            files.append({
+                "path": path, "old_path": old_path or renamed_from, "status": status, "binary": binary,
+                "additions": 0 if binary else int(additions), "deletions": 0 if binary else int(deletions),
+            })
+        return files
+
+    def _commit_file_patch(self, commit_hash: str, path: str, old_path: str | None = None,
+                           max_bytes: int = DIFF_FILE_MAX_BYTES, force: bool = False) -> dict[str, Any]:
+        """Return the patch of one file in a commit, guarded by size and binary checks."""
+        size = 0
+        for rev, rev_path in ((commit_hash, path), (f"{commit_hash}^", old_path or path)):
+            size_result = self._run_git_command(["cat-file", "-s", f"{rev}:{rev_path}"])
+            if size_result["success"]:
+                try:
+                    size = max(size, int(size_result["output"].strip()))
+                except ValueError:
+                    pass
+        if size > max_bytes and not force:
+            return {"success": True, "path": path, "too_large": True, "size": size, "patch": ""}
+
+        paths = [path] + ([old_path] if old_path and old_path != path else [])
+        result = self._run_git_command(["show", "--pretty=format:", "-M", commit_hash, "--"] + paths)
+        if not result["success"]:
+            return {"success": False, "path": path, "message": result["error"]}
+        patch = result["output"].lstrip("\n")
+        binary = any(line.startswith("Binary files ") and line.endswith(" differ") for line in patch.split("\n", 8))
+        return {"success": True, "path": path, "binary": binary, "size": size, "patch": "" if binary else patch}
+
+    async def _stream_commit_diff(self, request: web.Request, commit_hash: str, files: list[dict[str, Any]]) -> web.StreamResponse:
+        """Stream a commit diff as NDJSON: the summary first, then one line per file."""
+        response = web.StreamResponse()
+        response.content_type = "application/x-ndjson"
+        response.headers["Cache-Control"] = "no-cache"
+        await response.prepare(request)
         try:
-            result = await self.hass.async_add_executor_job(self._run_git_command, ["show", "--pretty=format:", commit_hash])
-            if result["success"]: return json_response({"success": True, "diff": result["output"]})
-            return json_message(result["error"], status_code=500)
+            await response.write((json.dumps({"type": "summary", "files": files}) + "\n").encode())
+            for item in files:
+                if item["binary"]:
+                    entry = {"success": True, "path": item["path"], "binary": True, "patch": ""}
+                else:
+                    entry = await self.hass.async_add_executor_job(
+                        self._commit_file_patch, commit_hash, item["path"], item["old_path"]
+                    )
+                await response.write((json.dumps({"type": "file", **entry}) + "\n").encode())
+            await response.write((json.dumps({"type": "done"}) + "\n").encode())
+        except Exception as err:
+            _LOGGER.error("Error streaming commit diff: %s", err)
+            await response.write((json.dumps({"type": "error", "message": str(err)}) + "\n").encode())
+        await response.write_eof()
+        return response
+
+    async def diff_commit(self, commit_hash: str, path: str | None = None, old_path: str | None = None,
+                          stream: bool = False, request: web.Request | None = None, force: bool = False) -> web.Response:
+        """Get the diff for a specific commit.
+
+        Without ``path`` only the per-file summary (status, additions,
+        deletions, binary) is returned; the hunks of each file are then
+        loaded on demand by passing its ``path``. With ``stream`` the summary
+        and every file patch are sent as NDJSON.
+        """
+        try:
+            if not commit_hash or not COMMIT_HASH_RE.fullmatch(commit_hash):
+                return json_message("Invalid commit hash", status_code=400)
+            if path:
+                for item in (path, old_path):
+                    if item and not is_path_safe(self.config_dir, item):
+                        return json_message(f"Invalid path: {item}", status_code=403)
+                result = await self.hass.async_add_executor_job(
+                    self._commit_file_patch, commit_hash, path, old_path, DIFF_FILE_MAX_BYTES, force
+                )
+                if result["success"]:
+                    return json_response(result)
+                return json_message(result["message"], status_code=500)
+
+            files = await self.hass.async_add_executor_job(self._commit_file_summary, commit_hash)
+            if stream and request is not None:
+                return await self._stream_commit_diff(request, commit_hash, files)
+            return json_response({
+                "success": True, "files": files,
+                "additions": sum(f["additions"] for f in files),
+                "deletions": sum(f["deletions"] for f in files),
+            })
         except Exception as err:
             _LOGGER.error("Error getting git diff for commit: %s", err)
-            return json_message(str(err), status_code=500)
\ No newline at end of file
+            return json_message(str(err), status_code=500)
+
+    @staticmethod
+    def _feed_blame_line(state: dict[str, Any], line: str) -> dict[str, Any] | None:
+        """Parse one line of ``git blame --incremental``; return a range once it is complete."""
+        current = state.get("current")
+        if current is None:
+            parts = line.split()
+            if len(parts) == 4 and COMMIT_HASH_RE.fullmatch(parts[0]):
+                state["current"] = {"commit": parts[0], "orig_start": int(parts[1]), "start": int(parts[2]), "lines": int(parts[3])}
+                state["commits"].setdefault(parts[0], {"hash": parts[0], "author": "", "timestamp": 0, "message": ""})
+            return None
+        key, _, value = line.partition(" ")
+        commit = state["commits"][current["commit"]]
+        if key == "author":
+            commit["author"] = value
+        elif key == "author-time":
+            commit["timestamp"] = int(value) if value.isdigit() else 0
+        elif key == "summary":
+            commit["message"] = value
+        elif key == "filename":
+            # The filename line closes every record
+            state["current"] = None
+            return current
+        return None
+
+    def _run_blame(self, head: str, path: str, line_ranges: list[tuple[int, int]] | None = None) -> tuple[list[dict], dict]:
+        """Blame path at head, optionally limited to (start, end) line ranges."""
+        args = ["blame", "--incremental"]
+        for start, end in line_ranges or []:
+            args += ["-L", f"{start},{end}"]
+        result = self._run_git_command(args + [head, "--", path])
+        if not result["success"]:
+            raise RuntimeError(result["error"])
+        state: dict[str, Any] = {"current": None, "commits": {}}
+        ranges = [r for r in (self._feed_blame_line(state, line) for line in result["output"].split("\n")) if r]
+        return ranges, state["commits"]
+
+    @staticmethod
+    def _merge_blame_ranges(owners: list[tuple[str, int] | None]) -> list[dict[str, Any]]:
+        """Compress a per-line (commit, orig line) list back into ranges."""
+        ranges: list[dict[str, Any]] = []
+        for index, owner in enumerate(owners):
+            if owner is None:
+                continue
+            last = ranges[-1] if ranges else None
+            if (last and last["commit"] == owner[0] and last["start"] + last["lines"] == index + 1
+                    and last["orig_start"] + last["lines"] == owner[1]):
+                last["lines"] += 1
+            else:
+                ranges.append({"commit": owner[0], "orig_start": owner[1], "start": index + 1, "lines": 1})
+        return ranges
+
+    def _update_blame(self, entry: dict[str, Any], path: str, head: str) -> bool:
+        """Carry a cached blame forward to head, re-blaming only the lines that changed."""
+        if not self._run_git_command(["merge-base", "--is-ancestor", entry["head"], head])["success"]:
+            return False
+        diff = self._run_git_command(["diff", "-U0", "--no-color", "--no-ext-diff", entry["head"], head, "--", path])
+        if not diff["success"]:
+            return False
+
+        owners: list[tuple[str, int] | None] = []
+        for item in entry["ranges"]:
+            owners.extend((item["commit"], item["orig_start"] + offset) for offset in range(item["lines"]))
+        hunks = []
+        for line in diff["output"].split("\n"):
+            match = DIFF_HUNK_RE.match(line)
+            if match:
+                old_start, old_count, new_start, new_count = (
+                    int(match.group(1)), int(match.group(2) or 1), int(match.group(3)), int(match.group(4) or 1)
+                )
+                hunks.append((old_start, old_count, new_start, new_count))
+        # Splice from the bottom so earlier old-side line numbers stay valid
+        for old_start, old_count, _new_start, new_count in reversed(hunks):
+            first = old_start if old_count == 0 else old_start - 1
+            owners[first:first + old_count] = [None] * new_count
+
+        missing: list[tuple[int, int]] = []
+        for index, owner in enumerate(owners):
+            if owner is None:
+                if missing and missing[-1][1] == index:
+                    missing[-1] = (missing[-1][0], index + 1)
+                else:
+                    missing.append((index + 1, index + 1))
+        if missing:
+            ranges, commits = self._run_blame(head, path, missing)
+            entry["commits"].update(commits)
+            for item in ranges:
+                for offset in range(item["lines"]):
+                    owners[item["start"] - 1 + offset] = (item["commit"], item["orig_start"] + offset)
+        entry["ranges"] = self._merge_blame_ranges(owners)
+        entry["head"] = head
+        return True
+
+    def _get_blame(self, path: str, cached_only: bool = False) -> dict[str, Any] | None:
+        """Return the blame for path at HEAD from cache, updated incrementally (runs in executor)."""
+        with self._blame_lock:
+            head_result = self._run_git_command(["rev-parse", "--verify", "--quiet", "HEAD"])
+            head = head_result["output"].strip() if head_result["success"] else ""
+            if not head:
+                return {"head": "", "ranges": [], "commits": {}}
+            entry = self._blame_cache.get(path)
+            if entry and entry["head"] != head and not self._update_blame(entry, path, head):
+                entry = None
+            if entry is None:
+                if cached_only:
+                    return {"head": head, "ranges": None, "commits": {}}
+                ranges, commits = self._run_blame(head, path)
+                entry = {"head": head, "ranges": sorted(ranges, key=lambda r: r["start"]), "commits": commits}
+            self._blame_cache.pop(path, None)
+            self._blame_cache[path] = entry
+            while len(self._blame_cache) > BLAME_CACHE_SIZE:
+                self._blame_cache.pop(next(iter(self._blame_cache)), None)
+            return entry
+
+    async def _stream_blame(self, request: web.Request, path: str) -> web.StreamResponse:
+        """Stream blame as NDJSON: commit records first seen, then line ranges as git finds them."""
+        response = web.StreamResponse()
+        response.content_type = "application/x-ndjson"
+        response.headers["Cache-Control"] = "no-cache"
+        await response.prepare(request)
+
+        async def write(obj: dict[str, Any]) -> None:
+            await response.write((json.dumps(obj) + "\n").encode())
+
+        process = None
+        stderr_task = None
+        try:
+            entry = await self.hass.async_add_executor_job(self._get_blame, path, True)
+            if entry["ranges"] is not None:
+                for commit in entry["commits"].values():
+                    await write({"type": "commit", **commit})
+                for item in entry["ranges"]:
+                    await write({"type": "range", **item})
+            else:
+                head = entry["head"]
+                process = await asyncio.create_subprocess_exec(
+                    "git", "-c", f"safe.directory={self.config_dir}", "blame", "--incremental", head, "--", path,
+                    cwd=self.config_dir, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+                )
+                # Drain stderr alongside stdout so git never blocks on a full pipe
+                stderr_task = asyncio.ensure_future(process.stderr.read())
+                state: dict[str, Any] = {"current": None, "commits": {}}
+                ranges = []
+                sent: set[str] = set()
+                async for raw in process.stdout:
+                    item = self._feed_blame_line(state, raw.decode(errors="replace").rstrip("\n"))
+                    if item is None:
+                        continue
+                    if item["commit"] not in sent:
+                        sent.add(item["commit"])
+                        await write({"type": "commit", **state["commits"][item["commit"]]})
+                    ranges.append(item)
+                    await write({"type": "range", **item})
+                stderr = await stderr_task
+                if await process.wait() != 0:
+                    raise RuntimeError(stderr.decode(errors="replace").strip() or "git blame failed")
+                with self._blame_lock:
+                    self._blame_cache[path] = {"head": head, "ranges": sorted(ranges, key=lambda r: r["start"]), "commits": state["commits"]}
+                    while len(self._blame_cache) > BLAME_CACHE_SIZE:
+                        self._blame_cache.pop(next(iter(self._blame_cache)), None)
+            await write({"type": "done", "head": entry["head"]})
+            await response.write_eof()
+        except ConnectionResetError:
+            # Client went away; nothing more can be written
+            _LOGGER.debug("Client disconnected while streaming git blame for %s", path)
+        except Exception as err:
+            _LOGGER.error("Error streaming git blame: %s", err)
+            try:
+                await write({"type": "error", "error": str(err)})
+                await response.write_eof()
+            except ConnectionResetError:
+                pass
+        finally:
+            if process is not None and process.returncode is None:
+                process.kill()
+                await process.wait()
+            if stderr_task is not None and not stderr_task.done():
+                stderr_task.cancel()
+        return response
+
+    async def blame(self, path: str, stream: bool = False, request: web.Request | None = None) -> web.Response:
+        """Get line-range -> commit blame for a file at HEAD.
+
+        Results are cached per path and HEAD; after new commits only the lines
+        those commits touched are blamed again. With ``stream`` the ranges are
+        sent as NDJSON while git is still working.
+        """
+        try:
+            path = (path or "").lstrip("/")
+            if not path or not is_path_safe(self.config_dir, path):
+                return json_message(f"Invalid path: {path}", status_code=403)
+            if stream and request is not None:
+                return await self._stream_blame(request, path)
+            entry = await self.hass.async_add_executor_job(self._get_blame, path)
+            return json_response({
+                "success": True,
+                "head": entry["head"],
+                "commits": entry["commits"],
+                "ranges": entry["ranges"],
+            })
+        except Exception as err:
+            _LOGGER.error("Error getting git blame: %s", err)
+            return json_message(str(err), status_code=500)
@@ -0,0 +1,225 @@
+"""Event-invalidated snapshot of HA registries and services."""
+from __future__ import annotations
+
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+
+from homeassistant.const import EVENT_SERVICE_REGISTERED, EVENT_SERVICE_REMOVED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.json import json_bytes
+
+_LOGGER = logging.getLogger(__name__)
+
+SECTIONS = ("devices", "areas", "floors", "labels", "services")
+# Registry/service events and the sections they invalidate (floor and label
+# registries only exist on newer HA; listening for their events is harmless)
+INVALIDATING_EVENTS = {
+    "device_registry_updated": "devices",
+    "area_registry_updated": "areas",
+    "floor_registry_updated": "floors",
+    "label_registry_updated": "labels",
+    EVENT_SERVICE_REGISTERED: "services",
+    EVENT_SERVICE_REMOVED: "services",
+}
+# Encoded snapshots kept per (sections, versions) combination
+SNAPSHOT_CACHE_SIZE = 16
+
+
+def _build_devices(hass: HomeAssistant) -> list[dict[str, Any]]:
+    """Return all registered devices with integration, manufacturer, and model."""
+    from homeassistant.helpers import device_registry as dr
+    devices = []
+    for d in dr.async_get(hass).devices.values():
+        identifiers = list(d.identifiers) if d.identifiers else []
+        devices.append({
+            "id": d.id,
+            "name": d.name_by_user or d.name or d.id,
+            "manufacturer": d.manufacturer,
+            "model": d.model,
+            "integration": identifiers[0][0] if identifiers else None,
+        })
+    return devices
+
+
+def _build_areas(hass: HomeAssistant) -> list[dict[str, Any]]:
+    from homeassistant.helpers import area_registry as ar
+    return [{"id": a.id, "name": a.name} for a in ar.async_get(hass).areas.values()]
+
+
+def _build_floors(hass: HomeAssistant) -> list[dict[str, Any]]:
+    from homeassistant.helpers import floor_registry as fr
+    return [{"id": f.floor_id, "name": f.name} for f in fr.async_get(hass).floors.values()]
+
+
+def _build_labels(hass: HomeAssistant) -> list[dict[str, Any]]:
+    from homeassistant.helpers import label_registry as lr
+    return [{"id": lb.label_id, "name": lb.name} for lb in lr.async_get(hass).labels.values()]
+
+
+def _field(meta: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "description": meta.get("description") or meta.get("name") or "",
+        "required": bool(meta.get("required", False)),
+        "example": meta.get("example"),
+        "selector": meta.get("selector"),
+    }
+
+
+async def _build_services(hass: HomeAssistant) -> list[dict[str, Any]]:
+    """Return all registered HA services with full metadata from services.yaml.
+
+    Uses async_get_all_descriptions() — the same source the HA frontend uses —
+    so fields, selectors, descriptions and examples are always complete.
+    """
+    from homeassistant.helpers.service import async_get_all_descriptions
+
+    # async_get_all_descriptions returns:
+    # { domain: { service_name: { name, description, fields: { key: { description, example, selector, required } } } } }
+    descriptions = await async_get_all_descriptions(hass)
+
+    services = []
+    for domain, domain_services in descriptions.items():
+        for service_name, meta in domain_services.items():
+            if meta is None:
+                meta = {}
+            fields = {}
+            for k, v in (meta.get("fields") or {}).items():
+                if not isinstance(v, dict):
+                    continue
+                # Collapsed section headers have a "fields" subkey but no selector:
+                # flatten advanced/collapsed sections into top-level fields
+                if "fields" in v and "selector" not in v:
+                    for sk, sv in v["fields"].items():
+                        if isinstance(sv, dict):
+                            fields[sk] = _field(sv)
+                else:
+                    fields[k] = _field(v)
+            services.append({
+                "service": f"{domain}.{service_name}",
+                "domain": domain,
+                "name": meta.get("name") or service_name,
+                "description": meta.get("description") or "",
+                "fields": fields,
+            })
+
+    services.sort(key=lambda s: s["service"])
+    return services
+
+
+_BUILDERS = {
+    "devices": _build_devices,
+    "areas": _build_areas,
+    "floors": _build_floors,
+    "labels": _build_labels,
+}
+
+
+class RegistryCache:
+    """Devices, areas, floors, labels and services, rebuilt only after they change.
+
+    Each section carries a version that registry and service events bump;
+    encoded snapshots are cached per version combination and identified by
+    an ETag. Runs on the event loop only.
+    """
+
+    def __init__(self, hass: HomeAssistant | None) -> None:
+        """Initialize registry cache."""
+        self.hass = hass
+        # Distinguishes ETags across restarts, when versions start over
+        self._epoch = f"{time.time_ns():x}"
+        self._versions: dict[str, int] = dict.fromkeys(SECTIONS, 0)
+        # section -> built value, present only while current
+        self._sections: dict[str, list[dict[str, Any]]] = {}
+        # (sections, versions) -> (etag, encoded snapshot), in LRU order
+        self._snapshots: OrderedDict[tuple, tuple[str, bytes]] = OrderedDict()
+        self._unsubs: list = []
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+
+    @callback
+    def async_start(self) -> None:
+        """Follow registry and service events; sections are only cached while started."""
+        if not self._unsubs:
+            self._unsubs = [
+                self.hass.bus.async_listen(event_type, self._async_on_change)
+                for event_type in INVALIDATING_EVENTS
+            ]
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop following events and drop cached data."""
+        for unsub in self._unsubs:
+            unsub()
+        self._unsubs = []
+        self._sections.clear()
+        self._snapshots.clear()
+
+    @callback
+    def _async_on_change(self, event: Event) -> None:
+        section = INVALIDATING_EVENTS[event.event_type]
+        self._versions[section] += 1
+        self._invalidations += 1
+        self._sections.pop(section, None)
+
+    async def async_section(self, section: str) -> list[dict[str, Any]]:
+        """Return one section, building it if it changed since it was last built."""
+        value = self._sections.get(section)
+        if value is not None:
+            self._hits += 1
+            return value
+        self._misses += 1
+        version = self._versions[section]
+        try:
+            if section == "services":
+                value = await _build_services(self.hass)
+            else:
+                value = _BUILDERS[section](self.hass)
+        except Exception as e:
+            _LOGGER.debug("Building %s failed: %s", section, e)
+            return []
+        # Keep it only if nothing changed while building, and events are followed
+        if self._unsubs and version == self._versions[section]:
+            self._sections[section] = value
+        return value
+
+    async def async_snapshot(self, sections: tuple[str, ...] = SECTIONS) -> tuple[str | None, bytes]:
+        """Return ``(etag, JSON body)`` for the requested sections.
+
+        The ETag is None when a section failed to build or changed while
+        building: that body must not be cached, since the versions it would
+        be tagged with have not moved.
+        """
+        versions = tuple(self._versions[section] for section in sections)
+        key = (sections, versions)
+        cached = self._snapshots.get(key)
+        if cached is not None:
+            self._snapshots.move_to_end(key)
+            self._hits += 1
+            return cached
+
+        data = {section: await self.async_section(section) for section in sections}
+        if not all(section in self._sections for section in sections):
+            return None, json_bytes({"success": True, "version": None, **data})
+
+        digest = hashlib.sha1(repr((self._epoch, key)).encode()).hexdigest()[:16]
+        etag = f'"{digest}"'
+        snapshot = (etag, json_bytes({"success": True, "version": etag, **data}))
+        self._snapshots[key] = snapshot
+        while len(self._snapshots) > SNAPSHOT_CACHE_SIZE:
+            self._snapshots.popitem(last=False)
+        return snapshot
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and current section versions."""
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "invalidations": self._invalidations,
+            "snapshots": len(self._snapshots),
+            "max_snapshots": SNAPSHOT_CACHE_SIZE,
+            "versions": dict(self._versions),
+        }
@@ -0,0 +1,209 @@
+"""Compiled-template cache and guarded rendering for Home Assistant templates."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Callable
+
+import jinja2
+from jinja2 import nodes
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import TemplateError
+from homeassistant.helpers.event import TrackTemplate, TrackTemplateResultInfo, async_track_template_result
+from homeassistant.helpers.template import Template
+from homeassistant.util.thread import ThreadWithException
+
+_LOGGER = logging.getLogger(__name__)
+
+TEMPLATE_CACHE_SIZE = 256
+# Larger sources (whole .jinja files being edited) are compiled but not kept
+TEMPLATE_CACHE_MAX_SOURCE = 64 * 1024
+# Rendering is cancelled after this many seconds
+RENDER_TIMEOUT = 5.0
+MAX_OUTPUT_CHARS = 256 * 1024
+# Upper bound for nested loops over literal ranges, checked before rendering
+MAX_LOOP_ITERATIONS = 1_000_000
+# Live previews re-render at most this often, however fast referenced states change
+PREVIEW_RATE_LIMIT = timedelta(seconds=1)
+
+# Same syntax extensions as HA's template environment, used only to walk the AST
+_PARSE_ENV = jinja2.Environment(extensions=["jinja2.ext.loopcontrols", "jinja2.ext.do"])
+
+
+def _literal_range_size(node: nodes.Node) -> int | None:
+    """Return the length of ``range(<constants>)``, or None for any other iterable."""
+    if not (
+        isinstance(node, nodes.Call)
+        and isinstance(node.node, nodes.Name)
+        and node.node.name == "range"
+        and not node.kwargs and node.dyn_args is None and node.dyn_kwargs is None
+    ):
+        return None
+    try:
+        return len(range(*(arg.as_const() for arg in node.args)))
+    except (nodes.Impossible, TypeError, ValueError):
+        return None
+
+
+def _loop_iterations(node: nodes.Node, multiplier: int = 1) -> int:
+    """Return the worst-case iteration count of nested loops over literal ranges."""
+    worst = multiplier
+    for child in node.iter_child_nodes():
+        if isinstance(child, nodes.For):
+            size = _literal_range_size(child.iter)
+            inner = multiplier * (size if size is not None else 1)
+            worst = max(worst, _loop_iterations(child, inner))
+        else:
+            worst = max(worst, _loop_iterations(child, multiplier))
+    return worst
+
+
+def max_loop_iterations(source: str) -> int:
+    """Estimate how many loop iterations a template runs (0 if it cannot be parsed)."""
+    try:
+        return _loop_iterations(_PARSE_ENV.parse(source))
+    except jinja2.TemplateSyntaxError:
+        return 0
+
+
+class TemplateManager:
+    """Compile HA templates once per source and render them with limits."""
+
+    def __init__(self, hass: HomeAssistant | None) -> None:
+        """Initialize template manager."""
+        self.hass = hass
+        # source -> compiled Template, in LRU order
+        self._cache: OrderedDict[str, Template] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, source: str) -> Template:
+        """Return the compiled Template for ``source``; raises TemplateError on syntax errors.
+
+        Safe to call from executor threads (check_jinja) and the event loop.
+        """
+        with self._lock:
+            template = self._cache.get(source)
+            if template is not None:
+                self._cache.move_to_end(source)
+                self._hits += 1
+                return template
+            self._misses += 1
+
+        template = Template(source, self.hass)
+        template.ensure_valid()
+        if len(source) <= TEMPLATE_CACHE_MAX_SOURCE:
+            with self._lock:
+                self._cache[source] = template
+                while len(self._cache) > TEMPLATE_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        return template
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters for the compiled-template cache."""
+        with self._lock:
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "size": len(self._cache),
+                "max_size": TEMPLATE_CACHE_SIZE,
+            }
+
+    @staticmethod
+    def _output(result: Any) -> dict[str, Any]:
+        """Return the response fields for a rendered result, truncated if needed."""
+        output = str(result)
+        response = {"result": output[:MAX_OUTPUT_CHARS]}
+        if len(output) > MAX_OUTPUT_CHARS:
+            response["truncated"] = True
+        return response
+
+    async def _async_checked_template(self, source: str) -> Template:
+        """Compile ``source`` and reject it if its loops exceed MAX_LOOP_ITERATIONS."""
+        template = await self.hass.async_add_executor_job(self.get, source)
+        iterations = await self.hass.async_add_executor_job(max_loop_iterations, source)
+        if iterations > MAX_LOOP_ITERATIONS:
+            raise TemplateError(f"Template loops run up to {iterations:,} iterations (limit {MAX_LOOP_ITERATIONS:,})")
+        return template
+
+    async def async_track(self, source: str, send: Callable[[dict[str, Any]], None]) -> TrackTemplateResultInfo:
+        """Track a template's entity dependencies and ``send`` a result whenever it changes.
+
+        Re-renders are rate limited to PREVIEW_RATE_LIMIT by HA's tracker. Raises
+        TemplateError for invalid, over-long or too slow templates. Call
+        ``async_refresh`` on the returned info for the first result and
+        ``async_remove`` to stop tracking.
+        """
+        template = await self._async_checked_template(source)
+        if await template.async_render_will_timeout(RENDER_TIMEOUT):
+            raise TemplateError(f"Template rendering exceeded {RENDER_TIMEOUT:g}s")
+
+        @callback
+        def _on_result(_event, updates) -> None:
+            result = updates.pop().result
+            if isinstance(result, TemplateError):
+                send({"success": False, "error": str(result)})
+                return
+            send({
+                "success": True,
+                **self._output(result),
+                "listeners": {
+                    "all": info.listeners["all"],
+                    "time": info.listeners["time"],
+                    "entities": sorted(info.listeners["entities"]),
+                    "domains": sorted(info.listeners["domains"]),
+                },
+            })
+
+        info = async_track_template_result(
+            self.hass, [TrackTemplate(template, None, PREVIEW_RATE_LIMIT)], _on_result
+        )
+        return info
+
+    async def async_render(self, source: str) -> dict[str, Any]:
+        """Render a template in its own thread, cancelling it after RENDER_TIMEOUT."""
+        try:
+            template = await self._async_checked_template(source)
+        except TemplateError as err:
+            return {"success": False, "error": str(err)}
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future = loop.create_future()
+
+        def _resolve(result: Any, error: BaseException | None) -> None:
+            if future.done():  # timed out and abandoned
+                return
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        def _render() -> None:
+            try:
+                result = template.async_render()
+            except BaseException as err:  # includes the TimeoutError raised into the thread
+                loop.call_soon_threadsafe(_resolve, None, err)
+            else:
+                loop.call_soon_threadsafe(_resolve, result, None)
+
+        # A dedicated thread (not the executor) so a runaway render can be interrupted
+        thread = ThreadWithException(target=_render, name="blueprint_studio_template", daemon=True)
+        thread.start()
+        try:
+            result = await asyncio.wait_for(future, RENDER_TIMEOUT)
+        except asyncio.TimeoutError:
+            thread.raise_exc(TimeoutError)
+            _LOGGER.warning("Template rendering exceeded %ss and was cancelled", RENDER_TIMEOUT)
+            return {
+                "success": False,
+                "timeout": True,
+                "error": f"Template rendering exceeded {RENDER_TIMEOUT:g}s and was cancelled",
+            }
+        except TemplateError as err:
+            return {"success": False, "error": str(err)}
+
+        return {"success": True, **self._output(result)}
@@ -7,6 +7,18 @@ import voluptuous as vol
 
 from homeassistant.components import websocket_api
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import TemplateError
+from homeassistant.helpers.json import json_bytes
+
+from ..const import DOMAIN
+from .diagnostics_manager import DIAGNOSTICS_EVENT
+from .entity_index import (
+    FEED_INTERVAL_MS,
+    FEED_MAX_INTERVAL_MS,
+    FEED_MIN_INTERVAL_MS,
+    MAX_ATTRIBUTE_ENTITIES,
+    EntityFeed,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -16,6 +28,10 @@ def async_register_websockets(hass: HomeAssistant):
     _LOGGER.debug("Registering Blueprint Studio websocket commands")
     websocket_api.async_register_command(hass, websocket_subscribe_updates)
     websocket_api.async_register_command(hass, websocket_subscribe_settings)
+    websocket_api.async_register_command(hass, websocket_subscribe_diagnostics)
+    websocket_api.async_register_command(hass, websocket_subscribe_template)
+    websocket_api.async_register_command(hass, websocket_subscribe_entities)
+    websocket_api.async_register_command(hass, websocket_entity_attributes)
 
 @websocket_api.require_admin
 @websocket_api.async_response
@@ -60,3 +76,110 @@ async def websocket_subscribe_settings(hass: HomeAssistant, connection: websocke
     )
 
     connection.send_result(msg["id"])
+
+
+@websocket_api.require_admin
+@websocket_api.async_response
+@websocket_api.websocket_command({
+    vol.Required("type"): "blueprint_studio/subscribe_diagnostics",
+})
+async def websocket_subscribe_diagnostics(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]):
+    """Subscribe to workspace diagnostics: a snapshot, then per-file updates."""
+
+    @callback
+    def forward_diagnostics(event):
+        """Forward a per-file diagnostics change to websocket."""
+        connection.send_message(websocket_api.event_message(msg["id"], {
+            "type": "update",
+            "path": event.data["path"],
+            "result": event.data["result"],
+        }))
+
+    connection.subscriptions[msg["id"]] = hass.bus.async_listen(DIAGNOSTICS_EVENT, forward_diagnostics)
+    connection.send_result(msg["id"])
+
+    manager = hass.data.get(DOMAIN, {}).get("diagnostics")
+    connection.send_message(websocket_api.event_message(msg["id"], {
+        "type": "snapshot",
+        "files": manager.snapshot() if manager else {},
+    }))
+
+
+@websocket_api.require_admin
+@websocket_api.async_response
+@websocket_api.websocket_command({
+    vol.Required("type"): "blueprint_studio/subscribe_template",
+    vol.Required("template"): str,
+})
+async def websocket_subscribe_template(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]):
+    """Render a template once, then push a new result whenever a referenced state changes."""
+    manager = hass.data.get(DOMAIN, {}).get("templates")
+    if manager is None:
+        connection.send_error(msg["id"], "not_ready", "Blueprint Studio is not ready")
+        return
+
+    @callback
+    def forward_result(result: dict[str, Any]) -> None:
+        """Forward a (re-)rendered template result to websocket."""
+        connection.send_message(websocket_api.event_message(msg["id"], result))
+
+    try:
+        info = await manager.async_track(msg["template"], forward_result)
+    except TemplateError as err:
+        connection.send_error(msg["id"], websocket_api.const.ERR_TEMPLATE_ERROR, str(err))
+        return
+
+    connection.subscriptions[msg["id"]] = info.async_remove
+    connection.send_result(msg["id"])
+    info.async_refresh()
+
+
+@websocket_api.require_admin
+@websocket_api.async_response
+@websocket_api.websocket_command({
+    vol.Required("type"): "blueprint_studio/subscribe_entities",
+    vol.Optional("interval", default=FEED_INTERVAL_MS): vol.All(
+        int, vol.Range(min=FEED_MIN_INTERVAL_MS, max=FEED_MAX_INTERVAL_MS)
+    ),
+})
+async def websocket_subscribe_entities(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]):
+    """Subscribe to the entity list: a compact snapshot, then batched deltas every ``interval`` ms."""
+    index = hass.data.get(DOMAIN, {}).get("entities")
+    if index is None:
+        connection.send_error(msg["id"], "not_ready", "Blueprint Studio is not ready")
+        return
+
+    @callback
+    def forward_entities(payload: dict[str, Any]) -> None:
+        """Forward a snapshot or delta batch to websocket."""
+        connection.send_message(websocket_api.event_message(msg["id"], payload))
+
+    feed = EntityFeed(hass, index, forward_entities, msg["interval"])
+    connection.subscriptions[msg["id"]] = feed.async_stop
+    connection.send_result(msg["id"])
+    feed.async_start()
+
+
+@websocket_api.require_admin
+@websocket_api.async_response
+@websocket_api.websocket_command({
+    vol.Required("type"): "blueprint_studio/entity_attributes",
+    vol.Required("entity_ids"): vol.All([str], vol.Length(max=MAX_ATTRIBUTE_ENTITIES)),
+})
+async def websocket_entity_attributes(hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]):
+    """Return the current attributes of the requested entities (unknown ids are omitted)."""
+    index = hass.data.get(DOMAIN, {}).get("entities")
+    if index is None:
+        connection.send_error(msg["id"], "not_ready", "Blueprint Studio is not ready")
+        return
+    # Splice in the index's cached per-state encodings (unserializable values
+    # already turned into strings) instead of re-encoding the attributes
+    attributes = b",".join(
+        json_bytes(entity_id) + b":" + index.attributes_json(entity_id)
+        for entity_id in dict.fromkeys(msg["entity_ids"])
+        if hass.states.get(entity_id) is not None
+    )
+    connection.send_message(
+        json_bytes({"id": msg["id"], "type": "result", "success": True})[:-1]
+        + b',"result":{"attributes":{' + attributes + b"}}}"
+    )
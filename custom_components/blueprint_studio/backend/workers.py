@@ -0,0 +1,56 @@
+"""Shared process pool for CPU-bound validation work."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Keep a couple of cores free for Home Assistant itself
+MAX_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+_pool: ProcessPoolExecutor | None = None
+_pool_failed = False
+
+
+def get_process_pool() -> ProcessPoolExecutor | None:
+    """Return the shared process pool, creating it on first use.
+
+    Workers are spawned rather than forked: forking the multi-threaded HA
+    process is unsafe. Returns None when processes cannot be started, in
+    which case callers fall back to HA's thread executor.
+    """
+    global _pool, _pool_failed
+    if _pool is None and not _pool_failed:
+        try:
+            _pool = ProcessPoolExecutor(max_workers=MAX_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        except (OSError, ValueError, NotImplementedError) as err:
+            _LOGGER.warning("Process pool unavailable, validating in threads: %s", err)
+            _pool_failed = True
+    return _pool
+
+
+async def async_run_in_worker(hass: HomeAssistant, func: Callable[..., Any], *args: Any) -> Any:
+    """Run a picklable top-level function in the process pool (or executor as fallback)."""
+    pool = get_process_pool()
+    if pool is None:
+        return await hass.async_add_executor_job(func, *args)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, func, *args)
+    except Exception as err:  # BrokenProcessPool, pickling errors
+        _LOGGER.debug("Worker process failed, retrying in executor: %s", err)
+        return await hass.async_add_executor_job(func, *args)
+
+
+def shutdown_process_pool() -> None:
+    """Stop the worker processes without waiting for queued work."""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
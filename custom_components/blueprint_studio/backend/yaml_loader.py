@@ -0,0 +1,107 @@
+"""Shared YAML loaders that understand Home Assistant tags.
+
+The loader classes are built once at import time instead of per call, and use
+LibYAML's C parser when PyYAML was built with it (about 4x faster on
+large files). Tags are kept as their scalar text (``!secret foo`` -> ``"foo"``).
+"""
+from __future__ import annotations
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _BaseLoader
+    HAS_LIBYAML = True
+except ImportError:  # PyYAML built without LibYAML
+    from yaml import SafeLoader as _BaseLoader
+    HAS_LIBYAML = False
+
+# Tags accepted in configuration files
+HA_TAGS = (
+    "!include", "!include_dir_list", "!include_dir_named",
+    "!include_dir_merge_list", "!include_dir_merge_named",
+    "!secret", "!env_var", "!input",
+    "!lambda", "!extend",
+)
+# Tags accepted in blueprints and single automations
+BLUEPRINT_TAGS = ("!include", "!secret", "!env_var", "!input", "!lambda", "!extend")
+
+
+def _tag_as_scalar(loader, node):
+    return loader.construct_scalar(node)
+
+
+class HALoader(_BaseLoader):
+    """Safe loader for HA configuration YAML."""
+
+
+class BlueprintLoader(_BaseLoader):
+    """Safe loader for blueprints and automations."""
+
+
+for _tag in HA_TAGS:
+    HALoader.add_constructor(_tag, _tag_as_scalar)
+for _tag in BLUEPRINT_TAGS:
+    BlueprintLoader.add_constructor(_tag, _tag_as_scalar)
+
+
+def load_ha_yaml(content: str):
+    """Parse HA configuration YAML."""
+    return yaml.load(content, Loader=HALoader)
+
+
+def load_blueprint_yaml(content: str):
+    """Parse blueprint/automation YAML."""
+    return yaml.load(content, Loader=BlueprintLoader)
+
+
+class LocationIndex:
+    """1-based line numbers of top-level items and their keys, from node start marks.
+
+    Items are keyed by list index (automations.yaml, scenes.yaml) or by mapping
+    key (scripts.yaml), so rules can look positions up instead of scanning lines.
+    """
+
+    def __init__(self, node: yaml.Node | None = None) -> None:
+        """Index the top-level items of a composed document."""
+        self.items: dict = {}
+        self.keys: dict = {}
+        if isinstance(node, yaml.SequenceNode):
+            entries = [(index, child, child) for index, child in enumerate(node.value)]
+        elif isinstance(node, yaml.MappingNode):
+            entries = [
+                (key.value, key, value) for key, value in node.value
+                if isinstance(key, yaml.ScalarNode)
+            ]
+        else:
+            entries = []
+        for item, marker, value in entries:
+            self.items[item] = marker.start_mark.line + 1
+            if isinstance(value, yaml.MappingNode):
+                self.keys[item] = {
+                    key.value: key.start_mark.line + 1
+                    for key, _ in value.value
+                    if isinstance(key, yaml.ScalarNode)
+                }
+
+    def item_line(self, item) -> int:
+        """Return the line an item starts on (1 if unknown)."""
+        return self.items.get(item, 1)
+
+    def key_line(self, item, key: str) -> int:
+        """Return the line of ``key`` inside an item, falling back to the item's line."""
+        return self.keys.get(item, {}).get(key) or self.item_line(item)
+
+
+def load_ha_yaml_with_locations(content: str):
+    """Parse HA configuration YAML, returning ``(data, LocationIndex)``.
+
+    Composes the node graph once and constructs from it, so the index costs no
+    second parse.
+    """
+    loader = HALoader(content)
+    try:
+        node = loader.get_single_node()
+        data = loader.construct_document(node) if node is not None else None
+    finally:
+        loader.dispose()
+    return data, LocationIndex(node)
@@ -165,6 +165,63 @@ export async function getAuthToken() {
 // Module-level state to avoid duplicate ready listeners across retries
 let _wsConn = null;
 let _wsUnsubscribe = null;
+let _diagUnsubscribe = null;
+let _entitiesUnsubscribe = null;
+
+/** Toggle the error/warning badge class on any rendered tree item for path. */
+function _applyDiagnosticsBadge(path) {
+  const diag = state.diagnostics[path];
+  document.querySelectorAll(`.tree-item[data-path="${CSS.escape(path)}"]`).forEach((item) => {
+    item.classList.toggle("diag-error", !!(diag && diag.errors));
+    item.classList.toggle("diag-warning", !!(diag && !diag.errors && diag.warnings));
+    item.title = diag && diag.problems.length ? diag.problems.map((p) => (p.line ? `${p.line}: ` : "") + p.message).join("\n") : "";
+  });
+}
+
+async function _subscribeToDiagnostics(conn) {
+  if (_diagUnsubscribe) {
+    try { _diagUnsubscribe(); } catch (e) {}
+    _diagUnsubscribe = null;
+  }
+  try {
+    _diagUnsubscribe = await conn.subscribeMessage(
+      (event) => {
+        if (event.type === "snapshot") {
+          const previous = Object.keys(state.diagnostics);
+          state.diagnostics = event.files || {};
+          new Set([...previous, ...Object.keys(state.diagnostics)]).forEach(_applyDiagnosticsBadge);
+        } else if (event.type === "update") {
+          if (event.result && (event.result.errors || event.result.warnings)) {
+            state.diagnostics[event.path] = event.result;
+          } else {
+            delete state.diagnostics[event.path];
+          }
+          _applyDiagnosticsBadge(event.path);
+        }
+      },
+      { type: "blueprint_studio/subscribe_diagnostics" }
+    );
+  } catch (e) {
+    // Older backend without diagnostics — badges are simply not shown
+    console.warn("Blueprint Studio: diagnostics subscription unavailable", e);
+  }
+}
+
+async function _subscribeToEntities(conn) {
+  if (_entitiesUnsubscribe) {
+    try { _entitiesUnsubscribe(); } catch (e) {}
+    _entitiesUnsubscribe = null;
+  }
+  try {
+    _entitiesUnsubscribe = await conn.subscribeMessage(
+      (event) => eventBus.emit('entities:feed', event),
+      { type: "blueprint_studio/subscribe_entities" }
+    );
+  } catch (e) {
+    // Older backend without the entity feed — autocomplete keeps the fetched list
+    console.warn("Blueprint Studio: entity feed unavailable", e);
+  }
+}
 
 function _parentPath(path) {
   if (!path) return "";
@@ -301,6 +358,44 @@ async function _subscribeToUpdates(conn, retries = 0) {
   }
 }
 
+/**
+ * Fetch every page of a get_entities query.
+ * @param {Object} params - get_entities parameters (query, domains, ...)
+ * @returns {Promise<Array>} All matching entities, best matches first
+ */
+export async function fetchAllEntities(params = {}) {
+  const entities = [];
+  let offset = 0;
+  do {
+    const data = await fetchWithAuth(API_BASE, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ action: "get_entities", ...params, offset }),
+    });
+    entities.push(...(data.entities || []));
+    offset = data.next_offset;
+  } while (offset != null);
+  return entities;
+}
+
+/**
+ * Open a subscription on the HA websocket connection.
+ * @returns {Promise<Function|null>} Unsubscribe function, or null without a connection
+ */
+export async function subscribeMessage(callback, message) {
+  if (!_wsConn) return null;
+  return _wsConn.subscribeMessage(callback, message);
+}
+
+/**
+ * Send a command on the HA websocket connection.
+ * @returns {Promise<*>} The command result, or null without a connection
+ */
+export async function sendMessage(message) {
+  if (!_wsConn) return null;
+  return _wsConn.sendMessagePromise(message);
+}
+
 /**
  * Initialize WebSocket subscription for real-time updates.
  * Re-subscribes automatically whenever the HA connection reconnects.
@@ -320,10 +415,16 @@ export async function initWebSocketSubscription() {
       // and create a fresh one so updates resume without a page reload.
       if (_wsConn !== conn) {
         _wsConn = conn;
-        conn.addEventListener("ready", () => _subscribeToUpdates(conn));
+        conn.addEventListener("ready", () => {
+          _subscribeToUpdates(conn);
+          _subscribeToDiagnostics(conn);
+          _subscribeToEntities(conn);
+        });
       }
 
       await _subscribeToUpdates(conn);
+      _subscribeToDiagnostics(conn);
+      _subscribeToEntities(conn);
     } else {
       eventBus.emit('polling:start');
     }
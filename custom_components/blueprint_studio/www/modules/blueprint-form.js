@@ -4,7 +4,7 @@
  * as a ready-to-use automation YAML, then saves it to automations.yaml or a new file.
  */
 import { API_BASE } from './constants.js';
-import { fetchWithAuth } from './api.js';
+import { fetchWithAuth, fetchAllEntities } from './api.js';
 import { showToast } from './ui.js';
 import { eventBus } from './event-bus.js';
 import { state } from './state.js';
@@ -266,32 +266,22 @@ async function _renderForm(blueprintContent, bpInfo, preservedValues = {}) {
     let entities = [], devices = [], areas = [], labels = [], floors = [], themes = [], addons = [];
     try {
         if (needsEntities) {
-            const r = await fetchWithAuth(API_BASE, {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    action: 'get_entities', query: '',
-                    ...(entityDomains ? { domains: entityDomains } : {}),
-                    ...(ensureDomains ? { ensure_domains: ensureDomains } : {}),
-                    ...(entityDeviceClasses ? { device_classes: entityDeviceClasses } : {}),
-                }),
+            entities = await fetchAllEntities({
+                ...(entityDomains ? { domains: entityDomains } : {}),
+                ...(ensureDomains ? { ensure_domains: ensureDomains } : {}),
+                ...(entityDeviceClasses ? { device_classes: entityDeviceClasses } : {}),
             });
-            entities = r.entities || [];
         }
-        if (needsDevices) {
-            const r = await fetchWithAuth(`${API_BASE}?action=get_devices`);
+        const registrySections = [
+            needsDevices && 'devices', needsAreas && 'areas', needsLabels && 'labels', needsFloors && 'floors',
+        ].filter(Boolean);
+        if (registrySections.length) {
+            // One request; the browser revalidates it by ETag on later opens
+            const r = await fetchWithAuth(
+                `${API_BASE}?action=get_registry_snapshot&sections=${registrySections.join(',')}`);
             devices = r.devices || [];
-        }
-        if (needsAreas) {
-            const r = await fetchWithAuth(`${API_BASE}?action=get_areas`);
             areas = r.areas || [];
-        }
-        if (needsLabels) {
-            const r = await fetchWithAuth(`${API_BASE}?action=get_labels`);
             labels = r.labels || [];
-        }
-        if (needsFloors) {
-            const r = await fetchWithAuth(`${API_BASE}?action=get_floors`);
             floors = r.floors || [];
         }
         if (needsThemes) {
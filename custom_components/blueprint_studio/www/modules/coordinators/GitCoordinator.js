@@ -41,6 +41,7 @@ let functions = {
     updateGitPanel: null,
     updateGiteaPanel: null,
     showDiffModal: null,
+    scheduleGitGutterUpdate: null,
     toggleGitGroup: null,
     stageSelectedFiles: null,
     stageAllFiles: null,
@@ -484,10 +485,24 @@ export function initGitCoordinator(callbacks) {
         if (functions.applyVersionControlVisibility) functions.applyVersionControlVisibility();
     });
 
+    // Editor gutter markers against HEAD
+    eventBus.on("git:gutter-update", (data) => {
+        if (functions.scheduleGitGutterUpdate) functions.scheduleGitGutterUpdate(data.editor, data.path);
+    });
+
     // UI Updates
     eventBus.on("git:refresh", () => {
         if (functions.updateGitPanel) functions.updateGitPanel();
         if (functions.updateGiteaPanel) functions.updateGiteaPanel();
+        // HEAD may have moved (commit, pull, checkout); unchanged buffers only resend their hash
+        if (functions.scheduleGitGutterUpdate) {
+            if (state.splitView.enabled) {
+                functions.scheduleGitGutterUpdate(state.primaryEditor, state.splitView.primaryActiveTab?.path);
+                functions.scheduleGitGutterUpdate(state.secondaryEditor, state.splitView.secondaryActiveTab?.path);
+            } else {
+                functions.scheduleGitGutterUpdate(state.editor, state.activeTab?.path);
+            }
+        }
     });
 
     // Toggle git panel collapse via keyboard shortcut (Ctrl+Shift+G)
@@ -120,6 +120,7 @@ import {
 
 import {
   showDiffModal as showDiffModalImpl,
+  scheduleGitGutterUpdate as scheduleGitGutterUpdateImpl,
   showGitHistory as showGitHistoryImpl,
   showGitCommitDiff as showGitCommitDiffImpl
 } from '../git-diff.js';
@@ -577,6 +578,7 @@ export function initializeEventHandlers() {
     updateGitPanel: updateGitPanelImpl,
     updateGiteaPanel: updateGiteaPanelImpl,
     showDiffModal: showDiffModalImpl,
+    scheduleGitGutterUpdate: scheduleGitGutterUpdateImpl,
     toggleGitGroup: toggleGitGroupImpl,
     stageSelectedFiles: stageSelectedFilesImpl,
     stageAllFiles: stageAllFilesImpl,
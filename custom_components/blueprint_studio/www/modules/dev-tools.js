@@ -1,6 +1,6 @@
 /** DEV-TOOLS.JS | Purpose: HA Developer Tools floating panel — Actions / Template / States / Config */
 import { API_BASE } from './constants.js';
-import { fetchWithAuth } from './api.js';
+import { fetchWithAuth, fetchAllEntities, subscribeMessage } from './api.js';
 import { HA_ENTITIES, HA_SERVICES } from './ha-autocomplete.js';
 
 const PANEL_ID = 'bps-dev-tools-panel';
@@ -459,29 +459,70 @@ function _initTemplate(panel) {
   const renderBtn = pane.querySelector('.bdt-render-btn');
   const clearBtn = pane.querySelector('.bdt-clear-btn');
   let timer = null;
+  let unsubscribe = null;
+  let generation = 0;
+
+  function showResult(data) {
+    result.textContent = data.success
+      ? data.result + (data.truncated ? '\n… (output truncated)' : '')
+      : (data.error || 'Unknown error');
+    result.className = `bdt-template-result ${data.success ? 'bdt-ok' : 'bdt-err'}`;
+  }
+
+  function stopLive() {
+    generation++;
+    if (unsubscribe) {
+      const unsub = unsubscribe;
+      unsubscribe = null;
+      Promise.resolve(unsub()).catch(() => {});
+    }
+  }
+
+  async function renderOnce(tmpl) {
+    const data = await fetchWithAuth(API_BASE, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ action: 'render_template', template: tmpl }),
+    });
+    showResult(data);
+  }
 
   async function render() {
     const tmpl = input.value.trim();
+    stopLive();
     if (!tmpl) { result.textContent = '— output appears here —'; result.className = 'bdt-template-result bdt-placeholder'; return; }
     result.className = 'bdt-template-result bdt-loading';
     result.textContent = 'Rendering…';
+    const current = generation;
     try {
-      const data = await fetchWithAuth(API_BASE, {
-        method: 'POST',
-        headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ action: 'render_template', template: tmpl }),
-      });
-      result.textContent = data.success ? data.result : (data.error || 'Unknown error');
-      result.className = `bdt-template-result ${data.success ? 'bdt-ok' : 'bdt-err'}`;
+      // Live preview: the backend re-renders only when a referenced state changes
+      const unsub = await subscribeMessage(data => {
+        if (current === generation) showResult(data);
+      }, { type: 'blueprint_studio/subscribe_template', template: tmpl });
+      if (!unsub) { await renderOnce(tmpl); return; }
+      if (current !== generation) { Promise.resolve(unsub()).catch(() => {}); return; }
+      unsubscribe = unsub;
     } catch (e) {
-      result.textContent = e.message;
-      result.className = 'bdt-template-result bdt-err';
+      if (current !== generation) return;
+      if (e && e.code === 'unknown_command') {
+        // Older backend without live previews
+        try { await renderOnce(tmpl); } catch (err) { showResult({ success: false, error: err.message }); }
+        return;
+      }
+      showResult({ success: false, error: (e && e.message) || String(e) });
     }
   }
 
+  // Stop tracking once the panel is closed
+  const observer = new MutationObserver(() => {
+    if (!panel.isConnected) { stopLive(); observer.disconnect(); }
+  });
+  observer.observe(document.body, { childList: true });
+
   input.addEventListener('input', () => { clearTimeout(timer); timer = setTimeout(render, 600); });
   renderBtn.addEventListener('click', render);
   clearBtn.addEventListener('click', () => {
+    stopLive();
     input.value = '';
     result.textContent = '— output appears here —';
     result.className = 'bdt-template-result bdt-placeholder';
@@ -522,11 +563,7 @@ function _initStates(panel) {
   async function load() {
     tbody.innerHTML = '<tr><td colspan="3" class="bdt-states-loading">Loading…</td></tr>';
     try {
-      const data = await fetchWithAuth(API_BASE, {
-        method: 'POST', headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ action: 'get_entities', with_attributes: true }),
-      });
-      allEntities = data.entities || [];
+      allEntities = await fetchAllEntities({ with_attributes: true });
       const domains = [...new Set(allEntities.map(e => e.entity_id.split('.')[0]))].sort();
       domainFilter.innerHTML = '<option value="">All domains</option>' +
         domains.map(d => `<option value="${_esc(d)}">${_esc(d)}</option>`).join('');
@@ -2,7 +2,7 @@
 import { state, elements } from './state.js';
 import { eventBus } from './event-bus.js';
 import { validateYaml, validateByFileType } from './file-operations.js';
-import { homeAssistantHint, HA_ENTITIES } from './ha-autocomplete.js';
+import { homeAssistantHint, HA_ENTITIES, fetchEntityAttributes } from './ha-autocomplete.js';
 import { enableSplitView, disableSplitView } from './split-view.js';
 import { showToast } from './ui.js';
 
@@ -443,7 +443,11 @@ export function createEditor(container = null, isPrimary = true) {
             if (entity) {
               e.preventDefault();
               e.codemirrorIgnore = true;
-              _showEntityPopup(entity, e.clientX, e.clientY);
+              const { clientX, clientY } = e;
+              // The entity list carries no attributes; fetch them for this one entity
+              fetchEntityAttributes([entityId]).then((attrs) => {
+                _showEntityPopup({ ...entity, attributes: attrs[entityId] || entity.attributes }, clientX, clientY);
+              });
               return;
             }
             break;
@@ -784,6 +788,7 @@ export function handleEditorChange(editor = null) {
   eventBus.emit('ui:update-toolbar-state');
   eventBus.emit('ui:refresh-tabs');
   eventBus.emit('ui:refresh-tree');
+  eventBus.emit('git:gutter-update', { editor: targetEditor, path: targetTab.path });
 
   // Handle auto-save
   eventBus.emit('file:trigger-autosave');
@@ -850,6 +850,13 @@ export function createTreeItem(name, depth, isFolder, isExpanded, itemPath = nul
   label.textContent = name;
   item.appendChild(label);
 
+  // Workspace diagnostics badge (kept current by the diagnostics subscription)
+  const diag = !isFolder && itemPath ? state.diagnostics[itemPath] : null;
+  if (diag) {
+    item.classList.add(diag.errors ? "diag-error" : "diag-warning");
+    item.title = diag.problems.map((p) => (p.line ? `${p.line}: ` : "") + p.message).join("\n");
+  }
+
   // Check if this is a symlink (passed directly from renderFileTree)
   // Symlink indicator
   if (symlinkTarget !== null) {
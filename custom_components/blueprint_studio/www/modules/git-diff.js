@@ -1308,6 +1308,89 @@ export async function showDiffModal(path) {
   }
 }
 
+// Gutter markers for the open buffer against HEAD, computed server-side by git_line_diff
+const GIT_GUTTER_DELAY_MS = 400;
+const _gitGutters = new WeakMap();
+
+/**
+ * Schedule a refresh of an editor's git change markers (debounced per editor)
+ */
+export function scheduleGitGutterUpdate(editor, path) {
+  if (!editor) return;
+  let gutter = _gitGutters.get(editor);
+  if (!gutter) {
+    gutter = { timer: null, handles: [], path: null, content: null, hash: null, seq: 0 };
+    _gitGutters.set(editor, gutter);
+  }
+  clearTimeout(gutter.timer);
+  gutter.timer = setTimeout(() => _updateGitGutter(editor, path, gutter), GIT_GUTTER_DELAY_MS);
+}
+
+async function _requestLineDiff(path, body) {
+  return fetchWithAuth(API_BASE, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ action: "git_line_diff", path, ...body }),
+  });
+}
+
+async function _updateGitGutter(editor, path, gutter) {
+  const seq = ++gutter.seq;
+  if (!path || !isGitEnabled() || !gitState.isInitialized) {
+    _clearGitGutter(editor, gutter);
+    return;
+  }
+  const content = editor.getValue();
+  try {
+    // Unchanged buffer: send only its hash; the server answers from cache unless HEAD moved
+    let data = null;
+    if (gutter.path === path && gutter.content === content && gutter.hash) {
+      data = await _requestLineDiff(path, { hash: gutter.hash });
+    }
+    if (!data || data.needs_content) {
+      data = await _requestLineDiff(path, { content });
+    }
+    if (seq !== gutter.seq) return;
+    gutter.path = path;
+    gutter.content = content;
+    gutter.hash = data.success ? data.hash : null;
+    _renderGitGutter(editor, gutter, data);
+  } catch (e) {
+    if (seq === gutter.seq) _clearGitGutter(editor, gutter);
+  }
+}
+
+function _renderGitGutter(editor, gutter, data) {
+  editor.operation(() => {
+    _clearGitGutter(editor, gutter);
+    // Untracked or ignored files get no markers
+    if (!data.success || !data.tracked) return;
+    const last = editor.lastLine();
+    const mark = (line, className) => {
+      if (line < 0 || line > last) return;
+      gutter.handles.push([editor.addLineClass(line, "gutter", className), className]);
+    };
+    // Ranges are 1-based and inclusive; a deletion is reported as the line it follows
+    for (const [start, end] of data.added) {
+      for (let line = start; line <= end; line++) mark(line - 1, "git-gutter-added");
+    }
+    for (const [start, end] of data.modified) {
+      for (let line = start; line <= end; line++) mark(line - 1, "git-gutter-modified");
+    }
+    for (const after of data.deleted) {
+      if (after > 0) mark(after - 1, "git-gutter-deleted");
+      else mark(0, "git-gutter-deleted-above");
+    }
+  });
+}
+
+function _clearGitGutter(editor, gutter) {
+  for (const [handle, className] of gutter.handles) {
+    editor.removeLineClass(handle, "gutter", className);
+  }
+  gutter.handles = [];
+}
+
 /**
  * Show git commit history
  */
@@ -1393,6 +1476,49 @@ export async function showGitHistory() {
   }
 }
 
+/**
+ * Colorize a unified patch for the commit diff modal
+ */
+function _renderCommitPatch(patch) {
+  return patch.split("\n").map(line => {
+    let color = "inherit";
+    if (line.startsWith("+") && !line.startsWith("+++")) color = "var(--success-color)";
+    else if (line.startsWith("-") && !line.startsWith("---")) color = "var(--error-color)";
+    else if (line.startsWith("@@")) color = "var(--accent-color)";
+
+    return `<div style="color: ${color}; white-space: pre-wrap; font-family: monospace; font-size: 12px; line-height: 1.4;">${_escapeHtml(line)}</div>`;
+  }).join("");
+}
+
+/**
+ * Load the patch of one file in a commit into its container (on demand)
+ */
+async function _loadCommitFilePatch(commit, file, container, force = false) {
+  container.innerHTML = '<div style="color: var(--text-muted); padding: 8px;">Loading...</div>';
+  try {
+    const data = await fetchWithAuth(API_BASE, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ action: "git_diff_commit", hash: commit.hash, path: file.path, old_path: file.old_path, force }),
+    });
+    if (!data.success) {
+      container.innerHTML = `<div style="color: var(--error-color); padding: 8px;">${_escapeHtml(data.message || "Failed to load diff")}</div>`;
+    } else if (data.binary) {
+      container.innerHTML = '<div style="color: var(--text-muted); padding: 8px;">Binary file not shown</div>';
+    } else if (data.too_large) {
+      container.innerHTML = `<div style="color: var(--text-muted); padding: 8px;">File is too large to diff (${Math.round(data.size / 1024)} KB). <a href="#" class="git-commit-load-anyway">Load anyway</a></div>`;
+      container.querySelector(".git-commit-load-anyway").addEventListener("click", (e) => {
+        e.preventDefault();
+        _loadCommitFilePatch(commit, file, container, true);
+      });
+    } else {
+      container.innerHTML = _renderCommitPatch(data.patch) || '<div style="color: var(--text-muted); padding: 8px;">No textual changes</div>';
+    }
+  } catch (e) {
+    container.innerHTML = `<div style="color: var(--error-color); padding: 8px;">${_escapeHtml(e.message)}</div>`;
+  }
+}
+
 /**
  * Show diff for a specific commit
  */
@@ -1410,15 +1536,19 @@ export async function showGitCommitDiff(commit) {
       // We'll reuse the modal but with a large diff view
       const date = new Date(commit.timestamp * 1000).toLocaleString();
 
-      // Format diff with some basic coloring
-      const lines = data.diff.split("\n");
-      const coloredDiff = lines.map(line => {
-        let color = "inherit";
-        if (line.startsWith("+") && !line.startsWith("+++")) color = "var(--success-color)";
-        else if (line.startsWith("-") && !line.startsWith("---")) color = "var(--error-color)";
-        else if (line.startsWith("@@")) color = "var(--accent-color)";
-
-        return `<div style="color: ${color}; white-space: pre-wrap; font-family: monospace; font-size: 12px; line-height: 1.4;">${line.replace(/</g, "&lt;").replace(/>/g, "&gt;")}</div>`;
+      // Summary first — each file's hunks are fetched when it is expanded
+      const files = data.files || [];
+      const fileListHtml = files.map((file, idx) => {
+        const label = file.old_path && file.old_path !== file.path ? `${file.old_path} → ${file.path}` : file.path;
+        const counts = file.binary ? "binary" : `<span style="color: var(--success-color);">+${file.additions}</span> <span style="color: var(--error-color);">-${file.deletions}</span>`;
+        return `
+          <details class="git-commit-file" data-index="${idx}" style="border-bottom: 1px solid var(--border-color);">
+            <summary style="cursor: pointer; padding: 6px 0; font-family: monospace; font-size: 12px;">
+              <strong>${_escapeHtml(file.status)}</strong> ${_escapeHtml(label)} <span style="float: right;">${counts}</span>
+            </summary>
+            <div class="git-commit-file-body" style="padding: 4px 0 8px;"></div>
+          </details>
+        `;
       }).join("");
 
       // Show commit diff modal
@@ -1433,7 +1563,7 @@ export async function showGitCommitDiff(commit) {
               </div>
             </div>
             <div style="flex: 1; overflow: auto; background: var(--bg-primary); padding: 12px; border-radius: 4px; border: 1px solid var(--border-color);">
-              ${coloredDiff || '<div style="color: var(--text-muted); text-align: center; padding: 20px;">No changes to display in this commit</div>'}
+              ${fileListHtml || '<div style="color: var(--text-muted); text-align: center; padding: 20px;">No changes to display in this commit</div>'}
             </div>
           </div>
         `,
@@ -1447,6 +1577,21 @@ export async function showGitCommitDiff(commit) {
         modal.style.width = "min(900px, 95vw)";
       }
 
+      document.querySelectorAll(".git-commit-file").forEach(el => {
+        const file = files[Number(el.getAttribute("data-index"))];
+        const body = el.querySelector(".git-commit-file-body");
+        el.addEventListener("toggle", () => {
+          if (el.open && !body.dataset.loaded) {
+            body.dataset.loaded = "true";
+            _loadCommitFilePatch(commit, file, body);
+          }
+        });
+      });
+      // Small commits: expand the first few files right away
+      document.querySelectorAll(".git-commit-file").forEach((el, idx) => {
+        if (idx < 3) el.open = true;
+      });
+
       // Wait for user to close the modal
       const result = await diffPromise;
 
@@ -11,6 +11,7 @@ import {
   setButtonLoading
 } from './ui.js';
 import { t } from './translations.js';
+import { formatBytes } from './utils.js';
 
 /**
  * Check if Git integration is enabled
@@ -19,6 +20,17 @@ export function isGitEnabled() {
   return localStorage.getItem("gitIntegrationEnabled") !== "false";
 }
 
+/**
+ * Warn about large or binary files that a commit or push response reports as committed
+ */
+export function warnLargeFiles(data) {
+  const files = data.large_files || [];
+  if (!files.length) return;
+  const names = files.slice(0, 3).map(f => `${f.path} (${formatBytes(f.size)})`).join(", ");
+  const more = files.length > 3 ? ` +${files.length - 3}` : "";
+  showToast(t("toast.git_large_files_committed", { files: names + more }), "warning", 8000);
+}
+
 /**
  * Check git status if enabled (wrapper for both Git and Gitea)
  */
@@ -525,6 +537,7 @@ export async function gitCommit(commitMessage) {
     });
     if (data.success) {
       showToast(t("toast.git_commit_success"), "success");
+      warnLargeFiles(data);
       await gitStatus();
       return true;
     }
@@ -947,6 +960,7 @@ export async function gitPush() {
       setButtonLoading(elements.btnGitPush, false);
       if (data.success) {
         showToast(t("toast.git_push_success"), "success");
+        warnLargeFiles(data);
         await gitStatus();
       } else {
         showToast(t("toast.gitea_push_failed", { error: data.message }), "error");
@@ -13,7 +13,8 @@ import {
   gitUnstage,
   gitGetRemotes,
   gitCleanLocks,
-  gitGetConflictFiles
+  gitGetConflictFiles,
+  warnLargeFiles
 } from './git-operations.js';
 import {
   updateGiteaPanel as updateGiteaPanelUI,
@@ -119,6 +120,7 @@ export async function giteaPush() {
 
       if (data.success) {
         showToast(t("toast.git_push_success"), "success");
+        warnLargeFiles(data);
         await giteaStatus();
       } else {
         showToast(t("toast.gitea_push_failed", { error: data.message || data.error }), "error");
@@ -212,6 +214,7 @@ export async function giteaCommit() {
 
     if (data.success) {
       showToast(t("toast.git_commit_success"), "success");
+      warnLargeFiles(data);
       await giteaStatus();
     }
   } catch (error) {
@@ -311,6 +314,7 @@ export async function giteaForcePush() {
       hideGlobalLoading();
       if (data.success) {
         showToast(t("toast.git_push_success"), "success");
+        warnLargeFiles(data);
         await giteaStatus();
       }
     } catch (error) {
@@ -223,15 +223,18 @@ export async function githubDeviceFlowStart(clientId) {
   }
 }
 
-export async function githubDeviceFlowPoll(clientId, deviceCode) {
+export async function githubDeviceFlowPoll(clientId, deviceCode, wait = 0) {
   try {
+    // The backend polls GitHub itself; with `wait` the request is held open
+    // until the login resolves or the wait elapses (long-poll).
     const data = await fetchWithAuth(API_BASE, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({
         action: "github_device_flow_poll",
         client_id: clientId,
-        device_code: deviceCode
+        device_code: deviceCode,
+        wait
       }),
     });
 
@@ -318,16 +321,14 @@ export async function showGithubDeviceFlowLogin() {
       resolve(result);
     };
 
-    // Start polling
-    let pollInterval = (flowData.interval || 5) * 1000;
-    if (pollInterval < 5000) pollInterval = 5000; // Safety minimum
-    const maxPolls = Math.floor(flowData.expiresIn / (pollInterval / 1000)) || 180; // Default ~15 mins
-    let pollCount = 0;
+    // Start long-polling; the backend honours GitHub's interval/slow_down
+    const LONG_POLL_WAIT = 25;
+    const deadline = Date.now() + (flowData.expiresIn || 900) * 1000;
 
     const pollLoop = async () => {
-      pollCount++;
-
-      if (pollCount > maxPolls) {
+      // Timer that started this run; a newer schedulePoll() or a close supersedes it
+      const myId = pollTimerId;
+      if (Date.now() > deadline) {
         const statusDiv = document.getElementById("device-flow-status");
         if (statusDiv) {
           statusDiv.innerHTML = `
@@ -340,7 +341,9 @@ export async function showGithubDeviceFlowLogin() {
         return;
       }
 
-      const result = await githubDeviceFlowPoll(finalClientId, flowData.deviceCode);
+      const result = await githubDeviceFlowPoll(finalClientId, flowData.deviceCode, LONG_POLL_WAIT);
+      // The modal was closed (or "check now" took over) while the request was held
+      if (activePollTimer !== myId) return;
 
       if (result.success && result.status === "authorized") {
         const statusDiv = document.getElementById("device-flow-status");
@@ -359,18 +362,19 @@ export async function showGithubDeviceFlowLogin() {
         showToast(t("toast.github_login_denied"), "error");
         setTimeout(() => closeDeviceFlow(false), 1000);
       } else {
-        // Pending or slow_down
-        if (result.status === "slow_down") {
-          // Increase interval by 5 seconds if asked to slow down
-          pollInterval += 5000;
-        }
-        // Continue polling
-        activePollTimer = setTimeout(pollLoop, pollInterval);
+        // Still pending: re-issue the long-poll (short pause if it failed fast)
+        schedulePoll(result.status === "pending" ? 0 : 5000);
       }
     };
 
+    let pollTimerId = null;
+    const schedulePoll = (delay) => {
+      pollTimerId = setTimeout(pollLoop, delay);
+      activePollTimer = pollTimerId;
+    };
+
     // Start the loop
-    activePollTimer = setTimeout(pollLoop, pollInterval);
+    schedulePoll(0);
 
     const overlayClickHandler = (e) => {
       if (e.target === modalOverlay) {
@@ -420,9 +424,11 @@ export async function showGithubDeviceFlowLogin() {
                 } else if (result.status === "pending") {
                   if (statusDiv) statusDiv.querySelector('p').textContent = t("toast.github_waiting");
                   showToast(t("toast.github_waiting"), "info", 3000);
+                  schedulePoll(0);
                 } else if (result.status === "slow_down") {
                   if (statusDiv) statusDiv.querySelector('p').textContent = t("toast.github_slow_down");
                   showToast(t("toast.github_slow_down"), "warning", 3000);
+                  schedulePoll(0);
                 } else if (result.status === "expired") {
                   showToast(t("toast.github_login_expired"), "error");
                   setTimeout(() => closeDeviceFlow(false), 1000);
@@ -931,6 +937,23 @@ export async function showGitExclusions() {
 // Git Settings Dialog
 // ============================================
 
+/**
+ * Describe the last repository maintenance run (git status timings before/after)
+ */
+function formatMaintenanceReport(maintenance) {
+  if (!maintenance.enabled) {
+    return `<span class="material-icons">info</span><span>Maintenance is off.</span>`;
+  }
+  if (!maintenance.last_run) {
+    return `<span class="material-icons">schedule</span><span>First run scheduled.</span>`;
+  }
+  const when = new Date(maintenance.last_run * 1000).toLocaleString();
+  const timing = maintenance.before_ms != null && maintenance.after_ms != null
+    ? ` git status: ${maintenance.before_ms} ms → ${maintenance.after_ms} ms.`
+    : "";
+  return `<span class="material-icons">speed</span><span>Last run ${when}.${timing}</span>`;
+}
+
 export async function showGitSettings() {
   // Get current remotes
   const remotes = await gitGetRemotes();
@@ -945,6 +968,16 @@ export async function showGitSettings() {
   const savedUsername = credentialsData.has_credentials ? credentialsData.username : "";
   const hasCredentials = credentialsData.has_credentials;
 
+  // Repository maintenance state (read only, nothing is run)
+  let maintenance = { success: false, enabled: false };
+  try {
+    maintenance = await fetchWithAuth(API_BASE, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ action: "git_maintenance", run: false }),
+    });
+  } catch (e) {}
+
   // Check if OAuth Client ID is saved
   const savedClientId = localStorage.getItem("githubOAuthClientId") || "";
   const hasOAuthSetup = savedClientId.length > 0;
@@ -1100,6 +1133,20 @@ export async function showGitSettings() {
         </div>
       </div>
 
+      ${maintenance.success ? `
+      <div class="git-settings-section">
+        <div class="git-settings-label">Repository Maintenance</div>
+        <label for="git-maintenance-enabled" style="display: flex; align-items: center; padding: 12px; background: var(--bg-tertiary); border-radius: 6px; cursor: pointer; margin-bottom: 12px; transition: background 0.15s;">
+          <input type="checkbox" id="git-maintenance-enabled" ${maintenance.enabled ? 'checked' : ''} style="margin-right: 12px; width: 18px; height: 18px; cursor: pointer; accent-color: var(--accent-color);" />
+          <div style="flex: 1;">
+            <div style="font-weight: 500; font-size: 14px; margin-bottom: 2px;">Speed up git status</div>
+            <div style="font-size: 12px; color: var(--text-secondary);">Enables the untracked cache, split index and fsmonitor, and runs commit-graph and git maintenance every 6 hours</div>
+          </div>
+        </label>
+        <div class="git-settings-info" id="git-maintenance-report">${formatMaintenanceReport(maintenance)}</div>
+      </div>
+      ` : ''}
+
       <div class="git-settings-section">
         <div class="git-settings-label">Troubleshooting</div>
         <div class="git-settings-info">
@@ -1213,6 +1260,27 @@ export async function showGitSettings() {
       await showCreateGithubRepoDialog();
     }, { once: true });
   }
+  const maintenanceToggle = document.getElementById("git-maintenance-enabled");
+  if (maintenanceToggle) {
+    maintenanceToggle.addEventListener("change", async () => {
+      const report = document.getElementById("git-maintenance-report");
+      maintenanceToggle.disabled = true;
+      if (maintenanceToggle.checked && report) report.textContent = "Running maintenance...";
+      try {
+        const data = await fetchWithAuth(API_BASE, {
+          method: "POST",
+          headers: { "Content-Type": "application/json" },
+          body: JSON.stringify({ action: "git_maintenance", enable: maintenanceToggle.checked }),
+        });
+        if (report) report.innerHTML = formatMaintenanceReport(data);
+      } catch (error) {
+        maintenanceToggle.checked = !maintenanceToggle.checked;
+        showToast(t("toast.git_error", { error: error.message }), "error");
+      } finally {
+        maintenanceToggle.disabled = false;
+      }
+    });
+  }
 
   // Attach event handlers for Remove Remote buttons
   const removeRemoteBtns = modalBody.querySelectorAll('.remove-remote-btn');
@@ -1,20 +1,71 @@
 /** HA-AUTOCOMPLETE.JS | Purpose: Home Assistant entity autocomplete and YAML schema hints. */
 import { API_BASE, HA_SCHEMA } from './constants.js';
-import { fetchWithAuth } from './api.js';
+import { fetchWithAuth, fetchAllEntities, sendMessage } from './api.js';
+import { eventBus } from './event-bus.js';
 
 export let HA_ENTITIES = [];
 export let HA_SERVICES = [];
 
+// True once the websocket entity feed has delivered a snapshot
+let _entityFeedLive = false;
+
+function _entityFromFeed(entityId, compact) {
+  return {
+    entity_id: entityId,
+    friendly_name: compact.n ?? null,
+    icon: compact.i ?? null,
+    state: compact.s,
+    device_class: compact.d ?? null,
+  };
+}
+
+/**
+ * Apply a blueprint_studio/subscribe_entities message: a snapshot replaces
+ * the list, a delta updates changed entities and drops removed ones.
+ */
+function applyEntityFeed(event) {
+  if (event.type === "snapshot") {
+    HA_ENTITIES = Object.entries(event.entities || {}).map(([id, c]) => _entityFromFeed(id, c));
+    _entityFeedLive = true;
+  } else if (event.type === "delta") {
+    const removed = new Set(event.removed || []);
+    const changed = event.changed || {};
+    const next = [];
+    for (const entity of HA_ENTITIES) {
+      const id = entity.entity_id;
+      if (removed.has(id)) continue;
+      if (id in changed) {
+        next.push(_entityFromFeed(id, changed[id]));
+        delete changed[id];
+      } else {
+        next.push(entity);
+      }
+    }
+    for (const [id, c] of Object.entries(changed)) next.push(_entityFromFeed(id, c));
+    HA_ENTITIES = next;
+  }
+}
+
+eventBus.on('entities:feed', applyEntityFeed);
+
+/**
+ * Fetch current attributes for a few entities over websocket.
+ * @returns {Promise<Object>} entity_id → attributes (empty without a connection)
+ */
+export async function fetchEntityAttributes(entityIds) {
+  try {
+    const result = await sendMessage({ type: "blueprint_studio/entity_attributes", entity_ids: entityIds });
+    return (result && result.attributes) || {};
+  } catch (e) {
+    return {};
+  }
+}
+
 export async function loadEntities() {
   try {
-    const data = await fetchWithAuth(API_BASE, {
-      method: "POST",
-      headers: { "Content-Type": "application/json" },
-      body: JSON.stringify({ action: "get_entities" }),
-    });
-    if (data.entities) {
-      HA_ENTITIES = data.entities;
-    }
+    const entities = await fetchAllEntities();
+    // The websocket snapshot may have arrived first and is at least as current
+    if (!_entityFeedLive) HA_ENTITIES = entities;
   } catch (e) {
     /*console.log*/ void("Failed to load entities for autocomplete", e);
   }
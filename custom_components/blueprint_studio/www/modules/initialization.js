@@ -241,7 +241,7 @@ export async function init() {
     });
 
     // Non-blocking git status — don't hold up page load
-    // First check uses fetch=false (local only); polling will fetch from remote in ~30s
+    // First check uses fetch=false (local only); the backend fetch scheduler keeps remotes fresh
     checkGitStatusIfEnabled(false, true).catch(() => {});
 
     updateShowHiddenButton();
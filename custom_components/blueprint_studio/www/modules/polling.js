@@ -87,7 +87,7 @@ export async function checkFileTreeSnapshot() {
 /**
  * Starts polling for git status and file updates
  * Polls every 10 seconds when window is focused (optimized)
- * Fetches from remote every 30 seconds (every 3rd poll) - Balanced mode
+ * Remote fetches are done by the backend scheduler shared by all clients
  */
 export function startGitStatusPolling() {
   // Clear any existing interval
@@ -104,15 +104,13 @@ export function startGitStatusPolling() {
     if (document.visibilityState !== 'visible' || !document.hasFocus()) return;
 
     pollCount++;
-    // Fetch from remote every 3rd poll (30 seconds) - Balanced mode
-    const shouldFetch = (pollCount % 3 === 0);
 
     try {
       checkFileUpdates(); // Check for external file changes
 
       // Poll GitHub/Gitea if enabled
       if (state.gitIntegrationEnabled || state.giteaIntegrationEnabled) {
-        eventBus.emit('git:status-check', { fetch: shouldFetch, silent: true });
+        eventBus.emit('git:status-check', { fetch: false, silent: true });
       }
     } catch (error) {
       // Silently fail
@@ -182,6 +182,9 @@ export const state = {
     loadingDirectories: new Set(), // paths currently being fetched
   },
 
+  // Workspace YAML diagnostics pushed by the backend: path -> {errors, warnings, problems}
+  diagnostics: {},
+
   // SSH Host field defaults for new hosts (Phase 1)
   // Existing hosts will be migrated to include these fields with defaults
   // authType: 'password' | 'key' - authentication method
@@ -0,0 +1,279 @@
+"""Validator benchmarks on synthetic Home Assistant configs.
+
+Run directly: ``python tests/bench_validators.py`` (not collected by pytest).
+Times the validators and blueprint generators at 10, 100, 1,000 and 5,000
+items; set ``$BENCH_OUTPUT`` to a path to write the results there as JSON.
+Each size also checks the diagnostics themselves, and growth from 1,000 to
+5,000 items must stay close to linear. Point ``$BENCH_BASELINE`` at an earlier
+results file to fail on slowdowns beyond ``$BENCH_TOLERANCE`` (default 2x).
+"""
+import importlib
+import importlib.util
+import json
+import os
+import pathlib
+import platform
+import sys
+import time
+import unittest
+
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+BACKEND_PATH = ROOT / "custom_components" / "blueprint_studio" / "backend"
+
+SIZES = (10, 100, 1000, 5000)
+# 5x more items may cost at most this much more than 5x the time
+SCALING_SLACK = 3.0
+# Timings below this are too noisy to compare
+MIN_COMPARABLE_SECONDS = 0.005
+# Already quadratic (one whole-body replace per entity); only the baseline applies
+KNOWN_SUPERLINEAR = {"convert_automation_to_blueprint"}
+
+
+def load_backend():
+    """Import the backend modules as a standalone package (no Home Assistant needed)."""
+    spec = importlib.util.spec_from_file_location(
+        "blueprint_studio_backend", BACKEND_PATH / "__init__.py", submodule_search_locations=[str(BACKEND_PATH)]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = package
+    spec.loader.exec_module(package)
+    return (
+        importlib.import_module(f"{spec.name}.ai_validators"),
+        importlib.import_module(f"{spec.name}.ai_generators"),
+    )
+
+
+def automations_yaml(count):
+    """Automations list; every 10th automation lacks an id."""
+    items = []
+    for n in range(count):
+        id_line = "" if n % 10 == 0 else f"- id: '{1700000000000 + n}'\n  "
+        items.append(
+            f"{id_line or '- '}alias: Hallway motion {n}\n"
+            f"  description: Light the hallway when motion {n} is detected\n"
+            f"  mode: restart\n"
+            f"  triggers:\n"
+            f"  - trigger: state\n"
+            f"    entity_id: binary_sensor.motion_{n}\n"
+            f"    to: 'on'\n"
+            f"  conditions:\n"
+            f"  - condition: template\n"
+            f"    value_template: \"{{{{ is_state('sun.sun', 'below_horizon') }}}}\"\n"
+            f"  actions:\n"
+            f"  - action: light.turn_on\n"
+            f"    target:\n"
+            f"      entity_id: light.hallway_{n}\n"
+            f"    data:\n"
+            f"      brightness_pct: 80\n"
+        )
+    return "".join(items)
+
+
+def scripts_yaml(count):
+    return "".join(
+        f"notify_{n}:\n"
+        f"  alias: Notify {n}\n"
+        f"  sequence:\n"
+        f"  - action: notify.notify\n"
+        f"    data:\n"
+        f"      message: Script {n} ran\n"
+        f"  - delay:\n"
+        f"      seconds: 5\n"
+        for n in range(count)
+    )
+
+
+def blueprint_yaml(count):
+    inputs = "".join(
+        f"    light_{n}:\n"
+        f"      name: Light {n}\n"
+        f"      default: light.default_{n}\n"
+        f"      selector:\n"
+        f"        entity:\n"
+        f"          domain: light\n"
+        for n in range(count)
+    )
+    actions = "".join(
+        f"  - action: light.turn_on\n"
+        f"    target:\n"
+        f"      entity_id: !input light_{n}\n"
+        for n in range(count)
+    )
+    return (
+        "blueprint:\n"
+        "  name: Synthetic lights\n"
+        "  description: Generated for benchmarks\n"
+        "  domain: automation\n"
+        "  input:\n"
+        f"{inputs}"
+        "triggers:\n"
+        "  - trigger: sun\n"
+        "    event: sunset\n"
+        "actions:\n"
+        f"{actions}"
+        "mode: single\n"
+    )
+
+
+def automation_with_entities(count):
+    actions = "".join(
+        f"  - action: light.turn_on\n"
+        f"    target:\n"
+        f"      entity_id: light.room_{n}\n"
+        for n in range(count)
+    )
+    return (
+        "alias: Evening lights\n"
+        "triggers:\n"
+        "  - trigger: state\n"
+        "    entity_id: binary_sensor.front_door\n"
+        "    to: 'on'\n"
+        "actions:\n"
+        f"{actions}"
+    )
+
+
+def jinja_template(count):
+    return "".join(
+        f"{{% if is_state('light.room_{n}', 'on') %}}\n"
+        f"  Room {n}: {{{{ states('sensor.temperature_{n}') | float(0) | round(1) }}}}\n"
+        f"{{% endif %}}\n"
+        for n in range(count)
+    )
+
+
+def javascript_source(count):
+    return "".join(
+        f"/* Card {n} */\n"
+        f"export function renderCard{n}(hass, config) {{\n"
+        f"  const state = hass.states[`sensor.card_{n}`];\n"
+        f"  const label = config.name || 'Card {n}'; // fallback\n"
+        f"  return [label, state ? state.state : \"unavailable\"].join(': ');\n"
+        f"}}\n"
+        for n in range(count)
+    )
+
+
+class ValidatorBenchmarks(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.validators, cls.generators = load_backend()
+        cls.results = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        output = os.environ.get("BENCH_OUTPUT")
+        if not output:
+            return
+        pathlib.Path(output).write_text(json.dumps({
+            "python": platform.python_version(),
+            "libyaml": sys.modules["blueprint_studio_backend.yaml_loader"].HAS_LIBYAML,
+            "results": cls.results,
+        }, indent=2, sort_keys=True) + "\n")
+
+    def measure(self, name, size, func, *args, cold=False):
+        """Time ``func(*args)`` (best of several rounds) and record it."""
+        rounds = 3 if size <= 1000 else 1
+        best = None
+        for _ in range(rounds):
+            if cold:
+                self.validators._yaml_item_cache.clear()
+            start = time.perf_counter()
+            result = func(*args)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        self.results.setdefault(name, {})[str(size)] = round(best, 6)
+        return result
+
+    def check_json(self, name, size, func, *args, cold=False):
+        return json.loads(self.measure(name, size, func, *args, cold=cold).text)
+
+    def assert_scaling(self, name):
+        if name in KNOWN_SUPERLINEAR:
+            return
+        small, large = self.results[name]["1000"], self.results[name]["5000"]
+        if large >= MIN_COMPARABLE_SECONDS:
+            self.assertLessEqual(large, max(small, MIN_COMPARABLE_SECONDS) * 5 * SCALING_SLACK, f"{name} grows faster than linear")
+
+    def assert_baseline(self, name):
+        path = os.environ.get("BENCH_BASELINE")
+        if not path:
+            return
+        tolerance = float(os.environ.get("BENCH_TOLERANCE", "2.0"))
+        baseline = json.loads(pathlib.Path(path).read_text())["results"].get(name, {})
+        for size, seconds in self.results[name].items():
+            if size in baseline and seconds >= MIN_COMPARABLE_SECONDS:
+                self.assertLessEqual(seconds, max(baseline[size], MIN_COMPARABLE_SECONDS) * tolerance, f"{name} at {size} items regressed")
+
+    def finish(self, name):
+        self.assert_scaling(name)
+        self.assert_baseline(name)
+
+    def test_check_yaml_automations(self):
+        for size in SIZES:
+            content = automations_yaml(size)
+            result = self.check_json("check_yaml_automations", size, self.validators.check_yaml, content, cold=True)
+            self.assertTrue(result["valid"])
+            self.assertEqual(result.get("warning_count", 0), len(range(0, size, 10)))
+            self.assertTrue(all(w["type"] == "missing_id" for w in result.get("warnings", [])))
+
+            # Re-check after editing one automation (per-item cache is warm)
+            edited = content.replace(f"Hallway motion {size // 2}\n", f"Hallway motion {size // 2} (edited)\n")
+            edited_result = self.check_json("check_yaml_automations_edit", size, self.validators.check_yaml, edited)
+            self.assertEqual(
+                [w["line"] for w in edited_result.get("warnings", [])],
+                [w["line"] for w in result.get("warnings", [])],
+            )
+        self.finish("check_yaml_automations")
+        self.finish("check_yaml_automations_edit")
+
+    def test_check_yaml_scripts(self):
+        for size in SIZES:
+            result = self.check_json("check_yaml_scripts", size, self.validators.check_yaml, scripts_yaml(size))
+            self.assertTrue(result["valid"])
+            self.assertNotIn("warnings", result)
+        self.finish("check_yaml_scripts")
+
+    def test_check_blueprint(self):
+        for size in SIZES:
+            result = self.check_json("check_blueprint", size, self.validators.check_blueprint, blueprint_yaml(size))
+            self.assertTrue(result["valid"], result)
+        self.finish("check_blueprint")
+
+    def test_check_jinja(self):
+        for size in SIZES:
+            result = self.check_json("check_jinja", size, self.validators.check_jinja, jinja_template(size))
+            self.assertTrue(result["valid"])
+        self.finish("check_jinja")
+
+    def test_check_javascript(self):
+        for size in SIZES:
+            result = self.check_json("check_javascript", size, self.validators.check_javascript, javascript_source(size))
+            self.assertTrue(result["valid"], result.get("errors"))
+        self.finish("check_javascript")
+
+    def test_convert_automation_to_blueprint(self):
+        for size in SIZES:
+            result = self.measure(
+                "convert_automation_to_blueprint", size,
+                self.generators.convert_automation_to_blueprint, automation_with_entities(size), "Bench",
+            )
+            self.assertTrue(result.startswith("blueprint:"))
+        self.finish("convert_automation_to_blueprint")
+
+    def test_instantiate_blueprint(self):
+        for size in SIZES:
+            values = {f"light_{n}": f"light.user_{n}" for n in range(0, size, 2)}
+            result = self.measure(
+                "instantiate_blueprint", size,
+                self.generators.instantiate_blueprint, blueprint_yaml(size), values, "Bench",
+            )
+            self.assertIn(f"entity_id: light.user_0\n", result)
+            self.assertIn(f"entity_id: light.default_{size - 1}\n", result)
+            self.assertNotIn("!input", result)
+        self.finish("instantiate_blueprint")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Benchmark the shared YAML loader against a pure-Python SafeLoader.
+
+Run directly: ``python tests/bench_yaml_loader.py [target_mb]``. Generates a
+synthetic automations.yaml of roughly the requested size (default 2 MB).
+"""
+import importlib.util
+import pathlib
+import sys
+import time
+
+import yaml
+
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+LOADER_PATH = ROOT / "custom_components" / "blueprint_studio" / "backend" / "yaml_loader.py"
+
+AUTOMATION = """- id: '{n:013d}'
+  alias: Motion light {n}
+  description: Turn on the hallway light {n} when motion is detected
+  mode: restart
+  triggers:
+  - trigger: state
+    entity_id: binary_sensor.motion_{n}
+    to: 'on'
+  conditions:
+  - condition: template
+    value_template: "{{{{ states('sun.sun') == 'below_horizon' }}}}"
+  actions:
+  - action: light.turn_on
+    target:
+      entity_id: light.hallway_{n}
+    data:
+      brightness_pct: 80
+      transition: 2
+  - delay:
+      minutes: 5
+  - action: notify.mobile_app
+    data:
+      message: !secret notify_message
+"""
+
+
+def load_yaml_loader():
+    spec = importlib.util.spec_from_file_location("yaml_loader", LOADER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_automations(target_bytes):
+    chunks, size, n = [], 0, 0
+    while size < target_bytes:
+        chunk = AUTOMATION.format(n=n)
+        chunks.append(chunk)
+        size += len(chunk)
+        n += 1
+    return "".join(chunks), n
+
+
+def best_of(func, content, rounds=3):
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func(content)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    target_mb = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    loader = load_yaml_loader()
+    content, count = build_automations(int(target_mb * 1024 * 1024))
+
+    class PureLoader(yaml.SafeLoader):
+        pass
+
+    for tag in loader.BLUEPRINT_TAGS:
+        PureLoader.add_constructor(tag, lambda l, node: l.construct_scalar(node))
+
+    assert loader.load_blueprint_yaml(content) == yaml.load(content, Loader=PureLoader)
+
+    pure = best_of(lambda c: yaml.load(c, Loader=PureLoader), content)
+    shared = best_of(loader.load_blueprint_yaml, content)
+    print(f"automations.yaml: {len(content) / 1048576:.2f} MB, {count} automations")
+    print(f"SafeLoader (pure Python): {pure * 1000:8.1f} ms")
+    print(f"shared loader (libyaml={loader.HAS_LIBYAML}): {shared * 1000:8.1f} ms  ({pure / shared:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
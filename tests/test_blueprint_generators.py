@@ -1,19 +1,27 @@
+import importlib
 import importlib.util
 import pathlib
+import sys
 import unittest
 
 import yaml
 
 
 ROOT = pathlib.Path(__file__).resolve().parents[1]
-GENERATORS_PATH = ROOT / "custom_components" / "blueprint_studio" / "backend" / "ai_generators.py"
+BACKEND_PATH = ROOT / "custom_components" / "blueprint_studio" / "backend"
 
 
 def load_generators():
-    spec = importlib.util.spec_from_file_location("ai_generators", GENERATORS_PATH)
-    module = importlib.util.module_from_spec(spec)
-    spec.loader.exec_module(module)
-    return module
+    """Import ai_generators as part of a standalone backend package (no Home Assistant needed)."""
+    name = "blueprint_studio_backend"
+    if name not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            name, BACKEND_PATH / "__init__.py", submodule_search_locations=[str(BACKEND_PATH)]
+        )
+        package = importlib.util.module_from_spec(spec)
+        sys.modules[name] = package
+        spec.loader.exec_module(package)
+    return importlib.import_module(f"{name}.ai_generators")
 
 
 class BlueprintGeneratorTests(unittest.TestCase):